@@ -0,0 +1,135 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from Funciones_Matematicas.IFunction import IFunction
+from Funciones_Matematicas.FFTCoefficientEngine import FFTCoefficientEngine
+
+
+@dataclass
+class AdaptiveSelection:
+    """Armónicos y muestras elegidos por el modo adaptativo.
+
+    ``coefficients`` son los coeficientes numéricos obtenidos con las muestras
+    convergidas, ya truncados a ``n_harmonics``.
+    """
+    n_harmonics: int
+    n_samples: int
+    coefficients: dict
+    report: dict
+
+
+class AdaptiveHarmonics:
+    """Elige el número de armónicos a partir de un RMSE o una fracción de energía objetivo.
+
+    1. Muestreo: se parte de MIN_SAMPLES muestras por periodo y se duplica
+       (evaluando solo los puntos nuevos) hasta que los coeficientes de los
+       MAX_HARMONICS primeros armónicos y el RMSE residual de cada truncamiento
+       cambian menos de CONVERGENCE veces el RMSE objetivo (o el de
+       MAX_HARMONICS armónicos, si es mayor).
+    2. Armónicos: por Parseval, con E = media de f² en un periodo,
+       rmse(n)² = E - a0²/4 - Σ_{k≤n} (ak² + bk²)/2, y se toma el menor n con
+       rmse(n) ≤ objetivo (MAX_HARMONICS si no se alcanza).
+
+    La fracción de energía se mide sobre E (incluida la componente continua).
+    El RMSE estimado corresponde a un periodo: en funciones no periódicas el
+    error sobre toda la malla puede ser mayor.
+    """
+
+    MAX_HARMONICS = 100
+    MIN_SAMPLES = 256
+    MAX_SAMPLES = 1 << 18
+    # Cambio admisible entre dos refinamientos, en fracción del RMSE objetivo
+    CONVERGENCE = 0.1
+    # Resolución mínima exigida, relativa a sqrt(E) (objetivos nulos o fracción 1)
+    RELATIVE_FLOOR = 1e-6
+
+    @staticmethod
+    def requested(request) -> bool:
+        """Indica si la petición usa el modo adaptativo"""
+        return (getattr(request, 'target_rmse', None) is not None
+                or getattr(request, 'target_energy_fraction', None) is not None)
+
+    @staticmethod
+    def target(energy: float, target_rmse: Optional[float] = None,
+               target_energy_fraction: Optional[float] = None) -> float:
+        """RMSE objetivo; con los dos criterios se toma el más exigente"""
+        targets = []
+        if target_rmse is not None:
+            targets.append(target_rmse)
+        if target_energy_fraction is not None:
+            targets.append(math.sqrt(max(0.0, 1.0 - target_energy_fraction) * energy))
+        return min(targets)
+
+    @staticmethod
+    def residual_rmse(a0: float, an: np.ndarray, bn: np.ndarray, energy: float) -> np.ndarray:
+        """RMSE del truncamiento a n = 1..len(an) armónicos (Parseval)"""
+        captured = a0 * a0 / 4 + np.cumsum((an * an + bn * bn) / 2)
+        return np.sqrt(np.maximum(energy - captured, 0.0))
+
+    @staticmethod
+    def select(function: IFunction, target_rmse: Optional[float] = None,
+               target_energy_fraction: Optional[float] = None,
+               max_harmonics: int = MAX_HARMONICS) -> AdaptiveSelection:
+        """Refina el muestreo hasta la convergencia y elige el menor número de armónicos"""
+        period = function.period
+        n_samples = max(AdaptiveHarmonics.MIN_SAMPLES, 1 << (2 * max_harmonics + 1).bit_length())
+        samples = AdaptiveHarmonics._evaluate(function, np.arange(n_samples) * (period / n_samples))
+        previous = None
+        converged = False
+        while True:
+            coeffs = FFTCoefficientEngine.coefficients_from_samples(samples, max_harmonics)
+            a0 = coeffs['a0']
+            an = np.asarray(coeffs['an'])
+            bn = np.asarray(coeffs['bn'])
+            energy = float(np.mean(samples * samples))
+            rmse = AdaptiveHarmonics.residual_rmse(a0, an, bn, energy)
+            target = AdaptiveHarmonics.target(energy, target_rmse, target_energy_fraction)
+            # Si el objetivo no se alcanza con MAX_HARMONICS basta con resolver el mejor RMSE posible
+            tolerance = max(AdaptiveHarmonics.CONVERGENCE * max(target, float(rmse[-1])),
+                            AdaptiveHarmonics.RELATIVE_FLOOR * math.sqrt(energy))
+
+            if previous is not None:
+                # Diferencia RMS entre las dos series truncadas y cambio del RMSE residual
+                prev_a0, prev_an, prev_bn, prev_rmse = previous
+                change = math.sqrt((a0 - prev_a0) ** 2 / 4
+                                   + float(np.sum((an - prev_an) ** 2 + (bn - prev_bn) ** 2)) / 2)
+                change = max(change, float(np.max(np.abs(rmse - prev_rmse))))
+                if change <= tolerance:
+                    converged = True
+                    break
+            if 2 * n_samples > AdaptiveHarmonics.MAX_SAMPLES:
+                break
+
+            # Duplicar el muestreo: las muestras pares ya están calculadas
+            previous = (a0, an, bn, rmse)
+            refined = np.empty(2 * n_samples)
+            refined[0::2] = samples
+            refined[1::2] = AdaptiveHarmonics._evaluate(function, (np.arange(n_samples) + 0.5) * (period / n_samples))
+            samples = refined
+            n_samples *= 2
+
+        met = rmse <= target
+        n_harmonics = int(np.argmax(met)) + 1 if met.any() else max_harmonics
+        estimated = float(rmse[n_harmonics - 1])
+        return AdaptiveSelection(
+            n_harmonics=n_harmonics,
+            n_samples=n_samples,
+            coefficients={'a0': a0, 'an': coeffs['an'][:n_harmonics], 'bn': coeffs['bn'][:n_harmonics]},
+            report={
+                "target_rmse": target_rmse,
+                "target_energy_fraction": target_energy_fraction,
+                "n_harmonics_used": n_harmonics,
+                "n_samples_used": n_samples,
+                "max_harmonics": max_harmonics,
+                "estimated_rmse": estimated,
+                "energy_fraction": 1.0 - estimated * estimated / energy if energy > 0 else 1.0,
+                "target_met": bool(met.any()),
+                "converged": converged
+            }
+        )
+
+    @staticmethod
+    def _evaluate(function: IFunction, t: np.ndarray) -> np.ndarray:
+        """Valores de la función en float64 con la forma de t (también si la expresión es constante)"""
+        return np.broadcast_to(np.asarray(function.evaluate_array(t), dtype=float), t.shape)
@@ -0,0 +1,671 @@
+import math
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Iterator, List, Optional, Set, Tuple, Union
+import numpy as np
+from Analisis_de_Fourier.FourierSynthesizer import FourierSynthesizer
+from Analisis_de_Fourier.AdaptiveHarmonics import AdaptiveHarmonics, AdaptiveSelection
+from Analisis_de_Fourier.CoefficientCache import CoefficientCache
+from Analisis_de_Fourier.Downsampler import Downsampler
+from Analisis_de_Fourier.PeriodicTiling import PeriodicTiling
+from Analisis_de_Fourier.SpectrumAnalyzer import SpectrumAnalyzer
+from Analisis_de_Fourier.SynthesisEngine import SynthesisEngine
+from Funciones_Matematicas.IFunction import IFunction
+from Funciones_Matematicas.CustomFunction import CustomFunction
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+from Modelos_de_Datos.PrecisionControl import PrecisionControl
+from Modelos_de_Datos.ResponseRenderer import ResponseRenderer
+from Modelos_de_Datos.ServerConfig import ServerConfig
+from Infraestructura.CoefficientStore import CoefficientStore
+from Infraestructura.StageTimer import StageTimer
+
+
+class InvalidFunctionError(ValueError):
+    """La definición de la función (tipo o expresión) no es válida"""
+    pass
+
+
+@dataclass
+class AnalysisResult:
+    """Resultado del análisis con las señales como arrays de NumPy (aún sin serializar).
+
+    Las partes no solicitadas en ``include`` no se calculan y quedan en None.
+    Si se diezmaron las señales (``max_points``), cada una tiene su propio eje
+    de tiempo en ``signal_times``. ``timings`` guarda la duración de cada etapa.
+    """
+    metadata: dict
+    time: Optional[np.ndarray]
+    original: Optional[np.ndarray]
+    fourier: Optional[np.ndarray]
+    error: Optional[np.ndarray]
+    coefficients: Optional[dict]
+    spectrum_frequencies: Optional[np.ndarray]
+    spectrum_magnitudes: Optional[np.ndarray]
+    statistics: Optional[dict]
+    outputs: frozenset = frozenset()
+    dt: float = 0.0
+    signal_times: Optional[dict] = None
+    timings: Optional[dict] = None
+
+
+class AnalysisPipeline:
+    """Pipeline completo de /api/analyze: función, señales, coeficientes, FFT y estadísticas"""
+
+    OUTPUTS = ("original_signal", "fourier_approximation", "error_signal",
+               "coefficients", "frequency_spectrum", "statistics")
+    SIGNAL_OUTPUTS = ("original_signal", "fourier_approximation", "error_signal")
+    # Elementos máximos de cada bloque de síntesis apilada (filas × muestras)
+    STACK_ELEMENTS = 1 << 22
+
+    def __init__(self, coefficient_cache: Optional[CoefficientCache] = None,
+                 coefficient_store: Optional[CoefficientStore] = None):
+        self._coefficient_cache = coefficient_cache
+        self._coefficient_store = coefficient_store
+
+    def synthesizer(self, function: IFunction, dtype=np.float64) -> FourierSynthesizer:
+        """Sintetizador de la función con la caché y el almacén de coeficientes del pipeline"""
+        synthesizer = FourierSynthesizer(self._coefficient_cache, coefficient_store=self._coefficient_store,
+                                         dtype=dtype)
+        synthesizer.set_function(function)
+        return synthesizer
+
+    def build_function(self, request) -> IFunction:
+        """Crea y valida la función solicitada (lanza InvalidFunctionError)"""
+        if request.function_type != "Personalizada":
+            return PredefinedFunction(request.function_type, request.amplitude, request.period,
+                                      request.coefficient_method)
+
+        if not request.expression:
+            raise InvalidFunctionError("Se requiere una expresión matemática para funciones personalizadas")
+
+        # Validar que la expresión no esté vacía o solo con espacios
+        if not request.expression.strip():
+            raise InvalidFunctionError("La expresión matemática no puede estar vacía")
+
+        try:
+            function = CustomFunction(request.expression, request.amplitude, request.period)
+            self.check_values(function)
+
+        except ValueError as e:
+            # ValueError ya tiene mensajes descriptivos de CustomFunction
+            raise InvalidFunctionError(str(e))
+        except Exception as e:
+            raise InvalidFunctionError(f"Error al procesar la expresión: {str(e)}")
+
+        return function
+
+    @staticmethod
+    def check_values(function: IFunction):
+        """Prueba la evaluación en varios puntos para detectar errores (lanza ValueError)"""
+        test_points = np.array([0.0, 0.5, 1.0])
+        test_values = function.evaluate_array(test_points)
+        invalid = ~np.isfinite(test_values)
+        if invalid.any():
+            t_test = test_points[np.argmax(invalid)]
+            raise ValueError(f"La expresión produce valores no válidos (NaN o infinito) en t={t_test}")
+
+    @staticmethod
+    def requested_outputs(request) -> Set[str]:
+        """Partes de la respuesta solicitadas (``include``); todas si no se indica"""
+        include = getattr(request, 'include', None)
+        if not include:
+            return set(AnalysisPipeline.OUTPUTS)
+        outputs = set()
+        for name in include:
+            if name == "signals":
+                outputs.update(AnalysisPipeline.SIGNAL_OUTPUTS)
+            elif name in AnalysisPipeline.OUTPUTS:
+                outputs.add(name)
+            else:
+                raise ValueError(f"Parte de la respuesta desconocida: '{name}'. Usa: signals, {', '.join(AnalysisPipeline.OUTPUTS)}")
+        return outputs
+
+    def run(self, request, function: Optional[IFunction] = None,
+            timer: Optional[StageTimer] = None) -> AnalysisResult:
+        """Ejecuta el análisis calculando solo lo necesario para las partes solicitadas"""
+        timer = timer or StageTimer()
+        if function is None:
+            with timer.stage("function"):
+                function = self.build_function(request)
+
+        outputs = self.requested_outputs(request)
+        need_error = bool(outputs & {"error_signal", "statistics"})
+        need_fourier = need_error or "fourier_approximation" in outputs
+        need_original = need_error or bool(outputs & {"original_signal", "frequency_spectrum"})
+
+        # Modo adaptativo: el número de armónicos sale de la precisión objetivo
+        adaptive = None
+        if AdaptiveHarmonics.requested(request):
+            with timer.stage("adaptive"):
+                request, adaptive = self.adapt(request, function)
+
+        # Configurar sintetizador (las señales se generan en el dtype pedido)
+        synthesizer = self.synthesizer(function, PrecisionControl.dtype(request))
+
+        # Calcular coeficientes de Fourier (una sola vez; synthesize los reutiliza)
+        coeffs = None
+        if need_fourier or "coefficients" in outputs:
+            with timer.stage("coefficients"):
+                coeffs = self.coefficients(synthesizer, function, request.n_harmonics, adaptive)
+
+        # Generar array de tiempo solo si hace falta alguna señal
+        dt = 1.0 / request.sampling_rate
+        t = None
+        if need_original or need_fourier:
+            with timer.stage("grid"):
+                t = np.arange(0, request.duration, dt)
+
+        # Obtener señales
+        original_signal = fourier_signal = None
+        if need_original:
+            with timer.stage("original"):
+                original_signal = synthesizer.get_original_signal(t)
+        if need_fourier:
+            with timer.stage("synthesis"):
+                fourier_signal = synthesizer.synthesize(t, request.n_harmonics)
+        result = self.assemble(request, function, outputs, t, dt, coeffs, original_signal, fourier_signal, timer)
+        if adaptive is not None:
+            result.metadata["adaptive"] = adaptive.report
+        return result
+
+    def adapt(self, request, function: IFunction):
+        """Elige armónicos y muestras para la precisión objetivo.
+
+        Devuelve una copia de la petición con ``n_harmonics`` sustituido por el
+        número elegido y la selección (con su informe para los metadatos).
+        """
+        selection = self.adaptive_selection(function, getattr(request, 'target_rmse', None),
+                                            getattr(request, 'target_energy_fraction', None))
+        return SimpleNamespace(**{**vars(request), "n_harmonics": selection.n_harmonics}), selection
+
+    def adaptive_selection(self, function: IFunction, target_rmse: Optional[float],
+                           target_energy_fraction: Optional[float]) -> AdaptiveSelection:
+        """Selección adaptativa, guardada en la caché de coeficientes.
+
+        Sus coeficientes se fijan con set_coefficients, que no pasa por la
+        caché: la selección completa se guarda bajo la clave de la función, la
+        amplitud (el RMSE objetivo es absoluto) y los objetivos.
+        """
+        function_key = function.cache_key() if hasattr(function, 'cache_key') else None
+        key = None
+        if function_key is not None and self._coefficient_cache is not None:
+            key = ("adaptive", function_key, float(function.amplitude), target_rmse, target_energy_fraction)
+            selection = self._coefficient_cache.get_selection(key)
+            if selection is not None:
+                return selection
+        selection = AdaptiveHarmonics.select(function, target_rmse, target_energy_fraction)
+        if key is not None:
+            self._coefficient_cache.put_selection(key, selection)
+        return selection
+
+    @staticmethod
+    def coefficients(synthesizer: FourierSynthesizer, function: IFunction, n_harmonics: int,
+                     adaptive: Optional[AdaptiveSelection] = None) -> dict:
+        """Coeficientes de la función; en modo adaptativo, los numéricos salen del muestreo convergido"""
+        if adaptive is not None and getattr(function, 'coefficient_method', 'numeric') != 'analytic':
+            synthesizer.set_coefficients(adaptive.coefficients)
+            return adaptive.coefficients
+        return synthesizer.calculate_coefficients(n_harmonics)
+
+    def assemble(self, request, function: IFunction, outputs: Set[str], t: Optional[np.ndarray], dt: float,
+                 coeffs: Optional[dict], original_signal: Optional[np.ndarray],
+                 fourier_signal: Optional[np.ndarray], timer: Optional[StageTimer] = None) -> AnalysisResult:
+        """Error, espectro, estadísticas y diezmado a partir de las señales ya calculadas"""
+        timer = timer or StageTimer()
+        need_error = bool(outputs & {"error_signal", "statistics"})
+        error_signal = statistics = None
+        with timer.stage("statistics"):
+            if need_error:
+                error_signal = original_signal - fourier_signal
+            if "statistics" in outputs:
+                # Las estadísticas se calculan siempre sobre las señales a resolución completa
+                statistics = self.statistics(error_signal, coeffs)
+
+        spectrum_frequencies = spectrum_magnitudes = None
+        spectrum_info = None
+        if "frequency_spectrum" in outputs:
+            window = getattr(request, 'spectrum_window', None)
+            with timer.stage("fft"):
+                spectrum_frequencies, spectrum_magnitudes, fft_length = SpectrumAnalyzer.magnitude_spectrum(
+                    original_signal, dt,
+                    min_frequency=getattr(request, 'spectrum_min_frequency', 0.0),
+                    max_frequency=getattr(request, 'spectrum_max_frequency', 50.0),
+                    window=window
+                )
+            spectrum_info = {
+                "window": window,
+                "fft_length": fft_length,
+                "resolution": 1.0 / (fft_length * dt) if fft_length else 0.0
+            }
+
+        result = AnalysisResult(
+            metadata=self.metadata(request, function),
+            time=t,
+            original=original_signal,
+            fourier=fourier_signal,
+            error=error_signal,
+            coefficients=self.coefficient_summary(coeffs) if "coefficients" in outputs else None,
+            spectrum_frequencies=spectrum_frequencies,
+            spectrum_magnitudes=spectrum_magnitudes,
+            statistics=statistics,
+            outputs=frozenset(outputs),
+            dt=dt,
+            timings=timer.durations
+        )
+        if spectrum_info is not None:
+            result.metadata["spectrum"] = spectrum_info
+
+        max_points = getattr(request, 'max_points', None)
+        if max_points:
+            with timer.stage("downsampling"):
+                self.downsample(result, request.downsample_method, max_points)
+
+        dtype = PrecisionControl.dtype(request)
+        decimals = getattr(request, 'decimals', None)
+        significant_digits = getattr(request, 'significant_digits', None)
+        if dtype != np.float64 or decimals is not None or significant_digits is not None:
+            with timer.stage("precision"):
+                self.apply_precision(result, dtype, decimals, significant_digits)
+        return result
+
+    def run_batch(self, requests: List) -> List[Union[AnalysisResult, Exception]]:
+        """Analiza varias peticiones compartiendo el trabajo común.
+
+        - Una malla de tiempo por (duration, sampling_rate).
+        - Un cálculo de coeficientes por función y periodo, con el máximo
+          n_harmonics del grupo; el resto se obtiene truncando y reescalando.
+        - Una señal original por función, amplitud y malla.
+        - La síntesis de las peticiones con la misma malla y periodo se hace
+          apilada en 2-D (irfft por filas o Clenshaw con la malla compartida).
+
+        Devuelve, en el orden de entrada, el resultado o la excepción de cada
+        petición: el fallo de una no afecta a las demás.
+        """
+        results: List[Union[AnalysisResult, Exception, None]] = [None] * len(requests)
+        items = []
+        for index, request in enumerate(requests):
+            adaptive = None
+            try:
+                function = self.build_function(request)
+                outputs = self.requested_outputs(request)
+                if AdaptiveHarmonics.requested(request):
+                    request, adaptive = self.adapt(request, function)
+            except Exception as e:
+                results[index] = e
+                continue
+            need_error = bool(outputs & {"error_signal", "statistics"})
+            items.append(SimpleNamespace(
+                index=index, request=request, function=function, outputs=outputs, adaptive=adaptive,
+                need_fourier=need_error or "fourier_approximation" in outputs,
+                need_original=need_error or bool(outputs & {"original_signal", "frequency_spectrum"}),
+                coeffs=None, original=None, fourier=None
+            ))
+
+        def fail(item, error):
+            if results[item.index] is None:
+                results[item.index] = error
+
+        # Coeficientes: uno por función y periodo, al máximo número de armónicos
+        groups = {}
+        for item in items:
+            if not (item.need_fourier or "coefficients" in item.outputs):
+                continue
+            if item.adaptive is not None and getattr(item.function, 'coefficient_method', 'numeric') != 'analytic':
+                # Coeficientes numéricos ya calculados con el muestreo adaptativo
+                item.coeffs = item.adaptive.coefficients
+            else:
+                groups.setdefault(self._batch_key(item), []).append(item)
+        for members in groups.values():
+            base_item = max(members, key=lambda item: item.request.n_harmonics)
+            try:
+                synthesizer = self.synthesizer(base_item.function)
+                base = synthesizer.calculate_coefficients(base_item.request.n_harmonics)
+                base_scale = self._scale(base_item.function)
+                for item in members:
+                    item.coeffs = self._derive_coefficients(base, item.request.n_harmonics,
+                                                            self._scale(item.function) / base_scale)
+            except Exception as e:
+                for item in members:
+                    fail(item, e)
+
+        # Mallas de tiempo compartidas
+        grids = {}
+        for item in items:
+            if item.need_original or item.need_fourier:
+                grid_key = (item.request.duration, item.request.sampling_rate)
+                if grid_key not in grids:
+                    dt = 1.0 / item.request.sampling_rate
+                    grids[grid_key] = np.arange(0, item.request.duration, dt)
+
+        # Señales originales: una por función, amplitud y malla
+        originals = {}
+        for item in items:
+            if not item.need_original or results[item.index] is not None:
+                continue
+            grid_key = (item.request.duration, item.request.sampling_rate)
+            key = (grid_key, self._batch_key(item), item.request.amplitude, PrecisionControl.dtype(item.request))
+            try:
+                if key not in originals:
+                    synthesizer = FourierSynthesizer(dtype=PrecisionControl.dtype(item.request))
+                    synthesizer.set_function(item.function)
+                    originals[key] = synthesizer.get_original_signal(grids[grid_key])
+                item.original = originals[key]
+            except Exception as e:
+                fail(item, e)
+
+        # Síntesis apilada por (malla, periodo)
+        stacks = {}
+        for item in items:
+            if item.need_fourier and results[item.index] is None:
+                key = (item.request.duration, item.request.sampling_rate, float(item.function.period))
+                stacks.setdefault(key, []).append(item)
+        for (duration, sampling_rate, period), members in stacks.items():
+            t = grids[(duration, sampling_rate)]
+            rows = max(1, self.STACK_ELEMENTS // max(1, len(t)))
+            for start in range(0, len(members), rows):
+                chunk = members[start:start + rows]
+                try:
+                    fourier = self.synthesize_stack(t, [item.coeffs for item in chunk], period)
+                    for item, signal in zip(chunk, fourier):
+                        item.fourier = signal.astype(PrecisionControl.dtype(item.request), copy=False)
+                except Exception as e:
+                    for item in chunk:
+                        fail(item, e)
+
+        for item in items:
+            if results[item.index] is not None:
+                continue
+            request = item.request
+            t = grids.get((request.duration, request.sampling_rate))
+            try:
+                results[item.index] = self.assemble(request, item.function, item.outputs, t,
+                                                    1.0 / request.sampling_rate, item.coeffs,
+                                                    item.original, item.fourier)
+                if item.adaptive is not None:
+                    results[item.index].metadata["adaptive"] = item.adaptive.report
+            except Exception as e:
+                results[item.index] = e
+        return results
+
+    @staticmethod
+    def synthesize_stack(t: np.ndarray, coefficients: List[dict], period: float) -> np.ndarray:
+        """Síntesis 2-D de varias series con la misma malla y periodo (una fila por serie)"""
+        n = max(len(coeffs['an']) for coeffs in coefficients)
+        a0 = np.array([coeffs['a0'] for coeffs in coefficients], dtype=float)
+        an = np.zeros((len(coefficients), n))
+        bn = np.zeros((len(coefficients), n))
+        for row, coeffs in enumerate(coefficients):
+            an[row, :len(coeffs['an'])] = coeffs['an']
+            bn[row, :len(coeffs['bn'])] = coeffs['bn']
+
+        if SynthesisEngine.periodic_grid(t, period, n) is not None:
+            return SynthesisEngine.inverse_rfft_stack(t, a0, an, bn, period)
+        return PeriodicTiling.evaluate_stack(
+            lambda block: SynthesisEngine.clenshaw_stack(block, a0, an, bn, period), t, period)
+
+    @staticmethod
+    def _batch_key(item):
+        """Clave para compartir coeficientes dentro del lote (la propia petición si no es cacheable)"""
+        key = item.function.cache_key() if hasattr(item.function, 'cache_key') else None
+        return key if key is not None else ("item", item.index)
+
+    @staticmethod
+    def _scale(function: IFunction) -> float:
+        """Factor por el que escalan los coeficientes (la amplitud si son lineales en ella)"""
+        return function.amplitude if getattr(function, 'amplitude_linear', False) else 1.0
+
+    @staticmethod
+    def _derive_coefficients(coeffs: dict, n_harmonics: int, factor: float) -> dict:
+        """Trunca a n_harmonics y multiplica por factor"""
+        return {
+            'a0': coeffs['a0'] * factor,
+            'an': [value * factor for value in coeffs['an'][:n_harmonics]],
+            'bn': [value * factor for value in coeffs['bn'][:n_harmonics]]
+        }
+
+    def stream(self, request, function: IFunction, chunk_size: int) -> Iterator[dict]:
+        """Genera el análisis por bloques ordenados en el tiempo.
+
+        Primero emite los coeficientes (evento ``header``), luego las señales en
+        bloques de ``chunk_size`` muestras (eventos ``chunk``) y al final las
+        estadísticas acumuladas de forma incremental (evento ``summary``). La
+        memoria depende solo del tamaño de bloque, no de la duración.
+        """
+        adaptive = None
+        if AdaptiveHarmonics.requested(request):
+            request, adaptive = self.adapt(request, function)
+        dtype = PrecisionControl.dtype(request)
+        decimals = getattr(request, 'decimals', None)
+        significant_digits = getattr(request, 'significant_digits', None)
+        synthesizer = self.synthesizer(function, dtype)
+        coeffs = self.coefficients(synthesizer, function, request.n_harmonics, adaptive)
+
+        dt = 1.0 / request.sampling_rate
+        n_samples = max(0, math.ceil(request.duration / dt))
+        total_energy = self.statistics(np.zeros(0), coeffs)["total_energy"]
+        metadata = self.metadata(request, function)
+        if adaptive is not None:
+            metadata["adaptive"] = adaptive.report
+
+        yield {
+            "type": "header",
+            "metadata": metadata,
+            "coefficients": self.coefficient_summary(coeffs),
+            "statistics": {"total_energy": total_energy},
+            "time": {"start": 0.0, "dt": dt, "count": n_samples},
+            "chunk_size": chunk_size
+        }
+
+        sum_squares = 0.0
+        max_error = 0.0
+        for index, start in enumerate(range(0, n_samples, chunk_size)):
+            count = min(chunk_size, n_samples - start)
+            t = (start + np.arange(count)) * dt
+            original_signal = synthesizer.get_original_signal(t)
+            fourier_signal = synthesizer.synthesize(t, request.n_harmonics)
+            error_signal = original_signal - fourier_signal
+
+            # Acumulación en float64 aunque las señales sean float32
+            error_wide = error_signal.astype(np.float64, copy=False)
+            sum_squares += float(np.dot(error_wide, error_wide))
+            max_error = max(max_error, float(np.max(np.abs(error_signal))))
+
+            yield {
+                "type": "chunk",
+                "index": index,
+                "start": start,
+                "count": count,
+                "original_signal": PrecisionControl.round_values(original_signal, decimals, significant_digits),
+                "fourier_approximation": PrecisionControl.round_values(fourier_signal, decimals, significant_digits),
+                "error_signal": PrecisionControl.round_values(error_signal, decimals, significant_digits)
+            }
+
+        mse = sum_squares / n_samples if n_samples else 0.0
+        yield {
+            "type": "summary",
+            "statistics": {
+                "mse": mse,
+                "rmse": math.sqrt(mse),
+                "max_error": max_error,
+                "total_energy": total_energy
+            }
+        }
+
+    def sweep(self, request, function: Optional[IFunction] = None, snapshots=()) -> dict:
+        """Estadísticas del error para cada n = 1..n_harmonics en una sola pasada.
+
+        Los coeficientes se calculan una vez al máximo n y la suma parcial se
+        construye añadiendo un armónico por paso; cos(nθ) y sin(nθ) se avanzan
+        con las fórmulas de suma de ángulos, así que cada paso cuesta O(muestras)
+        sin evaluar funciones trigonométricas. Si la función es periódica y la
+        malla admite un bloque repetible se trabaja solo sobre el bloque y las estadísticas de
+        la malla completa se obtienen ponderando las repeticiones.
+        """
+        if function is None:
+            function = self.build_function(request)
+
+        synthesizer = self.synthesizer(function)
+        coeffs = synthesizer.calculate_coefficients(request.n_harmonics)
+        n_max = min(request.n_harmonics, len(coeffs['an']))
+
+        dt = 1.0 / request.sampling_rate
+        t = np.arange(0, request.duration, dt)
+        n_samples = len(t)
+        periodic = getattr(function, 'is_periodic', False) and n_samples > 0
+        block = PeriodicTiling.block_length(t, function.period) if periodic else None
+        base = t if block is None else t[:block]
+        # Repeticiones completas del bloque y muestras del bloque parcial final
+        repetitions, remainder = (1, 0) if block is None else divmod(n_samples, block)
+
+        original = synthesizer.get_original_signal(base)
+        theta = (2 * math.pi / function.period) * base
+        cos_1, sin_1 = np.cos(theta), np.sin(theta)
+        cos_n, sin_n = cos_1.copy(), sin_1.copy()
+        approximation = np.full(len(base), coeffs['a0'] / 2)
+        error = np.empty(len(base))
+        scratch = np.empty(len(base))
+
+        wanted = set(snapshots)
+        stats = {name: np.zeros(n_max) for name in ("mse", "rmse", "max_error", "energy")}
+        snapshot_values = {}
+        energy = 0.0
+        for n in range(1, n_max + 1):
+            a, b = coeffs['an'][n - 1], coeffs['bn'][n - 1]
+            approximation += a * cos_n
+            approximation += b * sin_n
+            np.subtract(original, approximation, out=error)
+            energy += a * a + b * b
+
+            sum_squares = repetitions * float(np.dot(error, error))
+            if remainder:
+                sum_squares += float(np.dot(error[:remainder], error[:remainder]))
+            mse = sum_squares / n_samples if n_samples else 0.0
+            stats["mse"][n - 1] = mse
+            stats["rmse"][n - 1] = math.sqrt(mse)
+            stats["max_error"][n - 1] = float(np.max(np.abs(error))) if n_samples else 0.0
+            stats["energy"][n - 1] = energy
+            if n in wanted:
+                snapshot_values[n] = approximation.copy() if block is None else np.resize(approximation, n_samples)
+
+            # cos((n+1)θ) = cos(nθ)cos(θ) - sin(nθ)sin(θ); sin((n+1)θ) = sin(nθ)cos(θ) + cos(nθ)sin(θ)
+            np.multiply(sin_n, cos_1, out=scratch)
+            scratch += cos_n * sin_1
+            cos_n *= cos_1
+            cos_n -= sin_n * sin_1
+            sin_n, scratch = scratch, sin_n
+
+        return {
+            "metadata": self.metadata(request, function),
+            "coefficients": self.coefficient_summary(coeffs),
+            "n_harmonics": np.arange(1, n_max + 1),
+            "statistics": stats,
+            "dt": dt,
+            "n_samples": n_samples,
+            "snapshots": snapshot_values
+        }
+
+    @staticmethod
+    def downsample(result: AnalysisResult, method: str, max_points: int):
+        """Diezma las señales y el espectro del resultado a lo sumo a max_points puntos"""
+        signal_times = {}
+        for attribute, name in (("original", "original_signal"), ("fourier", "fourier_approximation"),
+                                ("error", "error_signal")):
+            values = getattr(result, attribute)
+            if values is None or name not in result.outputs:
+                continue
+            keep = Downsampler.indices(method, result.time, values, max_points)
+            setattr(result, attribute, values[keep])
+            signal_times[name] = result.time[keep]
+        if signal_times:
+            result.signal_times = signal_times
+
+        if result.spectrum_frequencies is not None:
+            keep = Downsampler.indices(method, result.spectrum_frequencies, result.spectrum_magnitudes, max_points)
+            result.spectrum_frequencies = result.spectrum_frequencies[keep]
+            result.spectrum_magnitudes = result.spectrum_magnitudes[keep]
+
+        result.metadata["downsampling"] = {"method": method, "max_points": max_points}
+
+    @staticmethod
+    def apply_precision(result: AnalysisResult, dtype: np.dtype, decimals: Optional[int] = None,
+                        significant_digits: Optional[int] = None):
+        """Convierte los ejes al dtype pedido y redondea los valores enviados.
+
+        Se aplica al final, con las estadísticas ya calculadas a resolución y
+        precisión completas. Los ejes (tiempo y frecuencias) no se redondean.
+        """
+        if result.time is not None:
+            result.time = result.time.astype(dtype, copy=False)
+        if result.signal_times is not None:
+            result.signal_times = {name: times.astype(dtype, copy=False)
+                                   for name, times in result.signal_times.items()}
+        for attribute in ("original", "fourier", "error", "spectrum_magnitudes"):
+            setattr(result, attribute, PrecisionControl.round_values(getattr(result, attribute), decimals,
+                                                                      significant_digits))
+
+    @staticmethod
+    def metadata(request, function: IFunction) -> dict:
+        """Metadatos de la función analizada"""
+        return {
+            "function_type": request.function_type,
+            "expression": request.expression or function.name,
+            "amplitude": request.amplitude,
+            "period": request.period,
+            "duration": request.duration,
+            "n_harmonics": request.n_harmonics,
+            "sampling_rate": request.sampling_rate,
+            # Las funciones personalizadas siempre usan coeficientes numéricos
+            "coefficient_method": getattr(function, 'coefficient_method', "numeric"),
+            "fundamental_frequency": 1.0 / request.period,
+            "dtype": PrecisionControl.dtype(request).name
+        }
+
+    @staticmethod
+    def coefficient_summary(coeffs: dict) -> dict:
+        """Coeficientes con magnitudes |cn| y fases φn"""
+        an = np.asarray(coeffs['an'], dtype=float)
+        bn = np.asarray(coeffs['bn'], dtype=float)
+        magnitudes = np.hypot(an, bn)
+        phases = np.where(magnitudes > 1e-10, np.arctan2(bn, an), 0.0)
+        return {
+            'a0': float(coeffs['a0']),
+            'an': an.tolist(),
+            'bn': bn.tolist(),
+            'magnitudes': magnitudes.tolist(),
+            'phases': phases.tolist()
+        }
+
+    @staticmethod
+    def statistics(error_signal: np.ndarray, coeffs: dict) -> dict:
+        """Estadísticas del error de aproximación y energía de los armónicos"""
+        # Acumulación en float64 aunque las señales sean float32
+        mse = float(np.mean(np.square(error_signal, dtype=np.float64))) if len(error_signal) else 0.0
+        an = np.asarray(coeffs['an'], dtype=float)
+        bn = np.asarray(coeffs['bn'], dtype=float)
+        return {
+            "mse": mse,
+            "rmse": math.sqrt(mse),
+            "max_error": float(np.max(np.abs(error_signal))) if len(error_signal) else 0.0,
+            "total_energy": float(np.sum(an**2 + bn**2))
+        }
+
+
+# Pipeline propio de cada proceso del pool (se crea en la primera petición)
+_worker_pipeline = None
+
+
+def run_in_worker(request_data: dict, response_format: str, dtype: str) -> Tuple[bytes, str, dict]:
+    """Punto de entrada en los procesos del pool: recibe la petición como dict.
+
+    Devuelve la respuesta ya serializada (cuerpo, tipo de medio y duración de
+    las etapas) para no copiar los arrays de vuelta al proceso principal.
+    """
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        config = ServerConfig.from_env()
+        store = CoefficientStore(config.coefficient_store_dir, config.coefficient_store_max_bytes) \
+            if config.coefficient_store_dir else None
+        _worker_pipeline = AnalysisPipeline(CoefficientCache(config.coefficient_cache_size,
+                                                             config.coefficient_cache_ttl), store)
+    request = SimpleNamespace(**request_data)
+    return ResponseRenderer.render_timed(_worker_pipeline.run(request), request.layout, response_format, dtype)
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+import numpy as np
+
+
+class CoefficientCache:
+    """Caché LRU de coeficientes de Fourier compartida entre peticiones.
+
+    Cada entrada guarda los coeficientes normalizados (divididos por ``scale``),
+    de modo que para funciones lineales en la amplitud una sola entrada sirve
+    para cualquier amplitud. Una entrada calculada con más armónicos responde
+    también a peticiones con menos armónicos por truncamiento.
+
+    También guarda las selecciones del modo adaptativo (``get_selection`` /
+    ``put_selection``), con el mismo límite de entradas y la misma vida.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, n_harmonics: int, scale: float = 1.0) -> Optional[dict]:
+        """Devuelve los coeficientes (truncados y reescalados) o None si no hay entrada válida"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None or len(entry['an']) < n_harmonics:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return {
+            'a0': float(entry['a0'] * scale),
+            'an': (entry['an'][:n_harmonics] * scale).tolist(),
+            'bn': (entry['bn'][:n_harmonics] * scale).tolist()
+        }
+
+    def put(self, key: Hashable, coefficients: dict, scale: float = 1.0):
+        """Guarda los coeficientes normalizados por ``scale``"""
+        if self.max_entries <= 0 or scale == 0:
+            return
+
+        entry = {
+            'a0': coefficients['a0'] / scale,
+            'an': np.asarray(coefficients['an'], dtype=float) / scale,
+            'bn': np.asarray(coefficients['bn'], dtype=float) / scale,
+            'created': time.monotonic()
+        }
+
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and not self._expired(current) and len(current['an']) > len(entry['an']):
+                # No se reemplaza una entrada con más armónicos por otra más corta
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_selection(self, key: Hashable):
+        """Devuelve la selección adaptativa guardada o None si no hay entrada válida"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['selection']
+
+    def put_selection(self, key: Hashable, selection):
+        """Guarda una selección adaptativa (sin reescalar: la amplitud forma parte de la clave)"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = {'selection': selection, 'created': time.monotonic()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché (los contadores se conservan)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Contadores de uso para dimensionar la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _expired(self, entry: dict) -> bool:
+        return self.ttl > 0 and time.monotonic() - entry['created'] > self.ttl
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class Downsampler:
+    """Diezmado visualmente fiel de series (x, y) para clientes que dibujan gráficas.
+
+    Ambos métodos devuelven los índices seleccionados (ordenados), de modo que
+    el llamador puede aplicarlos tanto al eje x como a los valores.
+    """
+
+    METHODS = ("lttb", "minmax")
+
+    @staticmethod
+    def indices(method: str, x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+        """Índices a conservar con el método indicado"""
+        if method == "lttb":
+            return Downsampler.lttb(x, y, max_points)
+        elif method == "minmax":
+            return Downsampler.minmax(y, max_points)
+        raise ValueError(f"Método de diezmado desconocido: '{method}'. Usa: {', '.join(Downsampler.METHODS)}")
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets.
+
+        Se conservan el primer y el último punto; el resto se reparte en
+        max_points - 2 cubetas y de cada una se elige el punto que forma el
+        triángulo de mayor área con el punto elegido en la cubeta anterior y la
+        media de la siguiente. Las medias de todas las cubetas se calculan de una
+        vez con ``np.add.reduceat``; el bucle solo recorre cubetas (≤ max_points)
+        y cada área se evalúa vectorizada sobre la cubeta completa.
+        """
+        n = len(y)
+        if max_points >= n or max_points < 3:
+            return np.arange(n)
+
+        edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+        starts, ends = edges[:-1], edges[1:]
+        counts = ends - starts
+
+        # Media de cada cubeta y, para la última, el punto final como "siguiente"
+        avg_x = np.add.reduceat(x[:n - 1], starts) / counts
+        avg_y = np.add.reduceat(y[:n - 1], starts) / counts
+        next_x = np.append(avg_x[1:], x[n - 1])
+        next_y = np.append(avg_y[1:], y[n - 1])
+
+        selected = np.empty(max_points, dtype=int)
+        selected[0] = 0
+        a = 0
+        for i in range(len(starts)):
+            lo, hi = starts[i], ends[i]
+            ax, ay = x[a], y[a]
+            area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+            a = lo + int(np.argmax(area))
+            selected[i + 1] = a
+        selected[-1] = n - 1
+        return selected
+
+    @staticmethod
+    def minmax(y: np.ndarray, max_points: int) -> np.ndarray:
+        """Mínimo y máximo de cada cubeta (max_points / 2 cubetas), completamente vectorizado"""
+        n = len(y)
+        if max_points >= n or max_points < 2:
+            return np.arange(n)
+
+        n_buckets = max_points // 2
+        size = -(-n // n_buckets)
+        padded = np.full(n_buckets * size, np.nan)
+        padded[:n] = y
+        buckets = padded.reshape(n_buckets, size)
+        # Si sobran cubetas completas (todo NaN) se descartan
+        valid = ~np.all(np.isnan(buckets), axis=1)
+        buckets = buckets[valid]
+        offsets = np.flatnonzero(valid) * size
+
+        i_min = offsets + np.nanargmin(buckets, axis=1)
+        i_max = offsets + np.nanargmax(buckets, axis=1)
+        pairs = np.sort(np.stack([i_min, i_max], axis=1), axis=1)
+        return np.unique(pairs.ravel())
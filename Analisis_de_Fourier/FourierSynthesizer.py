@@ -1,14 +1,26 @@
 import numpy as np
-import math
+from typing import Optional
 from Analisis_de_Fourier.IFourierAnalyzer import IFourierAnalyzer
+from Analisis_de_Fourier.CoefficientCache import CoefficientCache
+from Analisis_de_Fourier.SynthesisEngine import SynthesisEngine
+from Analisis_de_Fourier.PeriodicTiling import PeriodicTiling
 from Funciones_Matematicas.IFunction import IFunction
+from Infraestructura.CoefficientStore import CoefficientStore
 
 class FourierSynthesizer(IFourierAnalyzer):
     """Sintetizador de series de Fourier mejorado"""
     
-    def __init__(self):
+    def __init__(self, coefficient_cache: Optional[CoefficientCache] = None, periodic: bool = True,
+                 coefficient_store: Optional[CoefficientStore] = None, dtype=np.float64):
         self._function = None
         self._coefficients = None
+        self._coefficient_cache = coefficient_cache
+        # Almacén en disco compartido por los procesos del nodo (debajo de la caché en memoria)
+        self._coefficient_store = coefficient_store
+        # Modo periódico: se calcula un bloque de periodos y se repite sobre la malla
+        self.periodic = periodic
+        # Tipo de las señales generadas; la malla y la fase se calculan siempre en float64
+        self.dtype = np.dtype(dtype)
     
     def set_function(self, func: IFunction):
         """Establece la función a analizar"""
@@ -16,40 +28,91 @@ class FourierSynthesizer(IFourierAnalyzer):
         self._coefficients = None
     
     def calculate_coefficients(self, n_harmonics: int) -> dict:
-        """Calcula y almacena los coeficientes de Fourier"""
+        """Calcula y almacena los coeficientes de Fourier
+
+        Orden de búsqueda: caché en memoria, almacén en disco y, si no están,
+        cálculo; el resultado se guarda en ambos niveles.
+        """
         if self._function is None:
             return {}
         
+        key = self._cache_key()
+        scale = self._cache_scale()
+        if key is not None and self._coefficient_cache is not None:
+            cached = self._coefficient_cache.get(key, n_harmonics, scale)
+            if cached is not None:
+                self._coefficients = cached
+                return self._coefficients
+        
+        if key is not None and self._coefficient_store is not None:
+            stored = self._coefficient_store.get(key, n_harmonics, scale)
+            if stored is not None:
+                self._coefficients = stored
+                if self._coefficient_cache is not None:
+                    self._coefficient_cache.put(key, stored, scale)
+                return self._coefficients
+        
         self._coefficients = self._function.fourier_coefficients(n_harmonics)
+        if key is not None:
+            if self._coefficient_cache is not None:
+                self._coefficient_cache.put(key, self._coefficients, scale)
+            if self._coefficient_store is not None:
+                self._coefficient_store.put(key, self._coefficients, scale)
         return self._coefficients
     
-    def synthesize(self, t_array: np.ndarray, n_harmonics: int) -> np.ndarray:
-        """Sintetiza la señal usando series de Fourier"""
+    def set_coefficients(self, coefficients: dict):
+        """Fija coeficientes ya calculados fuera del sintetizador (no pasan por la caché)"""
+        self._coefficients = coefficients
+    
+    def _cache_key(self):
+        """Clave de caché de la función actual (None si no hay caché/almacén o no es cacheable)"""
+        if self._coefficient_cache is None and self._coefficient_store is None:
+            return None
+        if not hasattr(self._function, 'cache_key'):
+            return None
+        key = self._function.cache_key()
+        if key is not None and self._cache_scale() == 0:
+            return None
+        return key
+    
+    def _cache_scale(self) -> float:
+        """Factor de normalización: la amplitud si los coeficientes son lineales en ella"""
+        if getattr(self._function, 'amplitude_linear', False):
+            return self._function.amplitude
+        return 1.0
+    
+    def synthesize(self, t_array: np.ndarray, n_harmonics: int, engine: Optional[str] = None) -> np.ndarray:
+        """Sintetiza la señal usando series de Fourier
+
+        Si no se indica ``engine`` se elige automáticamente según la malla:
+        irfft en mallas uniformes con un número entero de muestras por periodo,
+        Clenshaw en cualquier otro caso.
+        """
         if self._function is None:
-            return np.zeros_like(t_array)
+            return np.zeros(len(t_array), dtype=self.dtype)
         
         if self._coefficients is None:
             self.calculate_coefficients(n_harmonics)
         
         coeffs = self._coefficients
         T = self._function.period
-        omega = 2 * math.pi / T
-        
-        # Componente DC
-        result = np.full_like(t_array, coeffs['a0'] / 2)
-        
-        # Armónicos
-        for n in range(1, min(len(coeffs['an']), n_harmonics) + 1):
-            an = coeffs['an'][n-1]
-            bn = coeffs['bn'][n-1]
-            
-            result += an * np.cos(n * omega * t_array) + bn * np.sin(n * omega * t_array)
+        n = min(len(coeffs['an']), n_harmonics)
+        an = np.asarray(coeffs['an'][:n], dtype=float)
+        bn = np.asarray(coeffs['bn'][:n], dtype=float)
         
-        return result
+        if engine is None:
+            engine = SynthesisEngine.select(t_array, T, n)
+            if engine == "clenshaw" and self.periodic:
+                return PeriodicTiling.evaluate(
+                    lambda t: SynthesisEngine.clenshaw(t, coeffs['a0'], an, bn, T), t_array, T, self.dtype)
+        return SynthesisEngine.synthesize(engine, t_array, coeffs['a0'], an, bn, T, self.dtype)
     
     def get_original_signal(self, t_array: np.ndarray) -> np.ndarray:
-        """Obtiene la señal original evaluando la función"""
+        """Obtiene la señal original evaluando la función (un bloque de periodos si es periódica)"""
         if self._function is None:
-            return np.zeros_like(t_array)
+            return np.zeros(len(t_array), dtype=self.dtype)
         
-        return np.array([self._function.evaluate(t) for t in t_array])
\ No newline at end of file
+        if self.periodic and getattr(self._function, 'is_periodic', False):
+            return PeriodicTiling.evaluate(self._function.evaluate_array, t_array, self._function.period,
+                                           self.dtype)
+        return np.asarray(self._function.evaluate_array(t_array), dtype=self.dtype)
\ No newline at end of file
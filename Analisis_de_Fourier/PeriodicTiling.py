@@ -0,0 +1,57 @@
+from fractions import Fraction
+from typing import Callable, Optional
+import numpy as np
+from Analisis_de_Fourier.SynthesisEngine import SynthesisEngine
+
+
+class PeriodicTiling:
+    """Evaluación de señales periódicas calculando un solo bloque y repitiéndolo.
+
+    En una malla uniforme con paso dt, si T/dt = p/q (fracción irreducible) la
+    muestra k y la muestra k + p están separadas exactamente q periodos, así que
+    basta evaluar las primeras p muestras y repetirlas indexando por fase (k mod p).
+    Cuando T·sampling_rate es entero, q = 1 y el bloque es un único periodo.
+
+    Con ``dtype`` el bloque se convierte antes de repetirlo, de modo que la
+    señal completa se escribe directamente en ese tipo.
+    """
+
+    # Máximo número de periodos por bloque (denominador q)
+    MAX_PERIODS_PER_BLOCK = 1000
+    # Deriva de fase acumulada admisible al final de la malla, en fracción de dt
+    MAX_PHASE_DRIFT = 1e-6
+
+    @staticmethod
+    def block_length(t_array: np.ndarray, period: float) -> Optional[int]:
+        """Número de muestras del bloque repetible, o None si no compensa o no es exacto"""
+        dt = SynthesisEngine.uniform_step(t_array)
+        if dt is None:
+            return None
+        ratio = Fraction(period / dt).limit_denominator(PeriodicTiling.MAX_PERIODS_PER_BLOCK)
+        samples, periods = ratio.numerator, ratio.denominator
+        if samples <= 0 or 2 * samples > len(t_array):
+            return None
+        repetitions = len(t_array) / samples
+        drift = abs(samples * dt - periods * period) * repetitions
+        if drift > PeriodicTiling.MAX_PHASE_DRIFT * dt:
+            return None
+        return samples
+
+    @staticmethod
+    def evaluate(func: Callable[[np.ndarray], np.ndarray], t_array: np.ndarray, period: float,
+                 dtype=None) -> np.ndarray:
+        """Evalúa ``func`` sobre un bloque y lo repite; evalúa todo si no hay bloque exacto"""
+        block = PeriodicTiling.block_length(t_array, period)
+        if block is None:
+            return np.asarray(func(t_array), dtype=dtype)
+        return np.resize(np.asarray(func(t_array[:block]), dtype=dtype), len(t_array))
+
+    @staticmethod
+    def evaluate_stack(func: Callable[[np.ndarray], np.ndarray], t_array: np.ndarray, period: float) -> np.ndarray:
+        """Como evaluate, pero ``func`` devuelve una fila por señal: (k, len(t))"""
+        block = PeriodicTiling.block_length(t_array, period)
+        if block is None:
+            return func(t_array)
+        rows = func(t_array[:block])
+        repetitions = -(-len(t_array) // block)
+        return np.tile(rows, (1, repetitions))[:, :len(t_array)]
@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+import numpy as np
+from Analisis_de_Fourier.AnalysisPipeline import AnalysisPipeline, AnalysisResult, InvalidFunctionError
+from Analisis_de_Fourier.AdaptiveHarmonics import AdaptiveHarmonics, AdaptiveSelection
+from Analisis_de_Fourier.FourierSynthesizer import FourierSynthesizer
+from Funciones_Matematicas.IFunction import IFunction
+from Modelos_de_Datos.PrecisionControl import PrecisionControl
+
+
+class ProgressiveSession:
+    """Estado de una conexión de refinamiento progresivo (WebSocket).
+
+    Cada conjunto de parámetros se resuelve en niveles de grueso a fino: pocos
+    armónicos sobre una malla reducida y, al final, el análisis completo
+    pedido. Entre mensajes de la misma conexión se conservan:
+
+    - la función (expresión compilada); si solo cambian amplitud o periodo se
+      actualiza en lugar de volver a compilarla;
+    - los coeficientes al mayor número de armónicos pedido, que los niveles y
+      los cambios de ``n_harmonics`` truncan;
+    - las mallas de tiempo y las señales originales de los últimos niveles.
+
+    Así, mover ``n_harmonics`` solo repite la síntesis y cambiar la duración
+    no recalcula los coeficientes. Los métodos se ejecutan en el pool de hilos
+    y un candado serializa el acceso al estado.
+    """
+
+    # Niveles previos al análisis completo: (máximo de armónicos, máximo de muestras)
+    PREVIEW_LEVELS = ((4, 1000), (16, 10000))
+    # Muestras mínimas por periodo del armónico más alto en las mallas reducidas
+    MIN_SAMPLES_PER_HARMONIC = 4
+    # Mallas con su señal original que se conservan (niveles del último mensaje y del anterior)
+    MAX_SIGNALS = 6
+
+    def __init__(self, pipeline: AnalysisPipeline):
+        self.pipeline = pipeline
+        self._lock = threading.Lock()
+        self._function_key = None
+        self._function: Optional[IFunction] = None
+        self._synthesizer: Optional[FourierSynthesizer] = None
+        self._coefficients: Optional[dict] = None
+        self._adaptive_key = None
+        self._adaptive: Optional[AdaptiveSelection] = None
+        self._signals = OrderedDict()
+
+    def prepare(self, request) -> List[Tuple[int, float]]:
+        """Actualiza la función y los coeficientes; devuelve los niveles (armónicos, muestreo)"""
+        with self._lock:
+            function = self._update_function(request)
+            n_harmonics = request.n_harmonics
+            if AdaptiveHarmonics.requested(request):
+                n_harmonics = self._update_adaptive(request, function).n_harmonics
+            elif self._adaptive is not None:
+                # Los coeficientes numéricos venían del muestreo adaptativo
+                self._adaptive_key = self._adaptive = None
+                self._coefficients = None
+            self._update_coefficients(function, n_harmonics)
+            return self.levels(n_harmonics, request.duration, request.sampling_rate, function.period)
+
+    @staticmethod
+    def levels(n_harmonics: int, duration: float, sampling_rate: float, period: float) -> List[Tuple[int, float]]:
+        """Niveles de grueso a fino; el último es siempre el análisis pedido"""
+        final = (n_harmonics, sampling_rate)
+        levels = []
+        for max_harmonics, max_samples in ProgressiveSession.PREVIEW_LEVELS:
+            harmonics = min(n_harmonics, max_harmonics)
+            # Malla reducida, pero con resolución suficiente para el armónico más alto del nivel
+            rate = max(max_samples / duration, ProgressiveSession.MIN_SAMPLES_PER_HARMONIC * harmonics / period)
+            level = (harmonics, min(sampling_rate, rate))
+            if level != final and level not in levels:
+                levels.append(level)
+        levels.append(final)
+        return levels
+
+    def analyze(self, request, level: Tuple[int, float]) -> AnalysisResult:
+        """Análisis de un nivel reutilizando la función, los coeficientes y las mallas de la sesión"""
+        with self._lock:
+            n_harmonics, sampling_rate = level
+            level_request = SimpleNamespace(**{**vars(request), "n_harmonics": n_harmonics,
+                                               "sampling_rate": sampling_rate})
+            outputs = self.pipeline.requested_outputs(request)
+            need_error = bool(outputs & {"error_signal", "statistics"})
+            need_fourier = need_error or "fourier_approximation" in outputs
+            need_original = need_error or bool(outputs & {"original_signal", "frequency_spectrum"})
+
+            dtype = PrecisionControl.dtype(request)
+            synthesizer = self._synthesizer
+            synthesizer.dtype = dtype
+            coeffs = None
+            if need_fourier or "coefficients" in outputs:
+                coeffs = {'a0': self._coefficients['a0'],
+                          'an': self._coefficients['an'][:n_harmonics],
+                          'bn': self._coefficients['bn'][:n_harmonics]}
+
+            dt = 1.0 / sampling_rate
+            t = original_signal = fourier_signal = None
+            if need_original or need_fourier:
+                t, original_signal = self._signal(request.duration, sampling_rate, dtype, need_original)
+            if need_fourier:
+                # synthesize trunca los coeficientes de la sesión a los armónicos del nivel
+                fourier_signal = synthesizer.synthesize(t, n_harmonics)
+
+            result = self.pipeline.assemble(level_request, self._function, outputs, t, dt, coeffs,
+                                            original_signal, fourier_signal)
+            if self._adaptive is not None:
+                result.metadata["adaptive"] = self._adaptive.report
+            return result
+
+    def _update_function(self, request) -> IFunction:
+        """Reutiliza la función si solo cambian amplitud o periodo; si no, la crea de nuevo"""
+        key = (request.function_type, request.expression, request.coefficient_method)
+        function = self._function
+        if function is not None and key == self._function_key:
+            if function.amplitude == request.amplitude and function.period == request.period:
+                return function
+            function.amplitude = request.amplitude
+            function.period = request.period
+            if request.function_type == "Personalizada":
+                try:
+                    self.pipeline.check_values(function)
+                except ValueError as e:
+                    self._reset()
+                    raise InvalidFunctionError(str(e))
+        else:
+            self._reset()
+            function = self.pipeline.build_function(request)
+            self._function_key = key
+            self._function = function
+            self._synthesizer = self.pipeline.synthesizer(function)
+        self._coefficients = None
+        self._adaptive_key = self._adaptive = None
+        self._signals.clear()
+        return function
+
+    def _update_adaptive(self, request, function: IFunction) -> AdaptiveSelection:
+        """Selección adaptativa (se repite solo si cambian la función o los objetivos)"""
+        key = (getattr(request, 'target_rmse', None), getattr(request, 'target_energy_fraction', None))
+        if self._adaptive is None or key != self._adaptive_key:
+            self._adaptive = self.pipeline.adaptive_selection(function, *key)
+            self._adaptive_key = key
+            self._coefficients = None
+        return self._adaptive
+
+    def _update_coefficients(self, function: IFunction, n_harmonics: int):
+        """Coeficientes de la sesión con al menos n_harmonics armónicos"""
+        if self._coefficients is not None and len(self._coefficients['an']) >= n_harmonics:
+            self._synthesizer.set_coefficients(self._coefficients)
+            return
+        self._coefficients = self.pipeline.coefficients(self._synthesizer, function, n_harmonics, self._adaptive)
+
+    def _signal(self, duration: float, sampling_rate: float, dtype: np.dtype,
+                need_original: bool) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Malla de tiempo y señal original de un nivel (guardadas para los siguientes mensajes)"""
+        key = (duration, sampling_rate, dtype.name)
+        entry = self._signals.get(key)
+        if entry is None:
+            entry = [np.arange(0, duration, 1.0 / sampling_rate), None]
+            self._signals[key] = entry
+            while len(self._signals) > self.MAX_SIGNALS:
+                self._signals.popitem(last=False)
+        self._signals.move_to_end(key)
+        if need_original and entry[1] is None:
+            entry[1] = self._synthesizer.get_original_signal(entry[0])
+        return entry[0], entry[1]
+
+    def _reset(self):
+        """Descarta el estado de la función anterior"""
+        self._function_key = None
+        self._function = None
+        self._synthesizer = None
+        self._coefficients = None
+        self._adaptive_key = self._adaptive = None
+        self._signals.clear()
@@ -0,0 +1,79 @@
+from typing import Optional, Tuple
+import numpy as np
+
+
+class SpectrumAnalyzer:
+    """Espectro de magnitudes de señales reales mediante rfft.
+
+    - Solo se calcula la mitad positiva del espectro (``rfft``/``rfftfreq``).
+    - La señal se rellena con ceros hasta una longitud 5-smooth (2^a·3^b·5^c),
+      para la que la FFT es rápida aunque el número de muestras sea primo.
+    - La banda (min_frequency, max_frequency] y la ventana son configurables.
+
+    Las magnitudes son |X[k]| sin normalizar, como en ``np.fft.fft``; con
+    ventana se corrigen por su ganancia coherente para conservar la altura de
+    los picos.
+    """
+
+    WINDOWS = ("hann", "hamming", "blackman")
+
+    @staticmethod
+    def fast_length(n: int) -> int:
+        """Menor longitud ≥ n cuyos únicos factores primos son 2, 3 y 5"""
+        if n <= 1:
+            return max(n, 1)
+        best = 1 << (n - 1).bit_length()
+        power5 = 1
+        while power5 < best:
+            power35 = power5
+            while power35 < best:
+                # Completar con la menor potencia de 2 que alcance n
+                quotient = -(-n // power35)
+                candidate = power35 * (1 << (quotient - 1).bit_length())
+                best = min(best, candidate)
+                power35 *= 3
+            power5 *= 5
+        return best
+
+    @staticmethod
+    def window(name: str, n: int) -> np.ndarray:
+        """Ventana de análisis de longitud n"""
+        if name == "hann":
+            return np.hanning(n)
+        elif name == "hamming":
+            return np.hamming(n)
+        elif name == "blackman":
+            return np.blackman(n)
+        raise ValueError(f"Ventana desconocida: '{name}'. Usa: {', '.join(SpectrumAnalyzer.WINDOWS)}")
+
+    @staticmethod
+    def magnitude_spectrum(signal: np.ndarray, dt: float, min_frequency: float = 0.0,
+                           max_frequency: Optional[float] = 50.0, window: Optional[str] = None,
+                           pad: bool = True) -> Tuple[np.ndarray, np.ndarray, int]:
+        """(frecuencias, magnitudes, longitud de FFT) en la banda min < f ≤ max.
+
+        ``max_frequency=None`` equivale a la frecuencia de Nyquist. La FFT se
+        calcula en float64 y el resultado se devuelve en el tipo de la señal
+        (float32 si la señal es float32).
+        """
+        n = len(signal)
+        dtype = np.result_type(np.asarray(signal).dtype, np.float32)
+        if n == 0:
+            return np.zeros(0, dtype), np.zeros(0, dtype), 0
+
+        values = np.asarray(signal, dtype=float)
+        if window is not None:
+            weights = SpectrumAnalyzer.window(window, n)
+            values = values * (weights * (n / weights.sum()))
+
+        length = SpectrumAnalyzer.fast_length(n) if pad else n
+        frequencies = np.fft.rfftfreq(length, dt)
+        upper = frequencies[-1] if max_frequency is None else max_frequency
+        lo = np.searchsorted(frequencies, min_frequency, side="right")
+        hi = np.searchsorted(frequencies, upper, side="right")
+        if lo >= hi:
+            return np.zeros(0, dtype), np.zeros(0, dtype), length
+
+        spectrum = np.fft.rfft(values, n=length)
+        return (frequencies[lo:hi].astype(dtype, copy=False),
+                np.abs(spectrum[lo:hi]).astype(dtype, copy=False), length)
@@ -0,0 +1,180 @@
+import math
+from typing import Optional
+import numpy as np
+
+
+class SynthesisEngine:
+    """Motores de síntesis de la serie de Fourier truncada
+
+        f(t) = a0/2 + Σ an·cos(nωt) + bn·sin(nωt)
+
+    - ``direct``: suma término a término (2 funciones trigonométricas por armónico y muestra)
+    - ``irfft``: malla uniforme cuyo periodo es un número entero de muestras; un periodo
+      se obtiene con una FFT inversa real y se repite
+    - ``clenshaw``: cualquier malla; recurrencia de Clenshaw con un solo cos/sin por muestra
+    """
+
+    ENGINES = ("direct", "irfft", "clenshaw")
+
+    # Tolerancia relativa para considerar una malla uniforme o un cociente entero
+    GRID_TOLERANCE = 1e-6
+
+    @staticmethod
+    def synthesize(engine: str, t_array: np.ndarray, a0: float, an: np.ndarray, bn: np.ndarray,
+                   period: float, dtype=None) -> np.ndarray:
+        """Sintetiza la señal con el motor indicado (``dtype`` de la señal resultante)"""
+        if engine == "irfft":
+            return SynthesisEngine.inverse_rfft(t_array, a0, an, bn, period, dtype)
+        elif engine == "clenshaw":
+            return np.asarray(SynthesisEngine.clenshaw(t_array, a0, an, bn, period), dtype=dtype)
+        elif engine == "direct":
+            return np.asarray(SynthesisEngine.direct(t_array, a0, an, bn, period), dtype=dtype)
+        raise ValueError(f"Motor de síntesis desconocido: '{engine}'. Usa: {', '.join(SynthesisEngine.ENGINES)}")
+
+    @staticmethod
+    def select(t_array: np.ndarray, period: float, n_harmonics: int) -> str:
+        """Elige el motor más rápido según la forma de la malla de tiempo"""
+        if SynthesisEngine.periodic_grid(t_array, period, n_harmonics) is not None:
+            return "irfft"
+        return "clenshaw"
+
+    @staticmethod
+    def uniform_step(t_array: np.ndarray) -> Optional[float]:
+        """Paso de la malla si es uniforme, None en caso contrario"""
+        if len(t_array) < 2:
+            return None
+        dt = float(t_array[1] - t_array[0])
+        if dt <= 0:
+            return None
+        expected = t_array[0] + np.arange(len(t_array)) * dt
+        if np.max(np.abs(t_array - expected)) > SynthesisEngine.GRID_TOLERANCE * dt:
+            return None
+        return dt
+
+    @staticmethod
+    def periodic_grid(t_array: np.ndarray, period: float, n_harmonics: int):
+        """(muestras por periodo, desplazamiento inicial) si la síntesis por irfft es exacta"""
+        dt = SynthesisEngine.uniform_step(t_array)
+        if dt is None:
+            return None
+        samples = period / dt
+        offset = t_array[0] / dt
+        if abs(samples - round(samples)) > SynthesisEngine.GRID_TOLERANCE * samples:
+            return None
+        if abs(offset - round(offset)) > SynthesisEngine.GRID_TOLERANCE * max(1.0, abs(offset)):
+            return None
+        samples = int(round(samples))
+        # Los armónicos deben quedar por debajo de Nyquist dentro de un periodo
+        if samples <= 2 * n_harmonics:
+            return None
+        return samples, int(round(offset)) % samples
+
+    @staticmethod
+    def direct(t_array, a0, an, bn, period):
+        """Suma directa término a término"""
+        omega = 2 * math.pi / period
+        result = np.full_like(t_array, a0 / 2, dtype=float)
+        for n in range(1, len(an) + 1):
+            result += an[n - 1] * np.cos(n * omega * t_array) + bn[n - 1] * np.sin(n * omega * t_array)
+        return result
+
+    @staticmethod
+    def inverse_rfft(t_array, a0, an, bn, period, dtype=None):
+        """Un periodo mediante irfft y repetición hasta cubrir la malla (en ``dtype``)"""
+        grid = SynthesisEngine.periodic_grid(t_array, period, len(an))
+        if grid is None:
+            raise ValueError("La síntesis por irfft requiere una malla uniforme con un número entero de muestras por periodo")
+        samples, offset = grid
+
+        spectrum = np.zeros(samples // 2 + 1, dtype=complex)
+        spectrum[0] = samples * a0 / 2
+        spectrum[1:len(an) + 1] = (samples / 2) * (np.asarray(an) - 1j * np.asarray(bn))
+        one_period = np.fft.irfft(spectrum, n=samples)
+
+        if offset:
+            one_period = np.roll(one_period, -offset)
+        return np.resize(np.asarray(one_period, dtype=dtype), len(t_array))
+
+    @staticmethod
+    def clenshaw(t_array, a0, an, bn, period):
+        """Recurrencia de Clenshaw: u_k = c_k + 2cos(θ)·u_{k+1} - u_{k+2}
+
+        Σ an·cos(nθ) = cos(θ)·u_1 - u_2 y Σ bn·sin(nθ) = sin(θ)·v_1
+        """
+        theta = (2 * math.pi / period) * np.asarray(t_array, dtype=float)
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+        two_cos = 2 * cos_theta
+
+        u1 = np.zeros_like(theta)
+        u2 = np.zeros_like(theta)
+        v1 = np.zeros_like(theta)
+        v2 = np.zeros_like(theta)
+        tmp = np.empty_like(theta)
+
+        for k in range(len(an), 0, -1):
+            np.multiply(two_cos, u1, out=tmp)
+            tmp -= u2
+            tmp += an[k - 1]
+            u1, u2, tmp = tmp, u1, u2
+
+            np.multiply(two_cos, v1, out=tmp)
+            tmp -= v2
+            tmp += bn[k - 1]
+            v1, v2, tmp = tmp, v1, v2
+
+        result = cos_theta * u1
+        result -= u2
+        result += sin_theta * v1
+        result += a0 / 2
+        return result
+
+    @staticmethod
+    def inverse_rfft_stack(t_array, a0, an, bn, period):
+        """Versión apilada de inverse_rfft: una sola irfft 2-D para todas las filas"""
+        grid = SynthesisEngine.periodic_grid(t_array, period, an.shape[1])
+        if grid is None:
+            raise ValueError("La síntesis por irfft requiere una malla uniforme con un número entero de muestras por periodo")
+        samples, offset = grid
+
+        spectrum = np.zeros((len(a0), samples // 2 + 1), dtype=complex)
+        spectrum[:, 0] = samples * np.asarray(a0) / 2
+        spectrum[:, 1:an.shape[1] + 1] = (samples / 2) * (an - 1j * bn)
+        one_period = np.fft.irfft(spectrum, n=samples, axis=1)
+
+        if offset:
+            one_period = np.roll(one_period, -offset, axis=1)
+        repetitions = -(-len(t_array) // samples)
+        return np.tile(one_period, (1, repetitions))[:, :len(t_array)]
+
+    @staticmethod
+    def clenshaw_stack(t_array, a0, an, bn, period):
+        """Versión apilada de clenshaw: cos/sin de la malla se calculan una sola vez"""
+        theta = (2 * math.pi / period) * np.asarray(t_array, dtype=float)
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+        two_cos = 2 * cos_theta
+
+        shape = (len(a0), len(theta))
+        u1 = np.zeros(shape)
+        u2 = np.zeros(shape)
+        v1 = np.zeros(shape)
+        v2 = np.zeros(shape)
+        tmp = np.empty(shape)
+
+        for k in range(an.shape[1], 0, -1):
+            np.multiply(two_cos, u1, out=tmp)
+            tmp -= u2
+            tmp += an[:, k - 1, None]
+            u1, u2, tmp = tmp, u1, u2
+
+            np.multiply(two_cos, v1, out=tmp)
+            tmp -= v2
+            tmp += bn[:, k - 1, None]
+            v1, v2, tmp = tmp, v1, v2
+
+        result = cos_theta * u1
+        result -= u2
+        result += sin_theta * v1
+        result += np.asarray(a0)[:, None] / 2
+        return result
@@ -1,65 +1,57 @@
-import math
-import re
+import numpy as np
 from Funciones_Matematicas.MathematicalFunction import MathematicalFunction
+from Funciones_Matematicas.ExpressionCompiler import ExpressionCompiler
 class CustomFunction(MathematicalFunction):
     """Función personalizada definida por el usuario"""
-    
+
     def __init__(self, expression: str, amplitude: float = 1.0, period: float = 2.0):
         super().__init__(amplitude, period)
         self.expression = expression
         self.name = f"Custom: {expression}"
         self.compiled_expr = self._compile_expression(expression)
-    
-    def _compile_expression(self, expr: str):
-        """Compila la expresión matemática para evaluación segura"""
-        # Reemplazar funciones matemáticas comunes
-        expr = expr.replace('^', '**')  # Exponenciación
-        expr = re.sub(r'\bsin\b', 'math.sin', expr)
-        expr = re.sub(r'\bcos\b', 'math.cos', expr)
-        expr = re.sub(r'\btan\b', 'math.tan', expr)
-        expr = re.sub(r'\bexp\b', 'math.exp', expr)
-        expr = re.sub(r'\blog\b', 'math.log', expr)
-        expr = re.sub(r'\babs\b', 'abs', expr)
-        expr = re.sub(r'\bsqrt\b', 'math.sqrt', expr)
-        expr = re.sub(r'\bpi\b', 'math.pi', expr)
-        expr = re.sub(r'\be\b', 'math.e', expr)
-        
-        return expr
-    
+
+    def _compile_expression(self, expr: str) -> ExpressionCompiler:
+        """Compila la expresión matemática (validada por AST) a una función vectorizada"""
+        return ExpressionCompiler(expr)
+
+    def cache_key(self):
+        """La expresión canónica (árbol AST) identifica la función con independencia del formato"""
+        return ("custom", self.compiled_expr.canonical_form, float(self.amplitude), float(self.period))
+
     def evaluate(self, t: float) -> float:
         """Evalúa la función personalizada"""
-        try:
-            # Crear un namespace seguro para la evaluación
-            namespace = {
-                't': t,
-                'math': math,
-                'sin': math.sin,
-                'cos': math.cos,
-                'tan': math.tan,
-                'exp': math.exp,
-                'log': math.log,
-                'sqrt': math.sqrt,
-                'abs': abs,
-                'pi': math.pi,
-                'e': math.e,
-                'A': self.amplitude,
-                'T': self.period
-            }
+        return float(self.evaluate_array(np.array([t], dtype=float))[0])
 
-            result = eval(self.compiled_expr, {"__builtins__": {}}, namespace)
-            if result is None:
-                raise ValueError("La expresión retorna None. Asegúrate de que la expresión devuelva un valor numérico.")
-            return float(result)
-        except SyntaxError as e:
-            raise ValueError(f"Error de sintaxis en la expresión: '{self.expression}'. Verifica que esté bien escrita.")
-        except NameError as e:
-            variable = str(e).split("'")[1] if "'" in str(e) else "desconocida"
-            raise ValueError(f"Variable o función '{variable}' no reconocida. Usa: t, A, T, sin, cos, tan, exp, log, sqrt, abs, pi, e")
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Evalúa la función personalizada sobre todo el array de tiempos en una sola llamada"""
+        t = np.asarray(t, dtype=float)
+        t_ref = t.flat[0] if t.size else 0.0
+        try:
+            result = self.compiled_expr(t, self.amplitude, self.period)
         except ZeroDivisionError:
-            raise ValueError(f"División por cero en la expresión para t={t}")
+            raise ValueError(f"División por cero en la expresión para t={t_ref}")
+        except OverflowError:
+            raise ValueError(f"Desbordamiento numérico al evaluar '{self.expression}'")
         except TypeError as e:
             raise ValueError(f"Error de tipo en la expresión: {str(e)}. Verifica que todas las operaciones sean válidas.")
         except ValueError as e:
             raise ValueError(f"Error al evaluar la expresión: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error inesperado al evaluar '{self.expression}': {str(e)}")
+
+        invalid = ~np.isfinite(result)
+        if invalid.any():
+            t_invalid = float(t.flat[np.argmax(invalid.ravel())])
+            # NumPy devuelve inf/NaN en lugar de lanzar: la evaluación escalar explica la causa
+            try:
+                self.compiled_expr.evaluate_scalar(t_invalid, self.amplitude, self.period)
+            except ZeroDivisionError:
+                raise ValueError(f"División por cero en la expresión para t={t_invalid}")
+            except OverflowError:
+                raise ValueError(f"Desbordamiento numérico al evaluar '{self.expression}'")
+            except ValueError as e:
+                raise ValueError(f"Error al evaluar la expresión: {str(e)}")
+            except Exception:
+                pass
+            raise ValueError(f"La expresión produce valores no válidos (NaN o infinito) en t={t_invalid}")
+        return result
@@ -0,0 +1,214 @@
+import ast
+import math
+import numpy as np
+
+
+class ExpressionCompiler:
+    """Compila expresiones matemáticas de usuario a una función vectorizada de NumPy.
+
+    La expresión se analiza una sola vez con ``ast``, se valida contra una lista
+    blanca de nombres y operadores, y se transforma en ``lambda t, A, T: ...``
+    donde las condicionales (``x if c else y``) se convierten en ``np.where``.
+
+    Se compila además una versión escalar con ``math`` (condicionales de
+    Python) que solo se usa para explicar un valor no válido en una muestra:
+    reproduce los errores de la evaluación muestra a muestra (división por
+    cero, dominio de ``log``/``sqrt``, desbordamiento).
+    """
+
+    FUNCTIONS = {
+        'sin': np.sin,
+        'cos': np.cos,
+        'tan': np.tan,
+        'exp': np.exp,
+        'log': np.log,
+        'sqrt': np.sqrt,
+        'abs': np.abs,
+    }
+    CONSTANTS = {
+        'pi': math.pi,
+        'e': math.e,
+    }
+    SCALAR_FUNCTIONS = {
+        'sin': math.sin,
+        'cos': math.cos,
+        'tan': math.tan,
+        'exp': math.exp,
+        'log': math.log,
+        'sqrt': math.sqrt,
+        'abs': abs,
+    }
+    VARIABLES = ('t', 'A', 'T')
+
+    BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+    UNARY_OPERATORS = (ast.UAdd, ast.USub, ast.Not)
+    COMPARISON_OPERATORS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+    ALLOWED_NAMES_MESSAGE = "t, A, T, sin, cos, tan, exp, log, sqrt, abs, pi, e"
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        tree = self._parse(expression)
+        self._validate(tree)
+        scalar = _ScalarLowering().visit(ast.parse(ast.unparse(tree), mode='eval'))
+        lowered = _NumpyLowering().visit(tree)
+        self.canonical_form = ast.dump(lowered.body)
+        self._callable = self._build_callable(lowered, {**self.FUNCTIONS, **_NumpyLowering.HELPERS})
+        self._scalar_callable = self._build_callable(scalar, self.SCALAR_FUNCTIONS)
+
+    def __call__(self, t: np.ndarray, amplitude: float, period: float) -> np.ndarray:
+        """Evalúa la expresión sobre un array de tiempos en una sola llamada"""
+        with np.errstate(all='ignore'):
+            result = self._callable(t, float(amplitude), float(period))
+        result = np.asarray(result, dtype=float)
+        if result.shape != t.shape:
+            result = np.broadcast_to(result, t.shape).astype(float)
+        return result
+
+    def evaluate_scalar(self, t: float, amplitude: float, period: float) -> float:
+        """Evalúa la expresión en un solo instante con ``math`` (lanza las excepciones de Python)"""
+        return float(self._scalar_callable(float(t), float(amplitude), float(period)))
+
+    def _parse(self, expression: str) -> ast.Expression:
+        """Analiza la expresión (``^`` se interpreta como exponenciación)"""
+        source = expression.strip().replace('^', '**')
+        try:
+            return ast.parse(source, mode='eval')
+        except SyntaxError:
+            raise ValueError(f"Error de sintaxis en la expresión: '{expression}'. Verifica que esté bien escrita.")
+
+    def _validate(self, tree: ast.Expression):
+        """Recorre el árbol y rechaza cualquier construcción fuera de la lista blanca"""
+        nodes = list(ast.walk(tree.body))
+        # Los nombres de función solo pueden aparecer como objeto de una llamada
+        callees = {id(node.func) for node in nodes if isinstance(node, ast.Call)}
+        # El nombre 'math' solo puede aparecer como prefijo (math.sin, math.pi, ...)
+        math_prefixes = {id(node.value) for node in nodes if isinstance(node, ast.Attribute)}
+
+        for node in nodes:
+            if isinstance(node, (ast.Name, ast.Attribute)):
+                if isinstance(node, ast.Name) and id(node) in math_prefixes and node.id == 'math':
+                    continue
+                name = self._function_name(node)
+                if name is None or (name not in self.VARIABLES and name not in self.CONSTANTS
+                                    and name not in self.FUNCTIONS):
+                    raise ValueError(f"Variable o función '{ast.unparse(node)}' no reconocida. Usa: {self.ALLOWED_NAMES_MESSAGE}")
+                if isinstance(node, ast.Attribute) and name in self.VARIABLES:
+                    raise ValueError(f"Variable o función '{ast.unparse(node)}' no reconocida. Usa: {self.ALLOWED_NAMES_MESSAGE}")
+                if name in self.FUNCTIONS and id(node) not in callees:
+                    raise ValueError(f"La función '{name}' debe llamarse con un argumento, por ejemplo {name}(t)")
+            elif isinstance(node, ast.Call):
+                name = self._function_name(node.func)
+                if name not in self.FUNCTIONS:
+                    raise ValueError(f"Variable o función '{ast.unparse(node.func)}' no reconocida. Usa: {self.ALLOWED_NAMES_MESSAGE}")
+                if node.keywords or len(node.args) != 1:
+                    raise ValueError(f"La función '{name}' recibe exactamente un argumento")
+            elif isinstance(node, ast.Constant):
+                if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                    raise ValueError(f"Error de tipo en la expresión: solo se permiten constantes numéricas, se encontró {node.value!r}")
+            elif isinstance(node, ast.BinOp):
+                if not isinstance(node.op, self.BINARY_OPERATORS):
+                    raise ValueError(f"Operador no permitido en la expresión: '{self.expression}'")
+            elif isinstance(node, ast.UnaryOp):
+                if not isinstance(node.op, self.UNARY_OPERATORS):
+                    raise ValueError(f"Operador no permitido en la expresión: '{self.expression}'")
+            elif isinstance(node, ast.Compare):
+                if not all(isinstance(op, self.COMPARISON_OPERATORS) for op in node.ops):
+                    raise ValueError(f"Comparación no permitida en la expresión: '{self.expression}'")
+            elif isinstance(node, (ast.IfExp, ast.BoolOp, ast.Load, ast.And, ast.Or,
+                                   self.BINARY_OPERATORS, self.UNARY_OPERATORS, self.COMPARISON_OPERATORS)):
+                continue
+            else:
+                raise ValueError(f"Construcción no permitida en la expresión: '{self.expression}'")
+
+    @staticmethod
+    def _function_name(node: ast.AST):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'math':
+            return node.attr
+        return None
+
+    def _build_callable(self, tree: ast.Expression, functions: dict):
+        """Genera ``lambda t, A, T: <expresión>`` y la compila una sola vez"""
+        arguments = ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in self.VARIABLES],
+            kwonlyargs=[], kw_defaults=[], defaults=[]
+        )
+        module = ast.Expression(body=ast.Lambda(args=arguments, body=tree.body))
+        ast.fix_missing_locations(module)
+        code = compile(module, '<expresion>', 'eval')
+
+        namespace = {'__builtins__': {}}
+        namespace.update(functions)
+        namespace.update(self.CONSTANTS)
+        return eval(code, namespace)
+
+
+class _ScalarLowering(ast.NodeTransformer):
+    """Reescribe el árbol validado para evaluarlo con ``math`` sobre un escalar"""
+
+    def visit_Attribute(self, node):
+        # math.sin -> sin, math.pi -> pi
+        return ast.copy_location(ast.Name(id=node.attr, ctx=ast.Load()), node)
+
+    def visit_Constant(self, node):
+        # Constantes en float: sin aritmética entera ilimitada (como en la versión vectorizada)
+        return ast.copy_location(ast.Constant(value=float(node.value)), node)
+
+
+class _NumpyLowering(ast.NodeTransformer):
+    """Reescribe el árbol validado para que opere sobre arrays de NumPy"""
+
+    HELPERS = {
+        '_where': np.where,
+        '_and': np.logical_and,
+        '_or': np.logical_or,
+        '_not': np.logical_not,
+    }
+
+    @staticmethod
+    def _call(name: str, *args):
+        return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+    def visit_Attribute(self, node):
+        # math.sin -> sin, math.pi -> pi
+        return ast.copy_location(ast.Name(id=node.attr, ctx=ast.Load()), node)
+
+    def visit_Constant(self, node):
+        # Las constantes enteras pasan a float para evitar aritmética entera ilimitada
+        return ast.copy_location(ast.Constant(value=float(node.value)), node)
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return ast.copy_location(self._call('_where', node.test, node.body, node.orelse), node)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        helper = '_and' if isinstance(node.op, ast.And) else '_or'
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = self._call(helper, result, value)
+        return ast.copy_location(result, node)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.copy_location(self._call('_not', node.operand), node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c  ->  (a < b) & (b < c)
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = self._call('_and', result, part)
+        return ast.copy_location(result, node)
@@ -0,0 +1,51 @@
+import math
+import numpy as np
+
+
+class FFTCoefficientEngine:
+    """Calcula los coeficientes de Fourier con una única FFT real sobre un periodo.
+
+    Con N muestras equiespaciadas f_k = f(k·T/N) y F = rfft(f):
+        a0 = 2/N · Re F[0],  an = 2/N · Re F[n],  bn = -2/N · Im F[n]
+
+    El número de muestras se elige a partir de n_harmonics: para espectros que
+    decaen como 1/n (funciones con discontinuidades, el peor caso habitual) el
+    error relativo por aliasing en el armónico n es ≈ (π²/3)·(n/N)², así que se
+    toma N ≥ n·sqrt(π²/(3·tol)) redondeado a potencia de dos.
+    """
+
+    ALIASING_TOLERANCE = 1e-3
+    MIN_SAMPLES = 1024
+
+    def __init__(self, aliasing_tolerance: float = ALIASING_TOLERANCE, min_samples: int = MIN_SAMPLES):
+        self.aliasing_tolerance = aliasing_tolerance
+        self.min_samples = min_samples
+
+    def sample_count(self, n_harmonics: int) -> int:
+        """Número de muestras por periodo para mantener el aliasing bajo la tolerancia"""
+        oversampling = math.sqrt(math.pi ** 2 / (3 * self.aliasing_tolerance))
+        required = max(self.min_samples, 2 * n_harmonics + 2, math.ceil(n_harmonics * oversampling))
+        return 1 << (required - 1).bit_length()
+
+    def coefficients(self, func, n_harmonics: int) -> dict:
+        """Muestrea un periodo de la función una vez y obtiene todos los coeficientes"""
+        n_samples = self.sample_count(n_harmonics)
+        t_samples = np.arange(n_samples) * (func.period / n_samples)
+        f_samples = func.evaluate_array(t_samples)
+        return self.coefficients_from_samples(f_samples, n_harmonics)
+
+    @staticmethod
+    def coefficients_from_samples(f_samples: np.ndarray, n_harmonics: int) -> dict:
+        """Obtiene a0, an y bn a partir de las muestras de un periodo completo"""
+        n_samples = len(f_samples)
+        spectrum = np.fft.rfft(f_samples) * (2.0 / n_samples)
+        harmonics = spectrum[1:n_harmonics + 1]
+        if len(harmonics) < n_harmonics:
+            # Por encima de Nyquist no hay información: esos armónicos valen cero
+            harmonics = np.concatenate([harmonics, np.zeros(n_harmonics - len(harmonics), dtype=complex)])
+
+        return {
+            'a0': float(spectrum[0].real),
+            'an': harmonics.real.tolist(),
+            'bn': (-harmonics.imag).tolist()
+        }
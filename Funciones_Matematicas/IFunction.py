@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any
+import numpy as np
 
 class IFunction(ABC):
     """Interfaz para funciones matemáticas"""
@@ -9,6 +10,11 @@ class IFunction(ABC):
         """Evalúa la función en el tiempo t"""
         pass
     
+    @abstractmethod
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Evalúa la función sobre un array de tiempos"""
+        pass
+    
     @abstractmethod
     def fourier_coefficients(self, n_harmonics: int) -> Dict[str, Any]:
         """Calcula los coeficientes de Fourier"""
@@ -1,11 +1,17 @@
 import numpy as np
-import math
 from abc import ABC, abstractmethod
 from Funciones_Matematicas.IFunction import IFunction
+from Funciones_Matematicas.FFTCoefficientEngine import FFTCoefficientEngine
 
 class MathematicalFunction(IFunction, ABC):
     """Clase abstracta para funciones matemáticas"""
     
+    coefficient_engine = FFTCoefficientEngine()
+    # Si los coeficientes escalan linealmente con la amplitud (permite reutilizarlos en caché)
+    amplitude_linear = False
+    # Si f(t + T) = f(t) está garantizado (permite evaluar un periodo y repetirlo)
+    is_periodic = False
+    
     def __init__(self, amplitude: float = 1.0, period: float = 2.0):
         self._amplitude = amplitude
         self._period = period
@@ -16,35 +22,17 @@ class MathematicalFunction(IFunction, ABC):
         """Evalúa la función en el tiempo t"""
         pass
     
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Evalúa la función sobre un array de tiempos (muestra por muestra por defecto)"""
+        return np.array([self.evaluate(ti) for ti in t], dtype=float)
+    
     def fourier_coefficients(self, n_harmonics: int) -> dict:
-        """Calcula los coeficientes de Fourier numéricamente"""
-        T = self._period
-        omega = 2 * math.pi / T
-        
-        # Integración numérica para calcular coeficientes
-        N_samples = 1000
-        dt = T / N_samples
-        t_samples = np.linspace(0, T, N_samples, endpoint=False)
-        
-        # Componente DC (a0)
-        f_samples = [self.evaluate(t) for t in t_samples]
-        a0 = (2 / T) * np.trapz(f_samples, dx=dt)
-
-        coefficients = {'a0': a0, 'an': [], 'bn': []}
-
-        for n in range(1, n_harmonics + 1):
-            # Coeficiente an
-            cos_samples = [self.evaluate(t) * math.cos(n * omega * t) for t in t_samples]
-            an = (2 / T) * np.trapz(cos_samples, dx=dt)
-
-            # Coeficiente bn
-            sin_samples = [self.evaluate(t) * math.sin(n * omega * t) for t in t_samples]
-            bn = (2 / T) * np.trapz(sin_samples, dx=dt)
-            
-            coefficients['an'].append(an)
-            coefficients['bn'].append(bn)
-        
-        return coefficients
+        """Calcula los coeficientes de Fourier numéricamente (una FFT real sobre un periodo)"""
+        return self.coefficient_engine.coefficients(self, n_harmonics)
+    
+    def cache_key(self):
+        """Clave normalizada para la caché de coeficientes (None si no es cacheable)"""
+        return None
     
     @property
     def name(self) -> str:
@@ -1,14 +1,26 @@
 import math
+import numpy as np
 from Funciones_Matematicas.MathematicalFunction import MathematicalFunction
 
 
 class PredefinedFunction(MathematicalFunction):
     """Funciones predefinidas comunes"""
     
-    def __init__(self, func_type: str, amplitude: float = 1.0, period: float = 2.0):
+    # Fracción del periodo en la que el pulso está activo
+    PULSE_DUTY = 0.1
+    COEFFICIENT_METHODS = ("analytic", "numeric")
+    FUNCTION_TYPES = ("Seno", "Coseno", "Onda Cuadrada", "Onda Triangular", "Onda Diente de Sierra", "Pulso")
+    amplitude_linear = True
+    is_periodic = True
+    
+    def __init__(self, func_type: str, amplitude: float = 1.0, period: float = 2.0,
+                 coefficient_method: str = "analytic"):
         super().__init__(amplitude, period)
         self.func_type = func_type
         self.name = func_type
+        if coefficient_method not in self.COEFFICIENT_METHODS:
+            raise ValueError(f"Método de coeficientes no válido: '{coefficient_method}'. Usa: analytic, numeric")
+        self.coefficient_method = coefficient_method
     
     def evaluate(self, t: float) -> float:
         """Evalúa funciones predefinidas"""
@@ -35,9 +47,72 @@ class PredefinedFunction(MathematicalFunction):
                 return self.amplitude * (2 * t_norm - 1)
             elif self.func_type == "Pulso":
                 t_norm = t % self.period
-                return self.amplitude if t_norm < self.period * 0.1 else 0.0
+                return self.amplitude if t_norm < self.period * self.PULSE_DUTY else 0.0
             else:
                 return 0.0
         except Exception as e:
             print(f"Error evaluando función {self.func_type}: {e}")
             return 0.0
+    
+    def evaluate_array(self, t: np.ndarray) -> np.ndarray:
+        """Evalúa funciones predefinidas sobre un array de tiempos con operaciones vectorizadas"""
+        t = np.asarray(t, dtype=float)
+        omega = 2 * math.pi / self.period
+        A = self.amplitude
+        
+        if self.func_type == "Seno":
+            return A * np.sin(omega * t)
+        elif self.func_type == "Coseno":
+            return A * np.cos(omega * t)
+        elif self.func_type == "Onda Cuadrada":
+            return np.where(np.sin(omega * t) >= 0, A, -A)
+        elif self.func_type == "Onda Triangular":
+            t_norm = np.mod(t, self.period) / self.period
+            return A * np.where(t_norm < 0.25, 4 * t_norm,
+                                np.where(t_norm < 0.75, 2 - 4 * t_norm, 4 * t_norm - 4))
+        elif self.func_type == "Onda Diente de Sierra":
+            t_norm = np.mod(t, self.period) / self.period
+            return A * (2 * t_norm - 1)
+        elif self.func_type == "Pulso":
+            t_norm = np.mod(t, self.period)
+            return np.where(t_norm < self.period * self.PULSE_DUTY, A, 0.0)
+        else:
+            return np.zeros_like(t)
+    
+    def cache_key(self):
+        """La amplitud no forma parte de la clave: los coeficientes se reescalan"""
+        return ("predefined", self.func_type, float(self.period), self.coefficient_method)
+    
+    def fourier_coefficients(self, n_harmonics: int) -> dict:
+        """Calcula los coeficientes de Fourier (analíticos por defecto, numéricos si se solicita)"""
+        if self.coefficient_method == "numeric":
+            return super().fourier_coefficients(n_harmonics)
+        return self.analytic_coefficients(n_harmonics)
+    
+    def analytic_coefficients(self, n_harmonics: int) -> dict:
+        """Coeficientes exactos de la serie de Fourier de cada forma de onda predefinida"""
+        A = self.amplitude
+        n = np.arange(1, n_harmonics + 1, dtype=float)
+        odd = (n % 2) == 1
+        a0 = 0.0
+        an = np.zeros(n_harmonics)
+        bn = np.zeros(n_harmonics)
+        
+        if self.func_type == "Seno":
+            bn[:1] = A
+        elif self.func_type == "Coseno":
+            an[:1] = A
+        elif self.func_type == "Onda Cuadrada":
+            bn = np.where(odd, 4 * A / (math.pi * n), 0.0)
+        elif self.func_type == "Onda Triangular":
+            signs = np.where(((n - 1) / 2) % 2 == 0, 1.0, -1.0)
+            bn = np.where(odd, signs * 8 * A / (math.pi ** 2 * n ** 2), 0.0)
+        elif self.func_type == "Onda Diente de Sierra":
+            bn = -2 * A / (math.pi * n)
+        elif self.func_type == "Pulso":
+            d = self.PULSE_DUTY
+            a0 = 2 * A * d
+            an = A * np.sin(2 * math.pi * n * d) / (math.pi * n)
+            bn = A * (1 - np.cos(2 * math.pi * n * d)) / (math.pi * n)
+        
+        return {'a0': float(a0), 'an': an.tolist(), 'bn': bn.tolist()}
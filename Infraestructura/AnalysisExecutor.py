@@ -0,0 +1,170 @@
+import asyncio
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+
+class ExecutorOverloadedError(Exception):
+    """La cola de análisis pendientes está llena"""
+    pass
+
+
+class AnalysisTimeoutError(Exception):
+    """El análisis superó el tiempo máximo por petición"""
+    pass
+
+
+class ClientDisconnectedError(Exception):
+    """El cliente cerró la conexión antes de recibir la respuesta"""
+    pass
+
+
+class _Slot:
+    """Hueco de la cola: se libera cuando terminan la petición y todos sus trabajos en los pools"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, release: Callable[[], None]):
+        self._loop = loop
+        self._release = release
+        # La propia petición cuenta como un trabajo abierto hasta que guard termina
+        self._open = 1
+
+    def hold(self, future: Future):
+        """Mantiene el hueco ocupado hasta que el trabajo del pool termine (o se cancele sin empezar)"""
+        self._open += 1
+        future.add_done_callback(self._job_done)
+
+    def done(self):
+        self._open -= 1
+        if self._open == 0:
+            self._release()
+
+    def _job_done(self, _future: Future):
+        # Se llama desde el hilo del pool: la cuenta se actualiza en el bucle de eventos
+        try:
+            self._loop.call_soon_threadsafe(self.done)
+        except RuntimeError:
+            # Bucle ya cerrado (parada del servidor)
+            pass
+
+
+# Hueco de la petición en curso; guard lo fija en el contexto de la tarea y call lo usa
+_current_slot: ContextVar[Optional[_Slot]] = ContextVar("analysis_slot", default=None)
+
+
+class AnalysisExecutor:
+    """Ejecuta el trabajo de CPU fuera del bucle de eventos de asyncio.
+
+    - Pool de hilos para las etapas basadas en NumPy (liberan el GIL).
+    - Pool de procesos opcional para el trabajo ligado al GIL (expresiones
+      personalizadas). Desactivado por defecto: las expresiones se evalúan
+      vectorizadas con NumPy y el pool solo añade el coste de serializar.
+    - Cola acotada: si hay ``max_pending`` análisis en curso se rechaza el nuevo.
+    - Tiempo máximo por petición y fin de la espera si el cliente se desconecta.
+
+    Al superar el tiempo máximo o desconectarse el cliente se responde de
+    inmediato y se cancelan los trabajos que aún no empezaron; los que ya se
+    ejecutan en un pool no pueden interrumpirse. Por eso un análisis cuenta
+    como pendiente hasta que terminan todos sus trabajos, no hasta que se
+    responde: la cola sigue acotada aunque las peticiones expiren.
+    """
+
+    DISCONNECT_POLL_INTERVAL = 0.1
+
+    def __init__(self, thread_workers: int = 4, process_workers: int = 0,
+                 max_pending: int = 32, timeout: float = 30.0):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self):
+        """Crea los pools (los procesos se lanzan al recibir el primer trabajo)"""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=max(1, self.thread_workers),
+                                               thread_name_prefix="fourier-analysis")
+        if self._processes is None and self.process_workers > 0:
+            # Importación diferida: solo se necesita si hay pool de procesos
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Sin fork: el servidor ya tiene hilos cuando se crea el pool
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers,
+                                                  mp_context=multiprocessing.get_context(method))
+
+    def shutdown(self):
+        """Detiene los pools cancelando el trabajo que aún no ha empezado"""
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+    async def call(self, kind: str, fn: Callable, *args):
+        """Ejecuta ``fn(*args)`` en el pool indicado ("thread" o "process").
+
+        Dentro de guard, el trabajo mantiene ocupado el hueco de la petición
+        hasta que termina en el pool.
+        """
+        self.start()
+        pool = self._processes if kind == "process" and self._processes is not None else self._threads
+        future = pool.submit(fn, *args)
+        slot = _current_slot.get()
+        if slot is not None:
+            slot.hold(future)
+        return await asyncio.wrap_future(future)
+
+    async def guard(self, work: Awaitable, http_request=None, admission: bool = True):
+        """Aplica el control de admisión, el tiempo máximo y la cancelación por desconexión.
+
+        Con ``admission=False`` el trabajo no se rechaza aunque la cola esté
+        llena (bloques de un streaming ya admitido), pero cuenta como pendiente
+        y sigue sujeto al tiempo máximo.
+        """
+        if admission and self._pending >= self.max_pending:
+            if asyncio.iscoroutine(work):
+                work.close()
+            raise ExecutorOverloadedError(f"Hay {self._pending} análisis en curso; inténtalo más tarde")
+
+        self._pending += 1
+        slot = _Slot(asyncio.get_running_loop(), self._release)
+        # La tarea copia el contexto al crearse: sus llamadas a call() usan este hueco
+        token = _current_slot.set(slot)
+        try:
+            task = asyncio.ensure_future(work)
+        finally:
+            _current_slot.reset(token)
+        watcher = asyncio.ensure_future(self._wait_disconnect(http_request)) if http_request is not None else None
+        try:
+            waiting = {task} if watcher is None else {task, watcher}
+            done, _ = await asyncio.wait(waiting, timeout=self.timeout if self.timeout > 0 else None,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if task in done:
+                return task.result()
+            task.cancel()
+            if watcher is not None and watcher in done:
+                raise ClientDisconnectedError("El cliente se desconectó")
+            raise AnalysisTimeoutError(f"El análisis superó el tiempo máximo de {self.timeout} s")
+        finally:
+            slot.done()
+            if watcher is not None:
+                watcher.cancel()
+
+    def _release(self):
+        self._pending -= 1
+
+    async def _wait_disconnect(self, http_request):
+        while not await http_request.is_disconnected():
+            await asyncio.sleep(self.DISCONNECT_POLL_INTERVAL)
+
+    @staticmethod
+    def default_thread_workers() -> int:
+        return min(4, os.cpu_count() or 1)
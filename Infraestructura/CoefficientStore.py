@@ -0,0 +1,155 @@
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Hashable, Optional
+import numpy as np
+
+
+class CoefficientStore:
+    """Almacén persistente de coeficientes en disco, compartido por los procesos del nodo.
+
+    Cada función (clave de caché: definición normalizada y periodo) se guarda
+    en ``<sha256>.npy`` como un vector float64 ``[a0, an..., bn...]``
+    normalizado por ``scale``, igual que en CoefficientCache. El número de
+    armónicos es la longitud del vector: una entrada con más armónicos sirve
+    también para menos. Los ficheros se abren con ``np.load(mmap_mode="r")``,
+    así que todos los procesos leen las mismas páginas sin copiarlas.
+
+    Las escrituras son atómicas (fichero temporal + ``os.replace``) y, si el
+    directorio supera ``max_bytes``, se borran los ficheros usados hace más
+    tiempo (la fecha de modificación se actualiza en cada acierto).
+    """
+
+    FORMAT_VERSION = "v1"
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def path(self, key: Hashable) -> str:
+        """Ruta del fichero de una clave (hash del contenido de la definición)"""
+        digest = hashlib.sha256(f"{self.FORMAT_VERSION}:{key!r}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npy")
+
+    def get(self, key: Hashable, n_harmonics: int, scale: float = 1.0) -> Optional[dict]:
+        """Coeficientes truncados y reescalados, o None si no hay entrada suficiente"""
+        path = self.path(key)
+        try:
+            values = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError, OSError):
+            self._count("misses")
+            return None
+
+        stored = (len(values) - 1) // 2
+        if stored < n_harmonics:
+            self._count("misses")
+            return None
+        try:
+            # Marca de uso para el desalojo LRU entre procesos
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        return {
+            'a0': float(values[0] * scale),
+            'an': (values[1:1 + n_harmonics] * scale).tolist(),
+            'bn': (values[1 + stored:1 + stored + n_harmonics] * scale).tolist()
+        }
+
+    def put(self, key: Hashable, coefficients: dict, scale: float = 1.0):
+        """Guarda los coeficientes normalizados si mejoran la entrada existente (escritura atómica)"""
+        if scale == 0:
+            return
+        an = np.asarray(coefficients['an'], dtype=float) / scale
+        bn = np.asarray(coefficients['bn'], dtype=float) / scale
+        path = self.path(key)
+        try:
+            existing = np.load(path, mmap_mode="r")
+            if (len(existing) - 1) // 2 >= len(an):
+                return
+        except (FileNotFoundError, ValueError, OSError):
+            pass
+
+        values = np.concatenate(([coefficients['a0'] / scale], an, bn))
+        try:
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as f:
+                    np.save(f, values)
+                os.replace(temporary, path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.unlink(temporary)
+                raise
+        except OSError:
+            # El almacén es una optimización: un fallo de disco no debe romper el análisis
+            self._count("errors")
+            return
+        self._count("writes")
+        self._enforce_limit()
+
+    def clear(self):
+        """Borra todas las entradas del almacén"""
+        for path in glob.glob(os.path.join(self.directory, "*.npy")):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Contadores de este proceso y ocupación del directorio"""
+        files = self._files()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "directory": self.directory,
+                "files": len(files),
+                "bytes": sum(size for _, size, _ in files),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _enforce_limit(self):
+        """Borra las entradas menos usadas hasta quedar por debajo de max_bytes"""
+        if self.max_bytes <= 0:
+            return
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in sorted(files, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self._count("evictions")
+
+    def _files(self):
+        """(ruta, tamaño, última modificación) de cada entrada"""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.npy")):
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, info.st_size, info.st_mtime))
+        return entries
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -0,0 +1,49 @@
+import time
+from Infraestructura.MetricsRegistry import MetricsRegistry
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: peticiones en curso, latencia y tamaño de respuesta por endpoint.
+
+    El tamaño se suma sobre los mensajes ``http.response.body``, de modo que
+    también cubre las respuestas por streaming. Las rutas que no pertenecen a
+    la aplicación se agrupan como "other" para acotar la cardinalidad.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry, prefix: str = "/api/"):
+        self.app = app
+        self.registry = registry
+        self.prefix = prefix
+        self._paths = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = self._endpoint(scope)
+        labels = {"endpoint": endpoint}
+        status = {"code": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            elif message["type"] == "http.response.body":
+                status["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        self.registry.inc("fourier_requests_in_flight", labels)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.inc("fourier_requests_in_flight", labels, -1)
+            self.registry.observe("fourier_request_duration_seconds", time.perf_counter() - start, labels)
+            self.registry.observe("fourier_response_bytes", status["bytes"], labels)
+            self.registry.inc("fourier_http_requests_total", {"endpoint": endpoint, "status": str(status["code"])})
+
+    def _endpoint(self, scope) -> str:
+        if self._paths is None:
+            application = scope.get("app")
+            self._paths = {getattr(route, "path", None) for route in getattr(application, "routes", [])}
+        return scope["path"] if scope["path"] in self._paths else "other"
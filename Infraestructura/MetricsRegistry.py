@@ -0,0 +1,95 @@
+import bisect
+import threading
+from typing import Dict, Optional, Sequence
+
+
+class MetricsRegistry:
+    """Contadores, gauges e histogramas en memoria con exportación en formato Prometheus.
+
+    Cada métrica se declara una vez (``counter``, ``gauge``, ``histogram``) y se
+    actualiza con etiquetas arbitrarias; cada combinación de etiquetas es una
+    serie. Las actualizaciones son O(log buckets) bajo un único lock.
+    """
+
+    LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+    def __init__(self):
+        self._metrics: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str):
+        self._declare(name, "counter", help_text)
+
+    def gauge(self, name: str, help_text: str):
+        self._declare(name, "gauge", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self._declare(name, "histogram", help_text, tuple(sorted(buckets)))
+
+    def _declare(self, name: str, kind: str, help_text: str, buckets=None):
+        with self._lock:
+            self._metrics.setdefault(name, {"type": kind, "help": help_text, "buckets": buckets, "series": {}})
+
+    def inc(self, name: str, labels: Optional[dict] = None, amount: float = 1.0):
+        """Incrementa un contador o gauge (amount negativo para decrementar un gauge)"""
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._metrics[name]["series"]
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, labels: Optional[dict] = None):
+        """Fija el valor de un gauge"""
+        key = self._label_key(labels)
+        with self._lock:
+            self._metrics[name]["series"][key] = float(value)
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None):
+        """Registra una observación en un histograma"""
+        key = self._label_key(labels)
+        with self._lock:
+            metric = self._metrics[name]
+            buckets = metric["buckets"]
+            state = metric["series"].get(key)
+            if state is None:
+                # Cuentas por cubeta (la última es +Inf), suma y total
+                state = metric["series"][key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> str:
+        """Texto de exposición de Prometheus (versión 0.0.4)"""
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for key, value in metric["series"].items():
+                    if metric["type"] != "histogram":
+                        lines.append(f"{name}{self._format_labels(key)} {self._format_value(value)}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric["buckets"] + (float("inf"),), counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == float("inf") else self._format_value(bound)
+                        lines.append(f"{name}_bucket{self._format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(key)} {self._format_value(total)}")
+                    lines.append(f"{name}_count{self._format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _label_key(labels: Optional[dict]) -> tuple:
+        return tuple(sorted(labels.items())) if labels else ()
+
+    @staticmethod
+    def _format_labels(key: tuple) -> str:
+        if not key:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in key)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        return repr(float(value)) if value != int(value) else str(int(value))
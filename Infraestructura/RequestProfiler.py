@@ -0,0 +1,121 @@
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Tuple
+
+
+class ProfilingDeniedError(Exception):
+    """Se pidió un perfil con un token ausente o incorrecto"""
+    pass
+
+
+class RequestProfiler:
+    """Perfilado bajo demanda del pipeline con cProfile.
+
+    - Forzado por petición con un token (cabecera o parámetro): el informe se
+      devuelve en ``metadata["profile"]``.
+    - Por muestreo (``sample_rate``): el informe solo se guarda en ``directory``.
+
+    Si hay directorio, cada perfil se guarda como ``.json`` (informe con las
+    etiquetas de la petición) y ``.prof`` (volcado de pstats para snakeviz,
+    ``python -m pstats``, etc.).
+
+    Los perfiles se ejecutan de uno en uno: desde Python 3.12 cProfile no admite
+    dos perfiladores activos a la vez en el mismo intérprete.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, token: str = "", sample_rate: float = 0.0, directory: str = "", top: int = 25):
+        self.token = token
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.top = top
+
+    def mode(self, supplied_token: Optional[str]) -> Optional[str]:
+        """"response" si se fuerza con un token válido, "sampled" si toca por muestreo, None si no"""
+        if supplied_token is not None:
+            if not self.token or not hmac.compare_digest(supplied_token.encode(), self.token.encode()):
+                raise ProfilingDeniedError("Token de perfilado no válido o perfilado deshabilitado")
+            return "response"
+        if self.directory and self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def run(self, fn: Callable, *args, tags: Optional[dict] = None) -> Tuple[object, dict]:
+        """Ejecuta fn(*args) bajo cProfile y devuelve (resultado, informe)"""
+        # Importación diferida: cProfile/pstats solo se cargan si se perfila
+        import cProfile
+        profiler = cProfile.Profile()
+        with self._lock:
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                result = fn(*args)
+            finally:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+
+        report = self.report(profiler, tags or {}, elapsed)
+        if self.directory:
+            report["file"] = self.save(profiler, report)
+        return result, report
+
+    def report(self, profiler, tags: dict, elapsed: float) -> dict:
+        """Funciones más costosas por tiempo propio y por tiempo acumulado"""
+        import pstats
+        entries = []
+        for (filename, line, name), (primitive, calls, own, cumulative, _) in pstats.Stats(profiler).stats.items():
+            entries.append({
+                "function": self.label(filename, line, name),
+                "calls": calls,
+                "primitive_calls": primitive,
+                "self_seconds": own,
+                "cumulative_seconds": cumulative
+            })
+        by_self = sorted(entries, key=lambda entry: entry["self_seconds"], reverse=True)
+        by_cumulative = sorted(entries, key=lambda entry: entry["cumulative_seconds"], reverse=True)
+        return {
+            "tags": tags,
+            "profiler": "cProfile",
+            "wall_seconds": elapsed,
+            "top_self": by_self[:self.top],
+            "top_cumulative": by_cumulative[:self.top]
+        }
+
+    def save(self, profiler, report: dict) -> str:
+        """Guarda el informe y el volcado pstats; devuelve la ruta base"""
+        os.makedirs(self.directory, exist_ok=True)
+        tags = report["tags"]
+        slug = re.sub(r"[^A-Za-z0-9_-]+", "_", str(tags.get("function_type", "analisis")))
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}"
+                                            f"-n{tags.get('n_harmonics', 0)}-{uuid.uuid4().hex[:8]}")
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".json", "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return base
+
+    @staticmethod
+    def label(filename: str, line: int, name: str) -> str:
+        """Nombre legible: módulo:línea(función), o la función nativa tal cual"""
+        if filename == "~":
+            return name
+        return f"{os.path.basename(filename)}:{line}({name})"
+
+    @staticmethod
+    def tags(request) -> dict:
+        """Parámetros de la petición que caracterizan la carga"""
+        return {
+            "function_type": request.function_type,
+            "expression": request.expression,
+            "n_harmonics": request.n_harmonics,
+            "duration": request.duration,
+            "sampling_rate": request.sampling_rate,
+            "samples": int(request.duration * request.sampling_rate),
+            "coefficient_method": request.coefficient_method
+        }
@@ -0,0 +1,144 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """Caché de respuestas ya serializadas, direccionada por contenido.
+
+    La clave es un hash del JSON canónico de la petición (con todos los
+    valores por defecto, claves ordenadas) más el formato negociado. Para
+    cada clave se guarda un cuerpo por codificación ("identity", "gzip"), de
+    modo que un acierto no repite ni el cálculo ni la validación ni la
+    serialización. El ETag se deriva del hash del cuerpo sin comprimir: si un
+    cambio del código altera la respuesta de una misma petición, el ETag
+    cambia y las revalidaciones antiguas ya no obtienen 304.
+
+    Las entradas se desalojan por tamaño total en bytes (LRU).
+    """
+
+    GZIP_LEVEL = 5
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_age: int = 300):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(request_data: dict, response_format: str, dtype: str) -> str:
+        """Hash canónico de la petición y del formato de respuesta"""
+        canonical = json.dumps([request_data, response_format, dtype],
+                               sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def digest(body: bytes) -> str:
+        """Hash del cuerpo sin comprimir (base del ETag)"""
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    @staticmethod
+    def etag(digest: str, encoding: str) -> str:
+        """ETag fuerte de una representación (distinto por codificación)"""
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{digest}{suffix}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Comparación débil de If-None-Match (admite listas, W/ y *)"""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == etag:
+                return True
+        return False
+
+    @staticmethod
+    def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+        """Indica si el cliente acepta gzip (sin q=0)"""
+        for part in (accept_encoding or "").split(","):
+            coding, *params = [piece.strip() for piece in part.split(";")]
+            if coding.lower() not in ("gzip", "*"):
+                continue
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        return float(value) > 0
+                    except ValueError:
+                        return False
+            return True
+        return False
+
+    @staticmethod
+    def compress(body: bytes) -> bytes:
+        return gzip.compress(body, compresslevel=ResponseCache.GZIP_LEVEL)
+
+    def get(self, key: str, encoding: str) -> Optional[dict]:
+        """Entrada {body, media_type, encoding, digest} o None.
+
+        Si falta la codificación pedida pero existe la respuesta sin comprimir,
+        se devuelve esa (``entry["encoding"] == "identity"``) para comprimirla
+        sin repetir el análisis.
+        """
+        with self._lock:
+            for candidate in dict.fromkeys((encoding, "identity")):
+                entry = self._entries.get((key, candidate))
+                if entry is not None:
+                    self._entries.move_to_end((key, candidate))
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return None
+
+    def put(self, key: str, encoding: str, body: bytes, media_type: str, digest: str):
+        """Guarda el cuerpo serializado de una representación (``digest``: hash del cuerpo sin comprimir)"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        entry = {"body": body, "media_type": media_type, "encoding": encoding, "digest": digest}
+        with self._lock:
+            previous = self._entries.pop((key, encoding), None)
+            if previous is not None:
+                self._bytes -= len(previous["body"])
+            self._entries[(key, encoding)] = entry
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted["body"])
+                self.evictions += 1
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,27 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StageTimer:
+    """Acumula la duración (s) de cada etapa de una petición.
+
+    Solo llama a ``perf_counter`` al entrar y salir de cada etapa, por lo que
+    puede quedarse activo en producción.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    @staticmethod
+    def server_timing(durations: Dict[str, float]) -> str:
+        """Valor de la cabecera ``Server-Timing`` (duraciones en milisegundos)"""
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in durations.items())
@@ -0,0 +1,41 @@
+import time
+from typing import Optional
+from Infraestructura.StageTimer import StageTimer
+
+
+class StartupState:
+    """Estado de arranque de la instancia, expuesto en /api/health.
+
+    ``status`` pasa de "starting" a "warming" mientras se ejecuta el
+    calentamiento y a "ready" al terminar (también si el calentamiento falla:
+    un fallo se informa, pero no impide servir tráfico).
+    """
+
+    def __init__(self, import_seconds: float = 0.0):
+        self.status = "starting"
+        self.import_seconds = import_seconds
+        self.steps = StageTimer()
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+        self.ready_after: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def begin_warmup(self):
+        self.status = "warming"
+
+    def mark_ready(self, error: Optional[str] = None):
+        self.error = error
+        self.status = "ready"
+        self.ready_after = time.perf_counter() - self._started
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "import_seconds": self.import_seconds,
+            "warmup_steps": self.steps.durations,
+            "ready_after_seconds": self.ready_after,
+            "warmup_error": self.error
+        }
@@ -0,0 +1,109 @@
+import json
+import struct
+from typing import Dict
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # Dependencia opcional
+    msgpack = None
+
+
+class ColumnarEncoder:
+    """Codificación binaria columnar de las señales, construida directamente desde NumPy.
+
+    Formato ``application/vnd.fourier.columnar``::
+
+        b"FSER" | uint32 LE longitud de cabecera | cabecera JSON (UTF-8) | columnas
+
+    La cabecera se rellena con espacios, y cada columna con ceros hasta el
+    siguiente múltiplo de 8 bytes, para que todas las columnas empiecen en un
+    desplazamiento múltiplo de 8 bytes y el cliente pueda crear un
+    ``Float64Array``/``Float32Array`` sobre el buffer sin copiarlo. Cada columna
+    se describe en ``header["columns"]`` con su nombre, dtype, desplazamiento
+    absoluto en bytes y número de elementos.
+    """
+
+    MEDIA_TYPE = "application/vnd.fourier.columnar"
+    MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+    MAGIC = b"FSER"
+    DTYPES = {"float64": "<f8", "float32": "<f4"}
+
+    @staticmethod
+    def msgpack_available() -> bool:
+        """Indica si el paquete opcional msgpack está instalado"""
+        return msgpack is not None
+
+    @staticmethod
+    def column_array(values: np.ndarray, dtype: str) -> np.ndarray:
+        """Array contiguo little-endian del dtype pedido (sin copia si ya lo es)"""
+        return np.ascontiguousarray(values, dtype=np.dtype(ColumnarEncoder.DTYPES[dtype]))
+
+    @staticmethod
+    def padded_size(size: int) -> int:
+        """Tamaño redondeado al siguiente múltiplo de 8 bytes"""
+        return size + (-size) % 8
+
+    @staticmethod
+    def encode(header: dict, columns: Dict[str, np.ndarray], dtype: str = "float64") -> bytes:
+        """Serializa cabecera + columnas en el formato binario columnar"""
+        arrays = {name: ColumnarEncoder.column_array(values, dtype) for name, values in columns.items()}
+        itemsize = np.dtype(ColumnarEncoder.DTYPES[dtype]).itemsize
+
+        # Los desplazamientos dependen de la longitud de la cabecera y viceversa: se
+        # reserva espacio creciente hasta que la cabecera cabe en el hueco reservado
+        header_length = 0
+        while True:
+            offset = 8 + header_length
+            descriptors = []
+            for name, array in arrays.items():
+                descriptors.append({
+                    "name": name,
+                    "dtype": dtype,
+                    "offset": offset,
+                    "count": int(array.size)
+                })
+                offset += ColumnarEncoder.padded_size(array.size * itemsize)
+            header_bytes = json.dumps({**header, "columns": descriptors}).encode("utf-8")
+            if len(header_bytes) <= header_length:
+                break
+            header_length = len(header_bytes) + (-(8 + len(header_bytes))) % 8
+
+        header_bytes = header_bytes.ljust(header_length, b" ")
+        parts = [ColumnarEncoder.MAGIC, struct.pack("<I", len(header_bytes)), header_bytes]
+        for array in arrays.values():
+            parts.append(memoryview(array).cast("B"))
+            # float32 con un número impar de elementos: relleno hasta el múltiplo de 8
+            parts.append(b"\0" * (ColumnarEncoder.padded_size(array.nbytes) - array.nbytes))
+        return b"".join(parts)
+
+    @staticmethod
+    def encode_msgpack(header: dict, columns: Dict[str, np.ndarray], dtype: str = "float64") -> bytes:
+        """Serializa en MessagePack con cada columna como bloque binario (requiere msgpack)"""
+        if msgpack is None:
+            raise RuntimeError("El formato MessagePack requiere el paquete 'msgpack'")
+        payload = dict(header)
+        payload["columns"] = {
+            name: {
+                "dtype": dtype,
+                "data": ColumnarEncoder.column_array(values, dtype).tobytes()
+            }
+            for name, values in columns.items()
+        }
+        return msgpack.packb(payload, use_bin_type=True)
+
+    @staticmethod
+    def decode(payload: bytes) -> dict:
+        """Decodifica el formato columnar (útil para clientes Python y pruebas)"""
+        if payload[:4] != ColumnarEncoder.MAGIC:
+            raise ValueError("Cabecera binaria no reconocida")
+        (header_length,) = struct.unpack("<I", payload[4:8])
+        header = json.loads(payload[8:8 + header_length])
+        columns = {}
+        for column in header.pop("columns"):
+            columns[column["name"]] = np.frombuffer(
+                payload, dtype=ColumnarEncoder.DTYPES[column["dtype"]],
+                count=column["count"], offset=column["offset"]
+            )
+        header["columns"] = columns
+        return header
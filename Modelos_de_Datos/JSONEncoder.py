@@ -0,0 +1,79 @@
+import math
+import numpy as np
+import pydantic_core
+from Modelos_de_Datos.PrecisionControl import PrecisionControl
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+
+class JSONEncoder:
+    """Serialización JSON directa desde NumPy, sin modelos pydantic intermedios.
+
+    Las respuestas se construyen como diccionarios con los arrays NumPy tal
+    cual; los modelos de ``main.py`` solo describen el esquema OpenAPI. Con el
+    paquete opcional ``orjson`` los arrays se escriben sin pasar por objetos
+    ``float`` de Python (``OPT_SERIALIZE_NUMPY``); sin él se usa el
+    serializador de pydantic-core tras ``tolist()``, sin validación. En ambos
+    casos los valores no finitos se escriben como ``null``, igual que pydantic.
+
+    Los arrays float32 se escriben con su representación decimal más corta
+    (no con la del float64 equivalente, que tiene hasta 17 cifras).
+    """
+
+    # Cifras significativas probadas para los float32 sin orjson (9 identifican cualquiera)
+    FLOAT32_DIGITS = (9, 8, 7, 6)
+
+    MEDIA_TYPE = "application/json"
+
+    @staticmethod
+    def orjson_available() -> bool:
+        """Indica si el paquete opcional orjson está instalado"""
+        return orjson is not None
+
+    @staticmethod
+    def encode(payload) -> bytes:
+        """JSON compacto (UTF-8) de un dict/list con arrays y escalares NumPy"""
+        if orjson is not None:
+            return orjson.dumps(payload, default=JSONEncoder._default, option=orjson.OPT_SERIALIZE_NUMPY)
+        encoded = pydantic_core.to_json(payload, fallback=JSONEncoder._default)
+        if b"NaN" in encoded or b"Infinity" in encoded:
+            # to_json escribe NaN/Infinity (JSON no válido): se sustituyen por null
+            encoded = pydantic_core.to_json(JSONEncoder._finite(payload))
+        return encoded
+
+    @staticmethod
+    def _default(value):
+        """Tipos NumPy que el codificador no serializa por sí mismo"""
+        if isinstance(value, np.ndarray):
+            if value.dtype == np.float32:
+                return JSONEncoder._float32_list(value)
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        raise TypeError(f"Tipo no serializable en JSON: {type(value).__name__}")
+
+    @staticmethod
+    def _float32_list(values: np.ndarray) -> list:
+        """float32 como floats de Python con el menor número de cifras que los identifica"""
+        wide = values.astype(np.float64)
+        result = wide
+        for digits in JSONEncoder.FLOAT32_DIGITS:
+            candidate = PrecisionControl.round_significant(wide, digits)
+            result = np.where(candidate.astype(np.float32) == values, candidate, result)
+        return result.tolist()
+
+    @staticmethod
+    def _finite(value):
+        """Copia con los flotantes no finitos convertidos en None"""
+        if isinstance(value, (np.ndarray, np.generic)):
+            value = JSONEncoder._default(value)
+        if isinstance(value, float):
+            return value if math.isfinite(value) else None
+        if isinstance(value, dict):
+            return {key: JSONEncoder._finite(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [JSONEncoder._finite(item) for item in value]
+        return value
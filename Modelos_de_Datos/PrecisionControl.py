@@ -0,0 +1,78 @@
+from typing import Optional
+import numpy as np
+
+
+class PrecisionControl:
+    """Precisión numérica de las señales y redondeo de los valores enviados.
+
+    Con ``dtype="float32"`` las señales de longitud completa (repetición del
+    bloque periódico, error, espectro) se materializan en precisión simple, que
+    es donde está el tráfico de memoria. La malla de tiempo, los argumentos de
+    fase y los coeficientes se siguen calculando en float64: la detección de
+    mallas periódicas y la fase en instantes grandes lo necesitan, y solo
+    afectan a un bloque. Las estadísticas se acumulan siempre en float64.
+
+    ``decimals`` y ``significant_digits`` redondean los valores enviados; si se
+    indican ambos, cada valor se redondea una sola vez al más restrictivo de
+    los dos límites. Los ejes (tiempo y frecuencias) no se redondean: a menos
+    decimales que la resolución de la malla varias muestras compartirían el
+    mismo instante, y el layout columnar envía ``dt`` sin redondear.
+    """
+
+    DTYPES = ("float32", "float64")
+    _POWERS_OF_TEN = 10.0 ** np.arange(301)
+
+    @staticmethod
+    def dtype(request) -> np.dtype:
+        """Tipo de las señales pedido en la petición (float64 por defecto)"""
+        name = getattr(request, 'dtype', None) or "float64"
+        if name not in PrecisionControl.DTYPES:
+            raise ValueError(f"Tipo numérico desconocido: '{name}'. Usa: {', '.join(PrecisionControl.DTYPES)}")
+        return np.dtype(name)
+
+    @staticmethod
+    def round_decimals(values: np.ndarray, decimals: int) -> np.ndarray:
+        """Redondeo a un número fijo de decimales (conserva el dtype)"""
+        return np.round(values, decimals)
+
+    @staticmethod
+    def round_significant(values: np.ndarray, digits: int, decimals: Optional[int] = None) -> np.ndarray:
+        """Redondeo a ``digits`` cifras significativas, y a lo sumo ``decimals`` decimales (conserva el dtype).
+
+        Se calcula en float64 y el resultado es el flotante más cercano al
+        decimal redondeado, de modo que su representación más corta tiene a lo
+        sumo ``digits`` cifras.
+        """
+        values = np.asarray(values)
+        wide = values.astype(np.float64, copy=False).reshape(-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = (digits - 1) - np.floor(np.log10(np.abs(wide)))
+        # Ceros, valores no finitos y subnormales (10**k no representable) se dejan como están
+        keep = ~(np.abs(shift) <= 300)
+        shift[keep] = 0
+        if decimals is not None:
+            np.minimum(shift, decimals, out=shift)
+        shift = shift.astype(np.int16)
+        # Potencias de 10 exactas: se multiplica o divide según el signo del desplazamiento
+        scale = PrecisionControl._POWERS_OF_TEN[np.abs(shift)]
+        rounded = wide * scale
+        np.rint(rounded, out=rounded)
+        rounded /= scale
+        negative = shift < 0
+        if negative.any():
+            rounded[negative] = np.rint(wide[negative] / scale[negative]) * scale[negative]
+        if keep.any():
+            rounded[keep] = wide[keep]
+        return rounded.reshape(values.shape).astype(values.dtype, copy=False)
+
+    @staticmethod
+    def round_values(values: Optional[np.ndarray], decimals: Optional[int] = None,
+                     significant_digits: Optional[int] = None) -> Optional[np.ndarray]:
+        """Aplica los límites de precisión indicados a un array de valores"""
+        if values is None:
+            return None
+        if significant_digits is not None:
+            return PrecisionControl.round_significant(values, significant_digits, decimals)
+        if decimals is not None:
+            return PrecisionControl.round_decimals(values, decimals)
+        return values
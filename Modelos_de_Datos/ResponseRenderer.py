@@ -0,0 +1,128 @@
+import time
+from typing import Dict, Optional, Tuple
+import numpy as np
+from Modelos_de_Datos.ColumnarEncoder import ColumnarEncoder
+from Modelos_de_Datos.JSONEncoder import JSONEncoder
+
+
+class ResponseRenderer:
+    """Serialización de un AnalysisResult en el formato negociado.
+
+    Las respuestas JSON se construyen como dicts con los arrays NumPy sin
+    convertir y se serializan con JSONEncoder: los modelos de ``main.py`` solo
+    documentan el esquema (response_model) y no se validan elemento a elemento.
+    Devuelve bytes y tipo de medio, de modo que también se puede usar en los
+    procesos del pool sin enviar los arrays de vuelta.
+    """
+
+    @staticmethod
+    def signal_arrays(result) -> Dict[str, np.ndarray]:
+        """Señales calculadas, por nombre de campo de la respuesta"""
+        signals = {
+            "original_signal": result.original,
+            "fourier_approximation": result.fourier,
+            "error_signal": result.error
+        }
+        return {name: values for name, values in signals.items() if name in result.outputs}
+
+    @staticmethod
+    def signal_time(result, name: str, shared_time: Optional[np.ndarray]) -> np.ndarray:
+        """Eje de tiempo de una señal: el compartido o el propio si se diezmó"""
+        if result.signal_times is not None:
+            return result.signal_times[name]
+        return shared_time
+
+    @staticmethod
+    def spectrum(result) -> Optional[Dict[str, np.ndarray]]:
+        if result.spectrum_frequencies is None:
+            return None
+        return {
+            "frequencies": result.spectrum_frequencies,
+            "magnitudes": result.spectrum_magnitudes
+        }
+
+    @staticmethod
+    def without_none(fields: dict) -> dict:
+        """Campos con valor (equivale a exclude_none=True de los modelos)"""
+        return {name: value for name, value in fields.items() if value is not None}
+
+    @staticmethod
+    def json_payload(result) -> dict:
+        """Cuerpo de la respuesta JSON estándar (FourierAnalysisResponse o, con include, ProjectedAnalysisResponse)"""
+        signals = ResponseRenderer.signal_arrays(result)
+        time_axis = result.time if signals and result.signal_times is None else None
+        return ResponseRenderer.without_none({
+            "metadata": result.metadata,
+            **{name: {"time": ResponseRenderer.signal_time(result, name, time_axis), "values": values}
+               for name, values in signals.items()},
+            "coefficients": result.coefficients,
+            "frequency_spectrum": ResponseRenderer.spectrum(result),
+            "statistics": result.statistics
+        })
+
+    @staticmethod
+    def columnar_payload(result) -> dict:
+        """Cuerpo de la respuesta JSON columnar (ColumnarAnalysisResponse)"""
+        signals = ResponseRenderer.signal_arrays(result)
+        return ResponseRenderer.without_none({
+            "metadata": result.metadata,
+            "time": {"start": float(result.time[0]) if len(result.time) else 0.0,
+                     "dt": float(result.dt), "count": len(result.time)}
+                    if signals and result.signal_times is None else None,
+            "signals": signals,
+            "signal_times": result.signal_times,
+            "coefficients": result.coefficients,
+            "frequency_spectrum": ResponseRenderer.spectrum(result),
+            "statistics": result.statistics
+        })
+
+    @staticmethod
+    def payload(result, layout: str) -> dict:
+        """Cuerpo JSON según el layout pedido"""
+        if layout == "columnar":
+            return ResponseRenderer.columnar_payload(result)
+        return ResponseRenderer.json_payload(result)
+
+    @staticmethod
+    def binary(result, response_format: str, dtype: str) -> Tuple[bytes, str]:
+        """Respuesta binaria columnar (el eje de tiempo se envía una sola vez)"""
+        header = {"metadata": result.metadata}
+        if result.coefficients is not None:
+            header["coefficients"] = result.coefficients
+        if result.statistics is not None:
+            header["statistics"] = result.statistics
+
+        columns = {}
+        signals = ResponseRenderer.signal_arrays(result)
+        if signals and result.signal_times is None:
+            columns["time"] = result.time
+            columns.update(signals)
+        elif signals:
+            # Señales diezmadas: cada una lleva su propio eje de tiempo
+            for name, values in signals.items():
+                columns[f"{name}_time"] = result.signal_times[name]
+                columns[name] = values
+        if result.spectrum_frequencies is not None:
+            columns["spectrum_frequencies"] = result.spectrum_frequencies
+            columns["spectrum_magnitudes"] = result.spectrum_magnitudes
+
+        if response_format == "msgpack":
+            return (ColumnarEncoder.encode_msgpack(header, columns, dtype),
+                    ColumnarEncoder.MSGPACK_MEDIA_TYPES[0])
+        return ColumnarEncoder.encode(header, columns, dtype), f"{ColumnarEncoder.MEDIA_TYPE}; dtype={dtype}"
+
+    @staticmethod
+    def render(result, layout: str, response_format: str, dtype: str) -> Tuple[bytes, str]:
+        """Cuerpo y tipo de medio en el formato negociado"""
+        if response_format != "json":
+            return ResponseRenderer.binary(result, response_format, dtype)
+        return JSONEncoder.encode(ResponseRenderer.payload(result, layout)), JSONEncoder.MEDIA_TYPE
+
+    @staticmethod
+    def render_timed(result, layout: str, response_format: str, dtype: str) -> Tuple[bytes, str, dict]:
+        """Como render, más la duración de cada etapa incluida la serialización"""
+        start = time.perf_counter()
+        body, media_type = ResponseRenderer.render(result, layout, response_format, dtype)
+        timings = dict(result.timings or {})
+        timings["serialization"] = time.perf_counter() - start
+        return body, media_type, timings
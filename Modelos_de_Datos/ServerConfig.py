@@ -0,0 +1,44 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class ServerConfig:
+    """Configuración del servidor (se lee de variables de entorno FOURIER_*)"""
+    coefficient_cache_size: int = 256
+    coefficient_cache_ttl: float = 3600.0
+    coefficient_store_dir: str = ""
+    coefficient_store_max_bytes: int = 64 * 1024 * 1024
+    response_cache_bytes: int = 64 * 1024 * 1024
+    response_cache_max_age: int = 300
+    thread_workers: int = min(4, os.cpu_count() or 1)
+    process_workers: int = 0
+    max_pending: int = 32
+    request_timeout: float = 30.0
+    profile_token: str = ""
+    profile_sample_rate: float = 0.0
+    profile_dir: str = ""
+    profile_top: int = 25
+    warmup: bool = True
+
+    @classmethod
+    def from_env(cls) -> "ServerConfig":
+        """Construye la configuración a partir de las variables de entorno"""
+        defaults = cls()
+        return cls(
+            coefficient_cache_size=int(os.getenv("FOURIER_COEFFICIENT_CACHE_SIZE", defaults.coefficient_cache_size)),
+            coefficient_cache_ttl=float(os.getenv("FOURIER_COEFFICIENT_CACHE_TTL", defaults.coefficient_cache_ttl)),
+            coefficient_store_dir=os.getenv("FOURIER_COEFFICIENT_STORE_DIR", defaults.coefficient_store_dir),
+            coefficient_store_max_bytes=int(os.getenv("FOURIER_COEFFICIENT_STORE_MAX_BYTES", defaults.coefficient_store_max_bytes)),
+            response_cache_bytes=int(os.getenv("FOURIER_RESPONSE_CACHE_BYTES", defaults.response_cache_bytes)),
+            response_cache_max_age=int(os.getenv("FOURIER_RESPONSE_CACHE_MAX_AGE", defaults.response_cache_max_age)),
+            thread_workers=int(os.getenv("FOURIER_THREAD_WORKERS", defaults.thread_workers)),
+            process_workers=int(os.getenv("FOURIER_PROCESS_WORKERS", defaults.process_workers)),
+            max_pending=int(os.getenv("FOURIER_MAX_PENDING", defaults.max_pending)),
+            request_timeout=float(os.getenv("FOURIER_REQUEST_TIMEOUT", defaults.request_timeout)),
+            profile_token=os.getenv("FOURIER_PROFILE_TOKEN", defaults.profile_token),
+            profile_sample_rate=float(os.getenv("FOURIER_PROFILE_SAMPLE_RATE", defaults.profile_sample_rate)),
+            profile_dir=os.getenv("FOURIER_PROFILE_DIR", defaults.profile_dir),
+            profile_top=int(os.getenv("FOURIER_PROFILE_TOP", defaults.profile_top)),
+            warmup=os.getenv("FOURIER_WARMUP", "1" if defaults.warmup else "0").strip().lower() not in ("0", "false", "no", "off"),
+        )
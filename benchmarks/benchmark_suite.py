@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del análisis de Fourier
+
+Uso:
+    python benchmarks/benchmark_suite.py run [--quick] [--groups g1,g2] [--output resultados.json]
+    python benchmarks/benchmark_suite.py compare base.json nuevo.json [--threshold 0.10]
+
+`run` mide cada etapa sobre una matriz de duraciones, frecuencias de muestreo,
+número de armónicos y complejidad de expresiones, y guarda los tiempos en JSON.
+`compare` contrasta dos ficheros y termina con código 1 si alguna medida
+empeora más que el umbral (por defecto un 10 % en la mediana).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Agregar el directorio raíz del proyecto al path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from Analisis_de_Fourier.FourierSynthesizer import FourierSynthesizer
+from Analisis_de_Fourier.SpectrumAnalyzer import SpectrumAnalyzer
+from Funciones_Matematicas.CustomFunction import CustomFunction
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+
+# Matriz completa y reducida (--quick)
+MATRIX = {
+    "durations": [1.0, 10.0, 60.0],
+    "sampling_rates": [1000, 10000],
+    "harmonics": [10, 50, 100],
+}
+QUICK_MATRIX = {
+    "durations": [1.0, 10.0],
+    "sampling_rates": [1000],
+    "harmonics": [10, 100],
+}
+
+# Expresiones de complejidad creciente
+EXPRESSIONS = {
+    "simple": "A * sin(2 * pi * t / T)",
+    "medium": "A * exp(-(t % T) / T) * cos(2 * pi * t / T) + 0.5 * A * sin(6 * pi * t / T)**2",
+    "complex": "A * sqrt(abs(sin(pi * t / T))) * log(2 + cos(4 * pi * t / T)) if t % T < T / 2 else -A * (t % T) / T",
+}
+
+PREDEFINED = ["Onda Cuadrada", "Onda Triangular", "Seno"]
+
+GROUPS = ("fourier_coefficients", "get_original_signal", "synthesize",
+          "custom_evaluate", "fft", "api_analyze")
+
+
+def measure(fn, repeat: int, setup=None) -> dict:
+    """Ejecuta fn `repeat` veces (tras una ejecución de calentamiento) y resume los tiempos"""
+    if setup is not None:
+        setup()
+    fn()
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "runs": len(times)
+    }
+
+
+def make_function(kind: str, period: float = 2.0):
+    """Función predefinida por nombre o personalizada por nivel de complejidad"""
+    if kind in EXPRESSIONS:
+        return CustomFunction(EXPRESSIONS[kind], 1.0, period)
+    return PredefinedFunction(kind, 1.0, period)
+
+
+def grid(duration: float, sampling_rate: int) -> np.ndarray:
+    return np.arange(0, duration, 1.0 / sampling_rate)
+
+
+def bench_fourier_coefficients(matrix, repeat):
+    for kind in PREDEFINED + list(EXPRESSIONS):
+        methods = ["analytic", "numeric"] if kind in PREDEFINED else [None]
+        for method in methods:
+            for n in matrix["harmonics"]:
+                if method is None:
+                    function = make_function(kind)
+                else:
+                    function = PredefinedFunction(kind, 1.0, 2.0, method)
+                params = {"function": kind, "n_harmonics": n}
+                if method is not None:
+                    params["coefficient_method"] = method
+                yield params, measure(lambda: function.fourier_coefficients(n), repeat)
+
+
+def bench_get_original_signal(matrix, repeat):
+    for kind in PREDEFINED + list(EXPRESSIONS):
+        synthesizer = FourierSynthesizer()
+        synthesizer.set_function(make_function(kind))
+        for duration in matrix["durations"]:
+            for rate in matrix["sampling_rates"]:
+                t = grid(duration, rate)
+                params = {"function": kind, "duration": duration, "sampling_rate": rate}
+                yield params, measure(lambda: synthesizer.get_original_signal(t), repeat)
+
+
+def bench_synthesize(matrix, repeat):
+    # Periodo entero (irfft) y no conmensurable con la malla (Clenshaw por bloques o completo)
+    for period in (2.0, 0.37):
+        synthesizer = FourierSynthesizer()
+        synthesizer.set_function(PredefinedFunction("Onda Cuadrada", 1.0, period))
+        for n in matrix["harmonics"]:
+            synthesizer.calculate_coefficients(n)
+            for duration in matrix["durations"]:
+                for rate in matrix["sampling_rates"]:
+                    t = grid(duration, rate)
+                    params = {"period": period, "n_harmonics": n, "duration": duration, "sampling_rate": rate}
+                    yield params, measure(lambda: synthesizer.synthesize(t, n), repeat)
+
+
+def bench_custom_evaluate(matrix, repeat):
+    scalar_points = np.linspace(0.0, 10.0, 1000)
+    for kind in EXPRESSIONS:
+        function = make_function(kind)
+        params = {"expression": kind, "mode": "scalar", "points": len(scalar_points)}
+        yield params, measure(lambda: [function.evaluate(float(x)) for x in scalar_points], repeat)
+        for duration in matrix["durations"]:
+            for rate in matrix["sampling_rates"]:
+                t = grid(duration, rate)
+                params = {"expression": kind, "mode": "array", "duration": duration, "sampling_rate": rate}
+                yield params, measure(lambda: function.evaluate_array(t), repeat)
+
+
+def bench_fft(matrix, repeat):
+    for duration in matrix["durations"]:
+        for rate in matrix["sampling_rates"]:
+            for extra in (0, 1):
+                # +1 muestra: longitudes que no son 5-smooth
+                signal = np.random.default_rng(0).standard_normal(int(duration * rate) + extra)
+                params = {"duration": duration, "sampling_rate": rate, "samples": len(signal)}
+                yield params, measure(lambda: SpectrumAnalyzer.magnitude_spectrum(signal, 1.0 / rate), repeat)
+
+
+def bench_api_analyze(matrix, repeat):
+    try:
+        from fastapi.testclient import TestClient
+    except (ImportError, RuntimeError) as e:
+        print(f"  (omitido: TestClient no disponible: {e})")
+        return
+    # Todo en el mismo proceso para poder vaciar las cachés entre medidas
+    os.environ.setdefault("FOURIER_PROCESS_WORKERS", "0")
+    import main
+
+    def clear_caches():
+        main.coefficient_cache.clear()
+        main.response_cache.clear()
+
+    with TestClient(main.app) as client:
+        def post(payload):
+            response = client.post("/api/analyze", json=payload)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/analyze devolvió {response.status_code}: {response.text[:200]}")
+
+        for kind in ["Onda Cuadrada", "simple", "complex"]:
+            for n in matrix["harmonics"]:
+                for duration in matrix["durations"]:
+                    for rate in matrix["sampling_rates"]:
+                        if duration * rate > 120000:
+                            continue  # El JSON completo domina; fuera del rango habitual del frontend
+                        payload = {"function_type": "Personalizada", "expression": EXPRESSIONS[kind]} \
+                            if kind in EXPRESSIONS else {"function_type": kind}
+                        payload.update(duration=duration, sampling_rate=rate, n_harmonics=n)
+                        params = {"function": kind, "n_harmonics": n, "duration": duration,
+                                  "sampling_rate": rate, "cache": "cold"}
+                        yield params, measure(lambda: post(payload), repeat, setup=clear_caches)
+
+
+BENCHMARKS = {
+    "fourier_coefficients": bench_fourier_coefficients,
+    "get_original_signal": bench_get_original_signal,
+    "synthesize": bench_synthesize,
+    "custom_evaluate": bench_custom_evaluate,
+    "fft": bench_fft,
+    "api_analyze": bench_api_analyze,
+}
+
+
+def case_name(group: str, params: dict) -> str:
+    """Identificador estable de una medida (clave para comparar ficheros)"""
+    return group + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run(args):
+    matrix = QUICK_MATRIX if args.quick else MATRIX
+    groups = args.groups.split(",") if args.groups else list(GROUPS)
+    for group in groups:
+        if group not in BENCHMARKS:
+            sys.exit(f"Grupo desconocido: '{group}'. Usa: {', '.join(GROUPS)}")
+
+    results = []
+    for group in groups:
+        print(f"\n{'='*70}\n{group}\n{'-'*70}")
+        for params, timing in BENCHMARKS[group](matrix, args.repeat):
+            name = case_name(group, params)
+            results.append({"name": name, "group": group, "params": params, **timing})
+            print(f"{timing['median'] * 1000:10.3f} ms  {name}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "matrix": matrix,
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ {len(results)} medidas guardadas en {args.output}")
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {entry["name"]: entry for entry in json.load(f)["results"]}
+    with open(args.current) as f:
+        current = {entry["name"]: entry for entry in json.load(f)["results"]}
+
+    regressions, improvements = [], []
+    print(f"{'base (ms)':>12} {'nuevo (ms)':>12} {'cambio':>9}  medida")
+    print("-" * 70)
+    for name, entry in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name][args.metric]
+        after = entry[args.metric]
+        change = after / before - 1.0 if before > 0 else 0.0
+        marker = ""
+        if change > args.threshold:
+            regressions.append(name)
+            marker = "  ✗ REGRESIÓN"
+        elif change < -args.threshold:
+            improvements.append(name)
+            marker = "  ✓"
+        print(f"{before * 1000:12.3f} {after * 1000:12.3f} {change:+8.1%}  {name}{marker}")
+
+    missing = sorted(set(baseline) - set(current))
+    print("\n" + "=" * 70)
+    print(f"✓ Mejoras: {len(improvements)}")
+    print(f"✗ Regresiones (> {args.threshold:.0%}): {len(regressions)}")
+    if missing:
+        print(f"? Medidas sin equivalente en el fichero nuevo: {len(missing)}")
+    print("=" * 70)
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del análisis de Fourier")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Ejecuta la matriz de benchmarks y guarda JSON")
+    run_parser.add_argument("--quick", action="store_true", help="Matriz reducida")
+    run_parser.add_argument("--groups", help=f"Grupos separados por comas ({', '.join(GROUPS)})")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por medida")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="Fichero JSON de salida")
+
+    compare_parser = commands.add_parser("compare", help="Compara dos ficheros de resultados")
+    compare_parser.add_argument("baseline", help="Resultados de referencia")
+    compare_parser.add_argument("current", help="Resultados nuevos")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Empeoramiento relativo tolerado")
+    compare_parser.add_argument("--metric", choices=("min", "median", "mean"), default="median")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Informe de arranque en frío: tiempo de importación por módulo y calentamiento
+
+Uso:
+    python benchmarks/startup_report.py [--top 20] [--output arranque.json]
+
+Importa `main` en un proceso nuevo con `python -X importtime` y lista los
+módulos con mayor tiempo acumulado y propio. Después arranca la aplicación
+(lifespan incluido) y mide cuánto tarda `/api/health` en declararla lista.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un proceso nuevo para medir un arranque real en frío
+READINESS_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    while client.get("/api/health").status_code != 200:
+        time.sleep(0.005)
+    ready = time.perf_counter()
+    client.post("/api/analyze", json={"function_type": "Onda Cuadrada"})
+    first = time.perf_counter() - ready
+    print(json.dumps({"import_seconds": imported - start, "ready_seconds": ready - start,
+                      "first_request_seconds": first, "startup": main.startup.as_dict()}))
+"""
+
+
+def import_times() -> list:
+    """(módulo, propio, acumulado) en segundos según `-X importtime`"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        entries.append({
+            "module": module.strip(),
+            "depth": (len(module) - len(module.lstrip()) - 1) // 2,
+            "self_seconds": int(own) / 1e6,
+            "cumulative_seconds": int(cumulative) / 1e6
+        })
+    return entries
+
+
+def readiness(warmup: bool) -> dict:
+    environment = dict(os.environ, FOURIER_WARMUP="1" if warmup else "0")
+    completed = subprocess.run([sys.executable, "-c", READINESS_PROBE], cwd=ROOT_DIR, env=environment,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe de arranque en frío")
+    parser.add_argument("--top", type=int, default=20, help="Módulos mostrados")
+    parser.add_argument("--output", help="Guarda el informe completo en JSON")
+    args = parser.parse_args()
+
+    entries = import_times()
+    main_entry = next((entry for entry in entries if entry["module"] == "main"), None)
+    print(f"{'='*70}\nImportación de main: {main_entry['cumulative_seconds'] * 1000:.1f} ms\n{'-'*70}")
+    print(f"{'acumulado':>11} {'propio':>9}  módulo")
+    for entry in sorted(entries, key=lambda entry: entry["cumulative_seconds"], reverse=True)[:args.top]:
+        print(f"{entry['cumulative_seconds'] * 1000:9.1f}ms {entry['self_seconds'] * 1000:7.1f}ms  "
+              f"{'  ' * entry['depth']}{entry['module']}")
+
+    report = {"imports": entries}
+    for warmup in (False, True):
+        result = readiness(warmup)
+        report["warmup" if warmup else "no_warmup"] = result
+        print(f"\n{'='*70}\nArranque {'con' if warmup else 'sin'} calentamiento\n{'-'*70}")
+        print(f"Importación:        {result['import_seconds'] * 1000:8.1f} ms")
+        print(f"Lista (/api/health): {result['ready_seconds'] * 1000:7.1f} ms")
+        print(f"Primera petición:   {result['first_request_seconds'] * 1000:8.1f} ms")
+        for step, seconds in result["startup"]["warmup_steps"].items():
+            print(f"  calentamiento {step}: {seconds * 1000:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Informe guardado en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,92 @@
 # API/main.py – FastAPI REST API para Análisis de Fourier
+import time
+_import_started = time.perf_counter()
+
+import asyncio
 import os
 import sys
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-import numpy as np
-import math
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+from typing import List, Optional, Dict, Any, ClassVar, Literal, Union
+import struct
 
 # Agregar el directorio actual al path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from Analisis_de_Fourier.FourierSynthesizer import FourierSynthesizer
-from Funciones_Matematicas.CustomFunction import CustomFunction
-from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+from Analisis_de_Fourier.AnalysisPipeline import AnalysisPipeline, AnalysisResult, InvalidFunctionError, run_in_worker
+from Analisis_de_Fourier.CoefficientCache import CoefficientCache
+from Analisis_de_Fourier.ProgressiveSession import ProgressiveSession
+from Modelos_de_Datos.ColumnarEncoder import ColumnarEncoder
 from Modelos_de_Datos.FunctionParameters import FunctionParameters
+from Modelos_de_Datos.JSONEncoder import JSONEncoder
+from Modelos_de_Datos.ResponseRenderer import ResponseRenderer
+from Modelos_de_Datos.ServerConfig import ServerConfig
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+from Infraestructura.AnalysisExecutor import (AnalysisExecutor, AnalysisTimeoutError,
+                                              ClientDisconnectedError, ExecutorOverloadedError)
+from Infraestructura.CoefficientStore import CoefficientStore
+from Infraestructura.MetricsMiddleware import MetricsMiddleware
+from Infraestructura.MetricsRegistry import MetricsRegistry
+from Infraestructura.ResponseCache import ResponseCache
+from Infraestructura.RequestProfiler import ProfilingDeniedError, RequestProfiler
+from Infraestructura.StageTimer import StageTimer
+from Infraestructura.StartupState import StartupState
+
+# Estado de arranque (tiempo de importación y calentamiento) para /api/health
+startup = StartupState(time.perf_counter() - _import_started)
+
+# Configuración del servidor y caché de coeficientes compartida por todas las peticiones
+config = ServerConfig.from_env()
+coefficient_cache = CoefficientCache(config.coefficient_cache_size, config.coefficient_cache_ttl)
+# Almacén en disco opcional, compartido entre procesos y reinicios
+coefficient_store = CoefficientStore(config.coefficient_store_dir, config.coefficient_store_max_bytes) \
+    if config.coefficient_store_dir else None
+pipeline = AnalysisPipeline(coefficient_cache, coefficient_store)
+
+# El cálculo se ejecuta en pools de hilos/procesos para no bloquear el bucle de eventos
+executor = AnalysisExecutor(config.thread_workers, config.process_workers,
+                            config.max_pending, config.request_timeout)
+
+# Respuestas ya serializadas por petición canónica (ETag, 304 y gzip)
+response_cache = ResponseCache(config.response_cache_bytes, config.response_cache_max_age)
+
+# Perfilado bajo demanda (token) o por muestreo (directorio + tasa)
+profiler = RequestProfiler(config.profile_token, config.profile_sample_rate,
+                           config.profile_dir, config.profile_top)
+
+# Métricas en memoria expuestas en /api/metrics (formato Prometheus)
+metrics = MetricsRegistry()
+metrics.counter("fourier_http_requests_total", "Peticiones HTTP por endpoint y código de estado")
+metrics.histogram("fourier_request_duration_seconds", "Latencia de las peticiones por endpoint")
+metrics.histogram("fourier_response_bytes", "Tamaño del cuerpo de la respuesta por endpoint", MetricsRegistry.SIZE_BUCKETS)
+metrics.gauge("fourier_requests_in_flight", "Peticiones en curso por endpoint")
+metrics.counter("fourier_analyses_total", "Análisis por endpoint, tipo de función y resultado")
+metrics.histogram("fourier_stage_duration_seconds", "Duración de cada etapa del análisis")
+metrics.gauge("fourier_executor_pending", "Análisis admitidos pendientes en los pools")
+metrics.counter("fourier_response_cache_lookups_total", "Consultas a la caché de respuestas por resultado")
+metrics.counter("fourier_response_cache_evictions_total", "Respuestas desalojadas de la caché por tamaño")
+metrics.gauge("fourier_response_cache_bytes", "Bytes ocupados por la caché de respuestas")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranque y parada de los pools de ejecución; calentamiento en segundo plano"""
+    executor.start()
+    warmup_task = None
+    if config.warmup:
+        startup.begin_warmup()
+        warmup_task = asyncio.create_task(warm_up())
+    else:
+        startup.mark_ready()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    executor.shutdown()
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -24,9 +94,12 @@ app = FastAPI(
     description="API REST para análisis y síntesis de Series de Fourier",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Configurar CORS para permitir acceso desde cualquier origen
 app.add_middleware(
     CORSMiddleware,
@@ -40,15 +113,72 @@ app.add_middleware(
 # MODELOS DE DATOS (Pydantic)
 # ============================================================================
 
-class FunctionRequest(BaseModel):
-    """Solicitud para analizar una función"""
+# Las funciones predefinidas se calculan sobre un periodo y se repiten
+# (PeriodicTiling), de modo que admiten hasta 120 s. Las personalizadas no se
+# suponen periódicas y se evalúan muestra a muestra: conservan el límite de 30 s.
+MAX_CUSTOM_DURATION = 30.0
+
+def check_custom_duration(request, max_duration: Optional[float]):
+    """Rechaza (422) duraciones mayores que max_duration en funciones personalizadas"""
+    if max_duration is not None and request.function_type == "Personalizada" and request.duration > max_duration:
+        raise ValueError(f"duration admite como máximo {max_duration:g} s en funciones personalizadas")
+    return request
+
+class FunctionDefinition(BaseModel):
+    """Función a analizar, malla de muestreo y número de armónicos"""
     function_type: str = Field(..., description="Tipo de función: Personalizada, Seno, Coseno, etc.")
     expression: Optional[str] = Field(None, description="Expresión matemática para funciones personalizadas")
     amplitude: float = Field(1.0, gt=0, description="Amplitud de la función")
     period: float = Field(2.0, gt=0, description="Período de la función")
-    duration: float = Field(10.0, gt=0, le=30, description="Duración de la simulación")
+    duration: float = Field(10.0, gt=0, le=120, description="Duración de la simulación (hasta 30 s en funciones personalizadas)")
     n_harmonics: int = Field(10, gt=0, le=100, description="Número de armónicos para la Serie de Fourier")
     sampling_rate: int = Field(1000, gt=100, le=10000, description="Frecuencia de muestreo (Hz)")
+    coefficient_method: str = Field("analytic", pattern="^(analytic|numeric)$", description="Coeficientes de funciones predefinidas: analytic (forma cerrada) o numeric (integración por FFT)")
+
+    # Duración máxima de las funciones personalizadas (None: sin límite propio)
+    max_custom_duration: ClassVar[Optional[float]] = MAX_CUSTOM_DURATION
+
+    @model_validator(mode="after")
+    def check_duration(self):
+        return check_custom_duration(self, self.max_custom_duration)
+
+class SignalRequest(FunctionDefinition):
+    """Parámetros comunes del análisis: función, malla, armónicos y precisión"""
+    dtype: Literal["float32", "float64"] = Field("float64", description="Precisión de las señales y del espectro; las estadísticas se acumulan siempre en float64")
+    decimals: Optional[int] = Field(None, ge=0, le=15, description="Decimales de las señales y magnitudes enviadas (los ejes de tiempo y frecuencia no se redondean)")
+    significant_digits: Optional[int] = Field(None, ge=1, le=17, description="Cifras significativas de las señales y magnitudes enviadas (los ejes de tiempo y frecuencia no se redondean)")
+    target_rmse: Optional[float] = Field(None, gt=0, description="Modo adaptativo: RMSE objetivo en un periodo; el servidor elige n_harmonics (hasta 100) y el muestreo de los coeficientes")
+    target_energy_fraction: Optional[float] = Field(None, gt=0, le=1, description="Modo adaptativo: fracción de la energía de la señal que debe capturar la serie (con target_rmse se aplica el más exigente)")
+
+class FunctionRequest(SignalRequest):
+    """Solicitud para analizar una función"""
+    include: Optional[List[Literal["signals", "original_signal", "fourier_approximation", "error_signal", "coefficients", "frequency_spectrum", "statistics"]]] = Field(None, description="Partes de la respuesta a calcular (todas si se omite); lo no solicitado no se calcula")
+    layout: str = Field("standard", pattern="^(standard|columnar)$", description="standard: cada señal con su eje de tiempo; columnar: eje de tiempo implícito (start, dt, count) enviado una vez")
+    max_points: Optional[int] = Field(None, ge=10, le=100000, description="Máximo de puntos por señal y espectro (diezmado en el servidor); las estadísticas usan la resolución completa")
+    downsample_method: str = Field("lttb", pattern="^(lttb|minmax)$", description="Método de diezmado: lttb (Largest-Triangle-Three-Buckets) o minmax")
+    spectrum_min_frequency: float = Field(0.0, ge=0, description="Frecuencia mínima del espectro (excluida), en Hz")
+    spectrum_max_frequency: Optional[float] = Field(50.0, gt=0, description="Frecuencia máxima del espectro (incluida), en Hz; null para llegar a Nyquist")
+    spectrum_window: Optional[Literal["hann", "hamming", "blackman"]] = Field(None, description="Ventana aplicada antes de la FFT (ninguna si se omite)")
+
+class StreamingFunctionRequest(SignalRequest):
+    """Solicitud de análisis por streaming: admite duraciones y frecuencias mayores.
+
+    Envía siempre las tres señales completas y sin espectro, de modo que los
+    campos de proyección, diezmado y espectro de /api/analyze (include,
+    layout, max_points, ...) se rechazan con 422 en lugar de ignorarse.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    duration: float = Field(10.0, gt=0, le=600, description="Duración de la simulación")
+    sampling_rate: int = Field(1000, gt=100, le=100000, description="Frecuencia de muestreo (Hz)")
+    chunk_size: int = Field(65536, ge=1000, le=1000000, description="Muestras por bloque enviado")
+
+    # El streaming envía la señal por bloques: también admite 600 s en funciones personalizadas
+    max_custom_duration: ClassVar[Optional[float]] = None
+
+class ProgressiveFunctionRequest(FunctionRequest):
+    """Mensaje de /api/ws/analyze: parámetros del análisis y un identificador opcional"""
+    id: Optional[Union[int, str]] = Field(None, description="Identificador devuelto en los eventos (número de mensaje si se omite)")
 
 class FourierCoefficients(BaseModel):
     """Coeficientes de Fourier"""
@@ -73,6 +203,82 @@ class FourierAnalysisResponse(BaseModel):
     frequency_spectrum: Dict[str, List[float]] = Field(..., description="Espectro de frecuencias (FFT)")
     statistics: Dict[str, float] = Field(..., description="Estadísticas del análisis")
 
+class ProjectedAnalysisResponse(BaseModel):
+    """Respuesta con `include`: solo las partes solicitadas (las demás se omiten)"""
+    metadata: Dict[str, Any] = Field(..., description="Metadatos de la función")
+    original_signal: Optional[SignalData] = Field(None, description="Señal original")
+    fourier_approximation: Optional[SignalData] = Field(None, description="Aproximación de Fourier")
+    error_signal: Optional[SignalData] = Field(None, description="Error de aproximación")
+    coefficients: Optional[FourierCoefficients] = Field(None, description="Coeficientes de Fourier")
+    frequency_spectrum: Optional[Dict[str, List[float]]] = Field(None, description="Espectro de frecuencias (FFT)")
+    statistics: Optional[Dict[str, float]] = Field(None, description="Estadísticas del análisis")
+
+class TimeAxis(BaseModel):
+    """Eje de tiempo implícito: t[k] = start + k·dt, k = 0..count-1"""
+    start: float = Field(..., description="Instante inicial")
+    dt: float = Field(..., description="Paso de muestreo")
+    count: int = Field(..., description="Número de muestras")
+
+class ColumnarAnalysisResponse(BaseModel):
+    """Respuesta columnar: el eje de tiempo se describe una sola vez"""
+    metadata: Dict[str, Any] = Field(..., description="Metadatos de la función")
+    time: Optional[TimeAxis] = Field(None, description="Eje de tiempo común a todas las señales")
+    signals: Dict[str, List[float]] = Field(default_factory=dict, description="Valores de cada señal solicitada")
+    signal_times: Optional[Dict[str, List[float]]] = Field(None, description="Eje de tiempo propio de cada señal cuando se diezman (max_points)")
+    coefficients: Optional[FourierCoefficients] = Field(None, description="Coeficientes de Fourier")
+    frequency_spectrum: Optional[Dict[str, List[float]]] = Field(None, description="Espectro de frecuencias (FFT)")
+    statistics: Optional[Dict[str, float]] = Field(None, description="Estadísticas del análisis")
+
+class BatchAnalysisRequest(BaseModel):
+    """Lote de análisis independientes que comparten mallas y coeficientes"""
+    items: List[FunctionRequest] = Field(..., min_length=1, max_length=100, description="Peticiones a analizar (mismos campos que /api/analyze)")
+
+class BatchItemResult(BaseModel):
+    """Resultado de una petición del lote: el análisis o su error"""
+    index: int = Field(..., description="Posición de la petición en el lote")
+    status: Literal["ok", "error"] = Field(..., description="Estado de la petición")
+    status_code: int = Field(..., description="Código HTTP equivalente (200, 400 o 500)")
+    result: Optional[Dict[str, Any]] = Field(None, description="Respuesta con el mismo formato que /api/analyze (según su layout)")
+    detail: Optional[str] = Field(None, description="Descripción del error")
+
+class BatchAnalysisResponse(BaseModel):
+    """Respuesta del lote, en el mismo orden que las peticiones"""
+    results: List[BatchItemResult]
+
+class SweepRequest(FunctionDefinition):
+    """Barrido de convergencia: estadísticas para cada n = 1..n_harmonics"""
+    n_harmonics: int = Field(100, gt=0, le=100, description="Número máximo de armónicos del barrido")
+    snapshots: Optional[List[int]] = Field(None, max_length=20, description="Valores de n (1..n_harmonics) para los que se devuelve la aproximación completa")
+
+    @model_validator(mode="after")
+    def check_snapshots(self):
+        """Rechaza (422) los snapshots fuera de 1..n_harmonics en lugar de omitirlos"""
+        invalid = [n for n in self.snapshots or () if not 1 <= n <= self.n_harmonics]
+        if invalid:
+            raise ValueError(f"snapshots debe estar entre 1 y n_harmonics ({self.n_harmonics}); no válidos: {invalid}")
+        return self
+
+class SweepStatistics(BaseModel):
+    """Estadísticas del error para cada número de armónicos"""
+    n_harmonics: List[int] = Field(..., description="Número de armónicos de cada paso")
+    mse: List[float] = Field(..., description="Error cuadrático medio")
+    rmse: List[float] = Field(..., description="Raíz del error cuadrático medio")
+    max_error: List[float] = Field(..., description="Error máximo absoluto")
+    energy: List[float] = Field(..., description="Energía acumulada de los armónicos Σ(an² + bn²)")
+
+class SweepSnapshot(BaseModel):
+    """Aproximación de Fourier con n armónicos"""
+    n_harmonics: int = Field(..., description="Número de armónicos")
+    values: List[float] = Field(..., description="Valores de la aproximación")
+
+class SweepResponse(BaseModel):
+    """Resultado del barrido de convergencia"""
+    metadata: Dict[str, Any] = Field(..., description="Metadatos de la función")
+    coefficients: FourierCoefficients = Field(..., description="Coeficientes hasta el máximo n")
+    sweep: SweepStatistics = Field(..., description="Estadísticas para cada n")
+    time: Optional[TimeAxis] = Field(None, description="Eje de tiempo de las aproximaciones (solo con snapshots)")
+    snapshots: Optional[List[SweepSnapshot]] = Field(None, description="Aproximaciones en los n solicitados")
+
 class FunctionInfo(BaseModel):
     """Información de funciones disponibles"""
     name: str
@@ -92,19 +298,58 @@ async def root():
         "docs": "/api/docs",
         "endpoints": {
             "analyze": "/api/analyze",
+            "analyze_stream": "/api/analyze/stream",
+            "analyze_batch": "/api/analyze/batch",
+            "analyze_sweep": "/api/analyze/sweep",
             "functions": "/api/functions",
-            "health": "/api/health"
+            "health": "/api/health",
+            "cache": "/api/cache/stats",
+            "metrics": "/api/metrics"
         }
     }
 
 @app.get("/api/health")
 async def health_check():
-    """Verificación de salud del API"""
-    return {
-        "status": "healthy",
+    """Verificación de salud del API (503 mientras la instancia se calienta)"""
+    body = {
+        "status": "healthy" if startup.ready else "warming",
         "service": "Fourier Analysis API",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "startup": startup.as_dict()
     }
+    if not startup.ready:
+        return JSONResponse(body, status_code=503)
+    return body
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Contadores de la caché de coeficientes (aciertos, fallos, desalojos), del almacén en disco
+    y de la caché de respuestas"""
+    stats = coefficient_cache.stats()
+    stats["store"] = coefficient_store.stats() if coefficient_store is not None else None
+    stats["responses"] = response_cache.stats()
+    return stats
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Métricas en formato de exposición de Prometheus"""
+    metrics.set("fourier_executor_pending", executor.pending)
+    responses = response_cache.stats()
+    for result in ("hits", "misses", "not_modified"):
+        metrics.set("fourier_response_cache_lookups_total", responses[result], {"result": result})
+    metrics.set("fourier_response_cache_evictions_total", responses["evictions"])
+    metrics.set("fourier_response_cache_bytes", responses["bytes"])
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def function_label(function_type: str) -> str:
+    """Etiqueta acotada para las métricas por tipo de función"""
+    if function_type == "Personalizada" or function_type in PredefinedFunction.FUNCTION_TYPES:
+        return function_type
+    return "desconocida"
+
+def count_analysis(endpoint: str, function_type: str, outcome: str):
+    metrics.inc("fourier_analyses_total", {"endpoint": endpoint, "function_type": function_label(function_type),
+                                           "outcome": outcome})
 
 @app.get("/api/functions", response_model=List[FunctionInfo])
 async def get_available_functions():
@@ -143,8 +388,173 @@ async def get_available_functions():
     ]
     return functions
 
-@app.post("/api/analyze", response_model=FourierAnalysisResponse)
-async def analyze_function(request: FunctionRequest):
+NOT_ACCEPTABLE = "Ninguno de los formatos aceptados por Accept está disponible (JSON, columnar o MessagePack)"
+
+def negotiate_format(accept: Optional[str], default_dtype: str = "float64"):
+    """Elige el formato de respuesta según la cabecera Accept: (formato, dtype)
+
+    Gana el formato con mayor q; a igualdad, un tipo explícito frente a un
+    comodín y después el primero de la cabecera. q=0 excluye el formato.
+    MessagePack solo se elige si el paquete está instalado. Si ningún formato
+    es aceptable se responde en JSON, salvo que JSON (o el comodín que lo
+    cubre) tenga q=0: entonces devuelve (None, None). Los buffers binarios
+    usan el dtype de la petición salvo que Accept indique otro.
+    """
+    # (q, tipo explícito, -posición, formato, dtype)
+    candidates = []
+    wildcard = None
+    for index, media_range in enumerate((accept or "").split(",")):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        media_type = media_type.lower()
+        dtype = default_dtype
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            name, value = name.strip().lower(), value.strip()
+            if name == "dtype" and value in ColumnarEncoder.DTYPES:
+                dtype = value
+            elif name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in ("application/json", NDJSON_MEDIA_TYPE):
+            candidates.append((q, 1, -index, "json", "float64"))
+        elif media_type in ("*/*", "application/*"):
+            if wildcard is None or q > wildcard[0]:
+                wildcard = (q, 0, -index, "json", "float64")
+        elif media_type == ColumnarEncoder.MEDIA_TYPE:
+            candidates.append((q, 1, -index, "columnar", dtype))
+        elif media_type in ColumnarEncoder.MSGPACK_MEDIA_TYPES and ColumnarEncoder.msgpack_available():
+            candidates.append((q, 1, -index, "msgpack", dtype))
+
+    # JSON sin mención explícita queda cubierto por el comodín, si lo hay
+    if wildcard is not None and not any(candidate[3] == "json" for candidate in candidates):
+        candidates.append(wildcard)
+    best = max(candidates, default=None)
+    if best is not None and best[0] > 0:
+        return best[3], best[4]
+    if any(candidate[3] == "json" and candidate[0] == 0 for candidate in candidates):
+        return None, None
+    return "json", "float64"
+
+def render_response(result: AnalysisResult, layout: str, response_format: str, dtype: str) -> Response:
+    """Serializa el resultado en el formato negociado"""
+    body, media_type = ResponseRenderer.render(result, layout, response_format, dtype)
+    return Response(body, media_type=media_type)
+
+def timed_response(body: bytes, media_type: str, timings: dict) -> Response:
+    """Respuesta con la cabecera Server-Timing; registra la duración de cada etapa"""
+    for stage, seconds in timings.items():
+        metrics.observe("fourier_stage_duration_seconds", seconds, {"stage": stage})
+    return Response(body, media_type=media_type, headers={"Server-Timing": StageTimer.server_timing(timings)})
+
+def render_timed(result: AnalysisResult, layout: str, response_format: str, dtype: str) -> Response:
+    """Serializa el resultado y añade la cabecera Server-Timing con cada etapa"""
+    return timed_response(*ResponseRenderer.render_timed(result, layout, response_format, dtype))
+
+def analyze_and_render(request: FunctionRequest, response_format: str, dtype: str) -> Response:
+    """Pipeline completo más serialización (se ejecuta en el pool de hilos)"""
+    result = pipeline.run(request)
+    return render_timed(result, request.layout, response_format, dtype)
+
+def profile_and_render(request: FunctionRequest, response_format: str, dtype: str, include_report: bool) -> Response:
+    """Pipeline bajo cProfile; el informe va en metadata["profile"] si se pidió con token"""
+    result, report = profiler.run(pipeline.run, request, tags=RequestProfiler.tags(request))
+    if include_report:
+        result.metadata["profile"] = report
+    return render_timed(result, request.layout, response_format, dtype)
+
+async def compute_analysis(request: FunctionRequest, response_format: str, dtype: str,
+                           profile_mode: Optional[str] = None) -> Response:
+    """Envía el cálculo al pool adecuado: procesos para expresiones personalizadas si hay pool"""
+    if profile_mode is not None:
+        # Los perfiles se ejecutan siempre en este proceso (pool de hilos)
+        return await executor.call("thread", profile_and_render, request, response_format, dtype,
+                                   profile_mode == "response")
+    if request.function_type == "Personalizada" and executor.process_workers > 0:
+        # El proceso devuelve la respuesta ya serializada, no los arrays
+        return timed_response(*await executor.call("process", run_in_worker, request.model_dump(),
+                                                   response_format, dtype))
+    return await executor.call("thread", analyze_and_render, request, response_format, dtype)
+
+def cache_headers(etag: str) -> dict:
+    """Cabeceras de validación y caché HTTP de una respuesta de /api/analyze"""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={response_cache.max_age}",
+        "Vary": "Accept, Accept-Encoding"
+    }
+
+def cached_response(entry: dict, etag: str) -> Response:
+    """Respuesta a partir de una entrada de la caché (sin cálculo ni serialización)"""
+    headers = cache_headers(etag)
+    headers["Server-Timing"] = 'cache;desc="hit"'
+    if entry["encoding"] != "identity":
+        headers["Content-Encoding"] = entry["encoding"]
+    return Response(entry["body"], media_type=entry["media_type"], headers=headers)
+
+def store_response(key: str, encoding: str, response: Response) -> dict:
+    """Guarda el cuerpo serializado y lo comprime si el cliente acepta gzip (pool de hilos)"""
+    media_type = response.headers.get("content-type", response.media_type)
+    body = response.body
+    digest = ResponseCache.digest(body)
+    response_cache.put(key, "identity", body, media_type, digest)
+    if encoding == "gzip":
+        body = ResponseCache.compress(body)
+        response_cache.put(key, "gzip", body, media_type, digest)
+    return {"body": body, "media_type": media_type, "encoding": encoding, "digest": digest,
+            "server_timing": response.headers["Server-Timing"]}
+
+def not_modified(etag: str) -> Response:
+    response_cache.record_not_modified()
+    return Response(status_code=304, headers=cache_headers(etag))
+
+async def cached_analysis(request: FunctionRequest, response_format: str, dtype: str, key: str,
+                          encoding: str, if_none_match: Optional[str]) -> Response:
+    """Análisis servido desde la caché de respuestas si es posible.
+
+    ``If-None-Match`` (incluido ``*``) solo se compara con una representación
+    que existe: la guardada o la recién calculada. Una petición inválida
+    nunca tiene entrada, así que no puede recibir 304.
+    """
+    entry = response_cache.get(key, encoding)
+    if entry is not None:
+        etag = ResponseCache.etag(entry["digest"], encoding)
+        if ResponseCache.etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        if entry["encoding"] != encoding:
+            # Ya serializada pero sin comprimir: solo falta gzip
+            body = await executor.call("thread", ResponseCache.compress, entry["body"])
+            response_cache.put(key, encoding, body, entry["media_type"], entry["digest"])
+            entry = {**entry, "body": body, "encoding": encoding}
+        return cached_response(entry, etag)
+
+    response = await compute_analysis(request, response_format, dtype)
+    entry = await executor.call("thread", store_response, key, encoding, response)
+    etag = ResponseCache.etag(entry["digest"], encoding)
+    if ResponseCache.etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = cache_headers(etag)
+    headers["Server-Timing"] = entry["server_timing"]
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(entry["body"], media_type=entry["media_type"], headers=headers)
+
+@app.post(
+    "/api/analyze",
+    # Sin include ni layout la respuesta es siempre FourierAnalysisResponse
+    response_model=Union[FourierAnalysisResponse, ProjectedAnalysisResponse, ColumnarAnalysisResponse],
+    responses={200: {"content": {
+        ColumnarEncoder.MEDIA_TYPE: {},
+        ColumnarEncoder.MSGPACK_MEDIA_TYPES[0]: {}
+    }}}
+)
+async def analyze_function(request: FunctionRequest, http_request: Request, accept: Optional[str] = Header(None),
+                           x_fourier_profile: Optional[str] = Header(None, description="Token de perfilado (FOURIER_PROFILE_TOKEN)"),
+                           profile: Optional[str] = Query(None, description="Token de perfilado (alternativa a la cabecera)"),
+                           if_none_match: Optional[str] = Header(None),
+                           accept_encoding: Optional[str] = Header(None)):
     """
     Analiza una función y retorna:
     - Señal original
@@ -153,124 +563,367 @@ async def analyze_function(request: FunctionRequest):
     - Coeficientes de Fourier
     - Espectro de frecuencias
     - Estadísticas
+
+    Con `include` solo se calculan las partes indicadas y con `layout="columnar"`
+    el eje de tiempo se describe una sola vez como (start, dt, count).
+
+    Con `Accept: application/vnd.fourier.columnar` (opcionalmente `; dtype=float32`)
+    o `Accept: application/msgpack` las señales se envían como buffers binarios.
+
+    Con la cabecera `X-Fourier-Profile: <token>` (o `?profile=<token>`) el
+    pipeline se ejecuta bajo cProfile y las funciones más costosas se
+    devuelven en `metadata.profile`.
+
+    Las respuestas se guardan ya serializadas (y comprimidas con gzip si el
+    cliente lo acepta) con un `ETag` derivado del cuerpo: repetir la misma
+    petición no recalcula nada y con `If-None-Match` se responde 304.
     """
+    response_format, dtype = negotiate_format(accept, request.dtype)
+    if response_format is None:
+        raise HTTPException(status_code=406, detail=NOT_ACCEPTABLE)
     try:
-        # Crear la función según el tipo
-        if request.function_type == "Personalizada":
-            if not request.expression:
-                raise HTTPException(status_code=400, detail="Se requiere una expresión matemática para funciones personalizadas")
-
-            # Validar que la expresión no esté vacía o solo con espacios
-            if not request.expression.strip():
-                raise HTTPException(status_code=400, detail="La expresión matemática no puede estar vacía")
-
-            # Validar expresión
-            try:
-                function = CustomFunction(request.expression, request.amplitude, request.period)
-
-                # Probar evaluación en múltiples puntos para detectar errores
-                test_points = [0.0, 0.5, 1.0]
-                for t_test in test_points:
-                    test_value = function.evaluate(t_test)
-                    if not isinstance(test_value, (int, float)) or math.isnan(test_value) or math.isinf(test_value):
-                        raise ValueError(f"La expresión produce valores no válidos (NaN o infinito) en t={t_test}")
-
-            except ValueError as e:
-                # ValueError ya tiene mensajes descriptivos de CustomFunction
-                raise HTTPException(status_code=400, detail=str(e))
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Error al procesar la expresión: {str(e)}")
-        else:
-            function = PredefinedFunction(request.function_type, request.amplitude, request.period)
-
-        # Configurar sintetizador
-        synthesizer = FourierSynthesizer()
-        synthesizer.set_function(function)
-
-        # Generar array de tiempo
-        dt = 1.0 / request.sampling_rate
-        t = np.arange(0, request.duration, dt)
-
-        # Obtener señales
-        original_signal = synthesizer.get_original_signal(t)
-        fourier_signal = synthesizer.synthesize(t, request.n_harmonics)
-        error_signal = original_signal - fourier_signal
-
-        # Calcular coeficientes de Fourier
-        coeffs = synthesizer.calculate_coefficients(request.n_harmonics)
-
-        # Calcular magnitudes y fases
-        magnitudes = []
-        phases = []
-        for an, bn in zip(coeffs['an'], coeffs['bn']):
-            magnitude = math.sqrt(an**2 + bn**2)
-            phase = math.atan2(bn, an) if magnitude > 1e-10 else 0
-            magnitudes.append(magnitude)
-            phases.append(phase)
-
-        # Calcular FFT
-        fft_values = np.fft.fft(original_signal)
-        fft_freqs = np.fft.fftfreq(len(original_signal), dt)
-        fft_magnitude = np.abs(fft_values)
-
-        # Solo frecuencias positivas hasta 50 Hz
-        pos_mask = (fft_freqs > 0) & (fft_freqs <= 50)
-
-        # Estadísticas
-        mse = float(np.mean(error_signal**2))
-        rmse = float(np.sqrt(mse))
-        max_error = float(np.max(np.abs(error_signal)))
-        total_energy = float(sum(an**2 + bn**2 for an, bn in zip(coeffs['an'], coeffs['bn'])))
-
-        # Construir respuesta
-        response = FourierAnalysisResponse(
-            metadata={
-                "function_type": request.function_type,
-                "expression": request.expression or function.name,
-                "amplitude": request.amplitude,
-                "period": request.period,
-                "duration": request.duration,
-                "n_harmonics": request.n_harmonics,
-                "sampling_rate": request.sampling_rate,
-                "fundamental_frequency": 1.0 / request.period
-            },
-            original_signal=SignalData(
-                time=t.tolist(),
-                values=original_signal.tolist()
-            ),
-            fourier_approximation=SignalData(
-                time=t.tolist(),
-                values=fourier_signal.tolist()
-            ),
-            error_signal=SignalData(
-                time=t.tolist(),
-                values=error_signal.tolist()
-            ),
-            coefficients=FourierCoefficients(
-                a0=coeffs['a0'],
-                an=coeffs['an'],
-                bn=coeffs['bn'],
-                magnitudes=magnitudes,
-                phases=phases
-            ),
-            frequency_spectrum={
-                "frequencies": fft_freqs[pos_mask].tolist(),
-                "magnitudes": fft_magnitude[pos_mask].tolist()
-            },
-            statistics={
-                "mse": mse,
-                "rmse": rmse,
-                "max_error": max_error,
-                "total_energy": total_energy
-            }
-        )
+        profile_mode = profiler.mode(x_fourier_profile if x_fourier_profile is not None else profile)
+    except ProfilingDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
 
-        return response
+    key = None
+    if profile_mode is None and response_cache.enabled:
+        key = ResponseCache.key(request.model_dump(), response_format, dtype)
+        encoding = "gzip" if ResponseCache.accepts_gzip(accept_encoding) else "identity"
 
+    outcome = "error"
+    try:
+        if key is not None:
+            analysis = cached_analysis(request, response_format, dtype, key, encoding, if_none_match)
+        else:
+            analysis = compute_analysis(request, response_format, dtype, profile_mode)
+        response = await executor.guard(analysis, http_request)
+        outcome = "not_modified" if response.status_code == 304 else "ok"
+        return response
+    except InvalidFunctionError as e:
+        outcome = "invalid"
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorOverloadedError as e:
+        outcome = "rejected"
+        raise HTTPException(status_code=503, detail=str(e))
+    except AnalysisTimeoutError as e:
+        outcome = "timeout"
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnectedError:
+        # Nadie recibirá la respuesta; 499 solo queda en los registros
+        outcome = "cancelled"
+        return Response(status_code=499)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error en el análisis: {str(e)}")
+    finally:
+        count_analysis("analyze", request.function_type, outcome)
+
+def batch_item(index: int, request: FunctionRequest, outcome) -> dict:
+    """Resultado serializable de una petición del lote"""
+    count_analysis("batch", request.function_type,
+                   "ok" if isinstance(outcome, AnalysisResult) else
+                   "invalid" if isinstance(outcome, InvalidFunctionError) else "error")
+    if isinstance(outcome, InvalidFunctionError):
+        return {"index": index, "status": "error", "status_code": 400, "detail": str(outcome)}
+    if isinstance(outcome, Exception):
+        return {"index": index, "status": "error", "status_code": 500,
+                "detail": f"Error en el análisis: {str(outcome)}"}
+    return {"index": index, "status": "ok", "status_code": 200,
+            "result": ResponseRenderer.payload(outcome, request.layout)}
+
+def analyze_batch_and_render(requests: List[FunctionRequest]) -> Response:
+    """Lote completo más serialización (se ejecuta en el pool de hilos)"""
+    outcomes = pipeline.run_batch(requests)
+    results = [batch_item(index, request, outcome) for index, (request, outcome) in enumerate(zip(requests, outcomes))]
+    return Response(JSONEncoder.encode({"results": results}), media_type=JSONEncoder.MEDIA_TYPE)
+
+@app.post("/api/analyze/batch", response_model=BatchAnalysisResponse, response_model_exclude_none=True)
+async def analyze_batch(request: BatchAnalysisRequest, http_request: Request):
+    """
+    Analiza varias funciones en una sola petición.
+
+    Las peticiones con la misma duración y frecuencia de muestreo comparten la
+    malla de tiempo, los coeficientes se calculan una vez por función y periodo
+    y la síntesis de las series con la misma malla y periodo se hace apilada.
+    Cada elemento de `results` lleva su propio estado: un error en una
+    petición no invalida las demás. Las respuestas son siempre JSON.
+    """
+    try:
+        return await executor.guard(executor.call("thread", analyze_batch_and_render, request.items),
+                                    http_request)
+    except ExecutorOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except AnalysisTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnectedError:
+        return Response(status_code=499)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en el análisis: {str(e)}")
+
+def sweep_and_render(request: SweepRequest) -> Response:
+    """Barrido completo más serialización (se ejecuta en el pool de hilos)"""
+    sweep = pipeline.sweep(request, snapshots=request.snapshots or ())
+    payload = ResponseRenderer.without_none({
+        "metadata": sweep["metadata"],
+        "coefficients": sweep["coefficients"],
+        "sweep": {"n_harmonics": sweep["n_harmonics"], **sweep["statistics"]},
+        "time": {"start": 0.0, "dt": float(sweep["dt"]), "count": sweep["n_samples"]} if sweep["snapshots"] else None,
+        "snapshots": [{"n_harmonics": n, "values": values}
+                      for n, values in sorted(sweep["snapshots"].items())] or None
+    })
+    return Response(JSONEncoder.encode(payload), media_type=JSONEncoder.MEDIA_TYPE)
+
+@app.post("/api/analyze/sweep", response_model=SweepResponse, response_model_exclude_none=True)
+async def analyze_sweep(request: SweepRequest, http_request: Request):
+    """
+    Barrido de convergencia (fenómeno de Gibbs) en una sola petición.
+
+    Calcula los coeficientes una vez con el máximo `n_harmonics` y construye
+    las sumas parciales de forma acumulada, añadiendo un armónico por paso.
+    Devuelve `mse`, `rmse`, `max_error` y la energía para cada n = 1..n_harmonics
+    y, opcionalmente, la aproximación completa en los n indicados en `snapshots`.
+    """
+    outcome = "error"
+    try:
+        response = await executor.guard(executor.call("thread", sweep_and_render, request), http_request)
+        outcome = "ok"
+        return response
+    except InvalidFunctionError as e:
+        outcome = "invalid"
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorOverloadedError as e:
+        outcome = "rejected"
+        raise HTTPException(status_code=503, detail=str(e))
+    except AnalysisTimeoutError as e:
+        outcome = "timeout"
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnectedError:
+        outcome = "cancelled"
+        return Response(status_code=499)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en el análisis: {str(e)}")
+    finally:
+        count_analysis("sweep", request.function_type, outcome)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_SIGNALS = ("original_signal", "fourier_approximation", "error_signal")
+
+def open_stream(request: StreamingFunctionRequest):
+    """Crea la función y el generador del streaming y calcula su cabecera (coeficientes)"""
+    function = pipeline.build_function(request)
+    events = pipeline.stream(request, function, request.chunk_size)
+    return events, next(events)
+
+async def guarded_events(header: dict, events):
+    """Envía la cabecera y calcula cada bloque en el pool de hilos.
+
+    El streaming ya está admitido: los bloques no se rechazan por la cola, pero
+    cada uno está sujeto al tiempo máximo. Un error a mitad del streaming se
+    convierte en un evento final de tipo error.
+    """
+    yield header
+    try:
+        while True:
+            event = await executor.guard(executor.call("thread", next, events, None), admission=False)
+            if event is None:
+                break
+            yield event
+    except AnalysisTimeoutError as e:
+        yield {"type": "error", "detail": str(e)}
+    except Exception as e:
+        yield {"type": "error", "detail": f"Error en el análisis: {str(e)}"}
+
+async def ndjson_events(events):
+    """Serializa cada evento del análisis como una línea JSON"""
+    async for event in events:
+        yield JSONEncoder.encode(event) + b"\n"
+
+async def binary_events(events, dtype: str):
+    """Serializa cada evento como un marco columnar precedido de su longitud (uint64 LE)"""
+    async for event in events:
+        columns = {name: event.pop(name) for name in STREAM_SIGNALS if name in event}
+        frame = ColumnarEncoder.encode(event, columns, dtype)
+        yield struct.pack("<Q", len(frame)) + frame
+
+@app.post("/api/analyze/stream", responses={200: {"content": {
+    NDJSON_MEDIA_TYPE: {},
+    ColumnarEncoder.MEDIA_TYPE: {}
+}}})
+async def analyze_function_stream(request: StreamingFunctionRequest, http_request: Request,
+                                  accept: Optional[str] = Header(None)):
+    """
+    Análisis por streaming para señales largas.
+
+    Envía primero los coeficientes, después las señales en bloques ordenados
+    en el tiempo y por último las estadísticas (mse, rmse, max_error), que se
+    acumulan mientras se generan los bloques. El espectro no se incluye.
+
+    Por defecto cada evento es una línea JSON (NDJSON). Con
+    `Accept: application/vnd.fourier.columnar` cada evento es un marco binario
+    columnar precedido de su longitud en 8 bytes little-endian.
+
+    La cabecera pasa por el control de admisión (503) y el tiempo máximo (504)
+    como /api/analyze; después cada bloque debe calcularse dentro del tiempo
+    máximo o el streaming termina con un evento de error.
+    """
+    response_format, dtype = negotiate_format(accept, request.dtype)
+    if response_format is None:
+        raise HTTPException(status_code=406, detail=NOT_ACCEPTABLE)
+
+    outcome = "error"
+    try:
+        events, header = await executor.guard(executor.call("thread", open_stream, request), http_request)
+        outcome = "ok"
+    except InvalidFunctionError as e:
+        outcome = "invalid"
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorOverloadedError as e:
+        outcome = "rejected"
+        raise HTTPException(status_code=503, detail=str(e))
+    except AnalysisTimeoutError as e:
+        outcome = "timeout"
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnectedError:
+        outcome = "cancelled"
+        return Response(status_code=499)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en el análisis: {str(e)}")
+    finally:
+        count_analysis("stream", request.function_type, outcome)
+
+    events = guarded_events(header, events)
+    if response_format == "columnar":
+        return StreamingResponse(binary_events(events, dtype), media_type=ColumnarEncoder.MEDIA_TYPE)
+    return StreamingResponse(ndjson_events(events), media_type=NDJSON_MEDIA_TYPE)
+
+def progressive_event(session: ProgressiveSession, request: ProgressiveFunctionRequest, levels: list,
+                      index: int, request_id) -> str:
+    """Calcula un nivel del refinamiento y lo serializa (se ejecuta en el pool de hilos)"""
+    result = session.analyze(request, levels[index])
+    return JSONEncoder.encode({"type": "result", "id": request_id, "level": index, "levels": len(levels),
+                               "final": index == len(levels) - 1,
+                               "result": ResponseRenderer.payload(result, request.layout)}).decode()
+
+async def send_error(websocket: WebSocket, request_id, status_code: int, detail):
+    await websocket.send_text(JSONEncoder.encode({"type": "error", "id": request_id,
+                                                  "status_code": status_code, "detail": detail}).decode())
+
+async def progressive_analysis(websocket: WebSocket, session: ProgressiveSession, message: str, sequence: int):
+    """Envía los niveles de un mensaje de grueso a fino; se cancela si llega otro mensaje"""
+    try:
+        request = ProgressiveFunctionRequest.model_validate_json(message)
+    except ValidationError as e:
+        await send_error(websocket, sequence, 422, jsonable_encoder(e.errors(include_url=False)))
+        return
+
+    request_id = request.id if request.id is not None else sequence
+    outcome = "error"
+    try:
+        levels = await executor.guard(executor.call("thread", session.prepare, request))
+        for index in range(len(levels)):
+            event = await executor.guard(executor.call("thread", progressive_event, session, request,
+                                                       levels, index, request_id))
+            await websocket.send_text(event)
+        outcome = "ok"
+    except asyncio.CancelledError:
+        # Parámetros más recientes o cierre de la conexión: el resto de niveles no se calcula
+        outcome = "cancelled"
+        raise
+    except InvalidFunctionError as e:
+        outcome = "invalid"
+        await send_error(websocket, request_id, 400, str(e))
+    except ExecutorOverloadedError as e:
+        outcome = "rejected"
+        await send_error(websocket, request_id, 503, str(e))
+    except AnalysisTimeoutError as e:
+        outcome = "timeout"
+        await send_error(websocket, request_id, 504, str(e))
+    except WebSocketDisconnect:
+        outcome = "cancelled"
+    except Exception as e:
+        await send_error(websocket, request_id, 500, f"Error en el análisis: {str(e)}")
+    finally:
+        count_analysis("websocket", request.function_type, outcome)
+
+@app.websocket("/api/ws/analyze")
+async def analyze_websocket(websocket: WebSocket):
+    """
+    Refinamiento progresivo para clientes interactivos.
+
+    Cada mensaje de texto es un `FunctionRequest` en JSON (con un `id`
+    opcional); los mensajes binarios se responden con un evento `error` (422).
+    Para cada mensaje se envían eventos `result` de grueso a fino:
+    primero pocos armónicos sobre una malla reducida y al final el análisis
+    pedido (`final: true`). Si llega un mensaje nuevo, los niveles pendientes
+    del anterior se cancelan. La conexión conserva la función compilada, los
+    coeficientes y las señales originales, así que un cambio de parámetros
+    solo recalcula lo que depende de él.
+    """
+    await websocket.accept()
+    session = ProgressiveSession(pipeline)
+    task = None
+    sequence = 0
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            sequence += 1
+            message = frame.get("text")
+            if message is None:
+                await send_error(websocket, sequence, 422, "Se esperaba un mensaje de texto con la petición en JSON")
+                continue
+            if task is not None and not task.done():
+                task.cancel()
+                # Se espera a que termine de cancelarse para no intercalar envíos
+                await asyncio.wait({task})
+            task = asyncio.create_task(progressive_analysis(websocket, session, message, sequence))
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+
+# ============================================================================
+# CALENTAMIENTO
+# ============================================================================
+
+# Máximo de armónicos admitido: la caché guarda este número y trunca para n menores
+WARMUP_HARMONICS = 100
+
+def precompute_coefficients():
+    """Coeficientes de todas las funciones predefinidas con el periodo por defecto"""
+    for function_type in PredefinedFunction.FUNCTION_TYPES:
+        pipeline.run(FunctionRequest(function_type=function_type, n_harmonics=WARMUP_HARMONICS,
+                                     include=["coefficients"]))
+
+def representative_analysis():
+    """Análisis completo con los valores por defecto en cada formato de respuesta"""
+    result = pipeline.run(FunctionRequest(function_type="Onda Cuadrada"))
+    render_response(result, "standard", "json", "float64")
+    render_response(result, "columnar", "json", "float64")
+    render_response(result, "standard", "columnar", "float32")
+
+async def warm_up():
+    """Prepara la instancia antes de declararla lista: caché de coeficientes,
+    rutas de cálculo/serialización y procesos del pool"""
+    try:
+        with startup.steps.stage("coefficients"):
+            await executor.call("thread", precompute_coefficients)
+        with startup.steps.stage("analysis"):
+            await executor.call("thread", representative_analysis)
+        if executor.process_workers > 0:
+            custom = FunctionRequest(function_type="Personalizada", expression="A * sin(2 * pi * t / T)",
+                                     duration=1.0).model_dump()
+            with startup.steps.stage("process_pool"):
+                await asyncio.gather(*(executor.call("process", run_in_worker, custom, "json", "float64")
+                                       for _ in range(executor.process_workers)))
+    except Exception as e:
+        # El fallo se informa en /api/health, pero no impide servir tráfico
+        startup.mark_ready(f"{type(e).__name__}: {str(e)}")
+        return
+    startup.mark_ready()
 
 # ============================================================================
 # EJECUCIÓN
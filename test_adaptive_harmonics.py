@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Script de prueba del modo adaptativo: convergencia del muestreo, elección del
+número de armónicos por Parseval, objetivos inalcanzables y caché de la
+selección
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from Analisis_de_Fourier.AdaptiveHarmonics import AdaptiveHarmonics
+from Analisis_de_Fourier.AnalysisPipeline import AnalysisPipeline
+from Analisis_de_Fourier.CoefficientCache import CoefficientCache
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+
+# Objetivos de RMSE para la onda cuadrada de amplitud 1 (alcanzables con menos de 100 armónicos)
+SQUARE_TARGETS = [0.2, 0.1]
+
+
+def custom_function(expression, amplitude=1.0, period=2.0):
+    """Función personalizada construida como lo hace el pipeline"""
+    request = SimpleNamespace(function_type="Personalizada", expression=expression, amplitude=amplitude,
+                              period=period, coefficient_method="analytic")
+    return AnalysisPipeline().build_function(request)
+
+
+def square_wave_rmse(max_harmonics=AdaptiveHarmonics.MAX_HARMONICS):
+    """RMSE exacto de la onda cuadrada truncada a n = 1..max_harmonics: bn = 4/(nπ) para n impar, E = 1"""
+    n = np.arange(1, max_harmonics + 1)
+    bn = np.where(n % 2 == 1, 4 / (n * np.pi), 0.0)
+    return np.sqrt(np.maximum(1.0 - np.cumsum(bn * bn / 2), 0.0))
+
+
+def test_smooth_function_converges():
+    """Un polinomio trigonométrico converge con sus coeficientes exactos y 3 armónicos"""
+    function = custom_function("sin(2*pi*t/T) + 0.3*cos(6*pi*t/T)")
+    selection = AdaptiveHarmonics.select(function, target_rmse=1e-6)
+
+    assert selection.report["converged"]
+    assert selection.report["target_met"]
+    assert selection.n_harmonics == 3
+    assert np.allclose(selection.coefficients['an'], [0.0, 0.0, 0.3], atol=1e-9)
+    assert np.allclose(selection.coefficients['bn'], [1.0, 0.0, 0.0], atol=1e-9)
+    assert selection.report["estimated_rmse"] <= 1e-6
+
+
+def test_parseval_choice():
+    """Se elige el menor n cuyo RMSE exacto (Parseval) no supera el objetivo"""
+    exact = square_wave_rmse()
+    square = PredefinedFunction("Onda Cuadrada", 1.0, 2.0)
+    for target in SQUARE_TARGETS:
+        expected = int(np.argmax(exact <= target)) + 1
+        by_rmse = AdaptiveHarmonics.select(square, target_rmse=target)
+        # Con E = 1, capturar 1 - objetivo² de la energía equivale al mismo RMSE
+        by_energy = AdaptiveHarmonics.select(square, target_energy_fraction=1 - target ** 2)
+
+        assert by_rmse.report["converged"] and by_rmse.report["target_met"]
+        assert by_rmse.n_harmonics == by_energy.n_harmonics == expected
+        assert by_rmse.report["estimated_rmse"] <= target < exact[expected - 2]
+        assert abs(by_rmse.report["estimated_rmse"] - exact[expected - 1]) < 1e-3
+
+
+def test_target_not_met():
+    """Una función no suave con target_rmse=1e-4 agota los 100 armónicos sin alcanzarlo"""
+    function = custom_function("t")
+    selection = AdaptiveHarmonics.select(function, target_rmse=1e-4)
+
+    assert selection.report["converged"]
+    assert not selection.report["target_met"]
+    assert selection.n_harmonics == AdaptiveHarmonics.MAX_HARMONICS
+    assert len(selection.coefficients['an']) == AdaptiveHarmonics.MAX_HARMONICS
+    assert selection.report["estimated_rmse"] > 1e-4
+
+
+def test_selection_is_cached():
+    """La selección se guarda bajo la clave de la función, la amplitud y los objetivos"""
+    cache = CoefficientCache()
+    pipeline = AnalysisPipeline(cache)
+    function = custom_function("t*t")
+
+    first = pipeline.adaptive_selection(function, 1e-3, None)
+    assert pipeline.adaptive_selection(custom_function("t * t"), 1e-3, None) is first
+    assert cache.stats()["hits"] == 1
+
+    assert pipeline.adaptive_selection(function, 1e-2, None) is not first
+    assert pipeline.adaptive_selection(custom_function("t*t", amplitude=2.0), 1e-3, None) is not first
+    assert cache.stats()["hits"] == 1
+
+
+def main():
+    print("=" * 70)
+    print("MODO ADAPTATIVO: CONVERGENCIA Y ELECCIÓN DE ARMÓNICOS")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_smooth_function_converges, test_parseval_choice, test_target_not_met,
+                 test_selection_is_cached):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
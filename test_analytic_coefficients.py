@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Script de prueba que contrasta los coeficientes analíticos de las funciones
+predefinidas con los obtenidos por integración numérica (FFT)
+"""
+import sys
+import os
+
+import numpy as np
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+
+# Funciones continuas: ambos métodos deben coincidir casi a precisión de máquina
+SMOOTH_FUNCTIONS = ["Seno", "Coseno", "Onda Triangular"]
+# Funciones con saltos: la muestra tomada en la discontinuidad introduce un error O(A/N)
+DISCONTINUOUS_FUNCTIONS = ["Onda Cuadrada", "Onda Diente de Sierra", "Pulso"]
+
+SMOOTH_TOLERANCE = 1e-5
+DISCONTINUOUS_TOLERANCE = 1e-2
+
+CASES = [
+    # (amplitud, periodo, armónicos)
+    (1.0, 2.0, 10),
+    (2.5, 0.7, 50),
+    (0.3, 5.0, 100),
+]
+
+
+def max_difference(func_type, amplitude, period, n_harmonics):
+    """Máxima diferencia absoluta entre coeficientes analíticos y numéricos"""
+    analytic = PredefinedFunction(func_type, amplitude, period, "analytic").fourier_coefficients(n_harmonics)
+    numeric = PredefinedFunction(func_type, amplitude, period, "numeric").fourier_coefficients(n_harmonics)
+
+    assert len(analytic['an']) == len(numeric['an']) == n_harmonics
+    assert len(analytic['bn']) == len(numeric['bn']) == n_harmonics
+
+    return max(
+        abs(analytic['a0'] - numeric['a0']),
+        float(np.max(np.abs(np.subtract(analytic['an'], numeric['an'])))),
+        float(np.max(np.abs(np.subtract(analytic['bn'], numeric['bn']))))
+    )
+
+
+def check(func_type, tolerance):
+    """Comprueba un tipo de función en todos los casos y muestra el resultado"""
+    ok = True
+    for amplitude, period, n_harmonics in CASES:
+        diff = max_difference(func_type, amplitude, period, n_harmonics)
+        passed = diff <= tolerance * amplitude
+        ok = ok and passed
+        mark = "✓" if passed else "✗"
+        print(f"{mark} {func_type:<22} A={amplitude:<4} T={period:<4} n={n_harmonics:<4} diferencia máxima: {diff:.3e}")
+    return ok
+
+
+def test_smooth_functions_agree():
+    for func_type in SMOOTH_FUNCTIONS:
+        assert check(func_type, SMOOTH_TOLERANCE)
+
+
+def test_discontinuous_functions_agree():
+    for func_type in DISCONTINUOUS_FUNCTIONS:
+        assert check(func_type, DISCONTINUOUS_TOLERANCE)
+
+
+def test_known_values():
+    """Valores conocidos de la serie de la onda cuadrada: bn = 4A/(nπ) para n impar"""
+    coeffs = PredefinedFunction("Onda Cuadrada", 1.0, 2.0).fourier_coefficients(5)
+    expected = [4 / np.pi, 0.0, 4 / (3 * np.pi), 0.0, 4 / (5 * np.pi)]
+    assert np.allclose(coeffs['bn'], expected)
+    assert np.allclose(coeffs['an'], 0.0)
+    assert coeffs['a0'] == 0.0
+
+
+def main():
+    print("=" * 70)
+    print("COEFICIENTES ANALÍTICOS VS. INTEGRACIÓN NUMÉRICA")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for func_type in SMOOTH_FUNCTIONS:
+        if check(func_type, SMOOTH_TOLERANCE):
+            passed += 1
+        else:
+            failed += 1
+
+    for func_type in DISCONTINUOUS_FUNCTIONS:
+        if check(func_type, DISCONTINUOUS_TOLERANCE):
+            passed += 1
+        else:
+            failed += 1
+
+    try:
+        test_known_values()
+        print("✓ Valores conocidos de la onda cuadrada")
+        passed += 1
+    except AssertionError:
+        print("✗ Valores conocidos de la onda cuadrada")
+        failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
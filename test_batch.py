@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de /api/analyze/batch: cada elemento coincide con la
+petición equivalente a /api/analyze y un elemento con error no afecta a los
+demás
+"""
+import sys
+import os
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+
+BATCH_PATH = "/api/analyze/batch"
+
+# Misma malla y periodo (coeficientes y síntesis compartidos), otra malla y formatos distintos
+ITEMS = [
+    dict(function_type="Onda Cuadrada", n_harmonics=5, duration=2.0, sampling_rate=400),
+    dict(function_type="Onda Cuadrada", n_harmonics=50, amplitude=2.0, duration=2.0, sampling_rate=400),
+    dict(function_type="Personalizada", expression="t**2", period=3.0, duration=3.0, sampling_rate=300),
+    dict(function_type="Onda Triangular", n_harmonics=12, duration=2.0, sampling_rate=400,
+         include=["coefficients", "statistics"]),
+    dict(function_type="Seno", amplitude=0.5, duration=1.0, sampling_rate=500, layout="columnar"),
+]
+
+INVALID_ITEMS = [
+    dict(function_type="Personalizada", expression="sin(x)", duration=2.0, sampling_rate=400),
+    dict(function_type="Personalizada", expression="1/(t-t)", duration=2.0, sampling_rate=400),
+]
+
+
+def client():
+    server.config.warmup = False
+    return TestClient(server.app)
+
+
+def assert_close(batch, single, path="result"):
+    """Compara dos respuestas JSON; los números con tolerancia (la síntesis apilada redondea distinto)"""
+    if isinstance(single, dict):
+        assert isinstance(batch, dict) and set(batch) == set(single), path
+        for name in single:
+            assert_close(batch[name], single[name], f"{path}.{name}")
+    elif isinstance(single, list) and single and isinstance(single[0], (int, float)):
+        assert np.allclose(batch, single, rtol=1e-9, atol=1e-12), path
+    elif isinstance(single, float):
+        assert np.isclose(batch, single, rtol=1e-9, atol=1e-12), path
+    else:
+        assert batch == single, path
+
+
+def test_items_match_single_requests():
+    """Cada resultado del lote coincide con la misma petición enviada sola"""
+    with client() as http:
+        response = http.post(BATCH_PATH, json={"items": ITEMS})
+        singles = [http.post("/api/analyze", json=item) for item in ITEMS]
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(len(ITEMS)))
+    for result, single in zip(results, singles):
+        assert single.status_code == 200
+        assert result["status"] == "ok" and result["status_code"] == 200
+        assert_close(result["result"], single.json())
+
+
+def test_error_isolated():
+    """Un elemento con error da su propio 400 y los demás no cambian"""
+    items = [ITEMS[0], INVALID_ITEMS[0], ITEMS[1], INVALID_ITEMS[1], ITEMS[2]]
+    with client() as http:
+        clean = http.post(BATCH_PATH, json={"items": [ITEMS[0], ITEMS[1], ITEMS[2]]}).json()["results"]
+        mixed = http.post(BATCH_PATH, json={"items": items}).json()["results"]
+        errors = [http.post("/api/analyze", json=item) for item in INVALID_ITEMS]
+
+    assert [result["status_code"] for result in mixed] == [200, 400, 200, 400, 200]
+    for result, single in zip((mixed[1], mixed[3]), errors):
+        assert single.status_code == 400
+        assert result["status"] == "error"
+        assert result["detail"] == single.json()["detail"]
+    for result, reference in zip((mixed[0], mixed[2], mixed[4]), clean):
+        assert result["result"] == reference["result"]
+
+
+def main():
+    print("=" * 70)
+    print("ANÁLISIS POR LOTES")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_items_match_single_requests, test_error_isolated):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Script de prueba del formato binario columnar (FSER) y del layout columnar:
+cabecera, alineación de las columnas a 8 bytes, ida y vuelta de los valores y
+eje de tiempo implícito (start, dt, count)
+"""
+import sys
+import os
+import json
+import struct
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Modelos_de_Datos.ColumnarEncoder import ColumnarEncoder
+
+BASE_REQUEST = dict(function_type="Onda Cuadrada", amplitude=2.0, period=2.0, duration=3.0,
+                    n_harmonics=20, sampling_rate=333)
+
+SIGNALS = ["original_signal", "fourier_approximation", "error_signal"]
+
+
+def client():
+    server.config.warmup = False
+    return TestClient(server.app)
+
+
+def parse_fser(payload):
+    """Decodificación independiente de ColumnarEncoder.decode: (cabecera, columnas)"""
+    assert payload[:4] == b"FSER"
+    (header_length,) = struct.unpack("<I", payload[4:8])
+    header = json.loads(payload[8:8 + header_length].decode("utf-8"))
+    columns = {}
+    end = 8 + header_length
+    for column in header["columns"]:
+        # Cada columna empieza alineada y a continuación de la anterior (más el relleno)
+        assert column["offset"] % 8 == 0
+        assert column["offset"] == end + (-end) % 8
+        itemsize = np.dtype(ColumnarEncoder.DTYPES[column["dtype"]]).itemsize
+        end = column["offset"] + column["count"] * itemsize
+        columns[column["name"]] = np.frombuffer(payload[column["offset"]:end],
+                                                dtype=ColumnarEncoder.DTYPES[column["dtype"]])
+    assert len(payload) == end + (-end) % 8
+    return header, columns
+
+
+def test_encoder_round_trip():
+    """Ida y vuelta de columnas de longitudes impares en float64 y float32"""
+    rng = np.random.default_rng(7)
+    columns = {"a": rng.normal(size=5), "b": rng.normal(size=3), "c": np.arange(1.0, 8.0)}
+    for dtype in ("float64", "float32"):
+        payload = ColumnarEncoder.encode({"metadata": {"n": 1}}, columns, dtype)
+        assert (8 + struct.unpack("<I", payload[4:8])[0]) % 8 == 0
+        header, decoded = parse_fser(payload)
+        assert header["metadata"] == {"n": 1}
+        assert [column["name"] for column in header["columns"]] == list(columns)
+        for name, values in columns.items():
+            assert decoded[name].dtype == np.dtype(ColumnarEncoder.DTYPES[dtype])
+            assert np.array_equal(decoded[name], values.astype(dtype))
+            assert np.array_equal(ColumnarEncoder.decode(payload)["columns"][name], decoded[name])
+
+
+def test_fser_matches_json():
+    """La respuesta FSER de /api/analyze contiene los mismos valores que la JSON"""
+    with client() as http:
+        reference = http.post("/api/analyze", json=BASE_REQUEST).json()
+        binary = http.post("/api/analyze", json=BASE_REQUEST, headers={"Accept": ColumnarEncoder.MEDIA_TYPE})
+        single = http.post("/api/analyze", json=BASE_REQUEST,
+                           headers={"Accept": f"{ColumnarEncoder.MEDIA_TYPE}; dtype=float32"})
+
+    assert binary.headers["content-type"].startswith(ColumnarEncoder.MEDIA_TYPE)
+    header, columns = parse_fser(binary.content)
+    assert header["metadata"] == reference["metadata"]
+    assert header["statistics"] == reference["statistics"]
+    assert header["coefficients"] == reference["coefficients"]
+    assert np.array_equal(columns["time"], reference["original_signal"]["time"])
+    for name in SIGNALS:
+        assert np.array_equal(columns[name], reference[name]["values"])
+    assert np.array_equal(columns["spectrum_frequencies"], reference["frequency_spectrum"]["frequencies"])
+    assert np.array_equal(columns["spectrum_magnitudes"], reference["frequency_spectrum"]["magnitudes"])
+
+    assert single.headers["content-type"].endswith("dtype=float32")
+    _, columns32 = parse_fser(single.content)
+    for name in SIGNALS:
+        assert columns32[name].dtype == np.float32
+        assert np.allclose(columns32[name], reference[name]["values"], rtol=1e-6, atol=1e-6)
+
+
+def test_columnar_layout_time_axis():
+    """El eje implícito (start, dt, count) reconstruye el eje de tiempo del layout estándar"""
+    with client() as http:
+        standard = http.post("/api/analyze", json=BASE_REQUEST).json()
+        columnar = http.post("/api/analyze", json={**BASE_REQUEST, "layout": "columnar"}).json()
+
+    time = columnar["time"]
+    reconstructed = time["start"] + np.arange(time["count"]) * time["dt"]
+    assert time["count"] == len(standard["original_signal"]["time"])
+    assert np.allclose(reconstructed, standard["original_signal"]["time"], rtol=0, atol=1e-12)
+    assert "signal_times" not in columnar
+    for name in SIGNALS:
+        assert columnar["signals"][name] == standard[name]["values"]
+    assert columnar["statistics"] == standard["statistics"]
+
+
+def main():
+    print("=" * 70)
+    print("FORMATO BINARIO COLUMNAR (FSER) Y LAYOUT COLUMNAR")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_encoder_round_trip, test_fser_matches_json, test_columnar_layout_time_axis):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Script de prueba del control de admisión de /api/analyze: cola llena (503),
+tiempo máximo (504) y desconexión del cliente (499), comprobando que los
+análisis pendientes se cuentan hasta que su trabajo termina en el pool
+"""
+import sys
+import os
+import asyncio
+import json
+import time
+
+import httpx
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Infraestructura.AnalysisExecutor import AnalysisExecutor
+
+# Duración de cada análisis lento y tiempo máximo por petición (s)
+SLOW_SECONDS = 0.5
+TIMEOUT = 0.1
+MAX_PENDING = 2
+
+
+def slow_executor():
+    """Ejecutor con un solo hilo, cola de MAX_PENDING y análisis que tardan SLOW_SECONDS"""
+    original = server.analyze_and_render
+
+    def slow_analysis(request, response_format, dtype):
+        time.sleep(SLOW_SECONDS)
+        return original(request, response_format, dtype)
+
+    executor = AnalysisExecutor(thread_workers=1, process_workers=0, max_pending=MAX_PENDING, timeout=TIMEOUT)
+    return executor, slow_analysis, original
+
+
+def run_with(test):
+    """Ejecuta la corrutina de prueba con el ejecutor lento y restaura el original"""
+    executor, slow_analysis, original = slow_executor()
+    saved = server.executor
+    server.executor = executor
+    server.analyze_and_render = slow_analysis
+    try:
+        return asyncio.run(test(executor))
+    finally:
+        server.analyze_and_render = original
+        server.executor = saved
+        executor.shutdown()
+
+
+def body(amplitude):
+    # Cada petición con otra amplitud para no coincidir en la caché de respuestas
+    return {"function_type": "Seno", "amplitude": amplitude, "include": ["statistics"]}
+
+
+async def post(client, amplitude):
+    response = await client.post("/api/analyze", json=body(amplitude))
+    return response.status_code
+
+
+async def wait_idle(executor, limit=5.0):
+    """Espera a que terminen los trabajos del pool; devuelve los pendientes que quedan"""
+    deadline = time.monotonic() + limit
+    while executor.pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+    return executor.pending
+
+
+def test_overload_returns_503():
+    """Con la cola llena la petición se rechaza con 503 y no cuenta como pendiente"""
+    async def scenario(executor):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = await asyncio.gather(*(post(client, 1.0 + i) for i in range(MAX_PENDING + 1)))
+        return sorted(statuses), executor.pending, await wait_idle(executor)
+
+    statuses, pending, idle = run_with(scenario)
+    assert statuses.count(503) == 1
+    assert statuses.count(503) + statuses.count(504) == MAX_PENDING + 1
+    assert pending <= MAX_PENDING
+    assert idle == 0
+
+
+def test_timeout_keeps_slot_until_job_ends():
+    """Tras un 504 el análisis en ejecución sigue ocupando su hueco hasta terminar"""
+    async def scenario(executor):
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = await asyncio.gather(*(post(client, 10.0 + i) for i in range(MAX_PENDING)))
+            await asyncio.sleep(0.02)
+            # Uno se ejecuta (no se puede interrumpir) y el otro se canceló sin empezar
+            after_timeout = executor.pending
+            # Mientras haya huecos libres se admiten nuevas peticiones, pero nunca más de MAX_PENDING
+            more = await asyncio.gather(*(post(client, 20.0 + i) for i in range(2 * MAX_PENDING)))
+            during = executor.pending
+        return statuses, after_timeout, more, during, await wait_idle(executor)
+
+    statuses, after_timeout, more, during, idle = run_with(scenario)
+    assert statuses == [504] * MAX_PENDING
+    assert after_timeout == 1
+    assert 503 in more
+    assert set(more) <= {503, 504}
+    assert during <= MAX_PENDING
+    assert idle == 0
+
+
+def test_disconnect_returns_499():
+    """Si el cliente se desconecta se responde 499 y el hueco se libera al terminar el trabajo"""
+    async def scenario(executor):
+        payload = json.dumps(body(30.0)).encode()
+        messages = [{"type": "http.request", "body": payload, "more_body": False}]
+        sent = []
+
+        async def receive():
+            # Tras el cuerpo, el cliente ya se ha ido
+            if messages:
+                return messages.pop(0)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        # Sin tiempo máximo: la respuesta solo puede deberse a la desconexión
+        executor.timeout = 0
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": "/api/analyze", "raw_path": b"/api/analyze", "query_string": b"",
+            "root_path": "", "client": ("test", 1), "server": ("test", 80),
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        }
+        await server.app(scope, receive, send)
+        status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+        return status, executor.pending, await wait_idle(executor)
+
+    status, pending, idle = run_with(scenario)
+    assert status == 499
+    assert pending == 1
+    assert idle == 0
+
+
+def main():
+    print("=" * 60)
+    print("PRUEBAS DEL CONTROL DE ADMISIÓN (503, 504 Y 499)")
+    print("=" * 60)
+
+    passed = 0
+    failed = 0
+    for test in (test_overload_returns_503, test_timeout_keeps_slot_until_job_ends, test_disconnect_returns_499):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 60)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 60)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
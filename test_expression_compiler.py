@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Script de prueba del compilador de expresiones: rechazo de construcciones no
+permitidas, equivalencia de las condicionales vectorizadas (np.where) con la
+evaluación escalar y mensajes de error en tiempo de evaluación
+"""
+import sys
+import os
+import math
+
+import numpy as np
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from Funciones_Matematicas.CustomFunction import CustomFunction
+from Funciones_Matematicas.ExpressionCompiler import ExpressionCompiler
+
+# Expresiones que deben rechazarse al compilar
+REJECTED = [
+    "().__class__",
+    "__import__('os')",
+    "lambda: 1",
+    "t.real",
+    "sin.__class__",
+    "math.os",
+    "sin(t, x=1)",
+    "x",
+    "os",
+    "'t'",
+    "[t]",
+]
+
+# Condicionales y operadores lógicos que se convierten a np.where / np.logical_*
+CONDITIONALS = [
+    "A if sin(2*pi*t/T) >= 0 else -A",
+    "t if t < T/2 else T - t",
+    "A*t/T if 0 < t < T/2 else (0 if t == T/2 else -A)",
+    "1 if t > 0.5 and t < 1.5 else 0",
+    "sin(t) if not t > 1 or t > 1.8 else cos(t)",
+]
+
+
+def scalar_reference(expression, t, amplitude=1.0, period=2.0):
+    """Evaluación muestra a muestra con math (como antes de vectorizar)"""
+    namespace = {"__builtins__": {}, "sin": math.sin, "cos": math.cos, "tan": math.tan, "exp": math.exp,
+                 "log": math.log, "sqrt": math.sqrt, "abs": abs, "pi": math.pi, "e": math.e, "math": math}
+    return np.array([eval(expression, namespace, {"t": x, "A": amplitude, "T": period}) for x in t], dtype=float)
+
+
+def raises_value_error(expression):
+    try:
+        ExpressionCompiler(expression)
+    except ValueError:
+        return True
+    return False
+
+
+def test_rejects_unsafe_constructs():
+    """Se rechazan atributos, llamadas arbitrarias, lambdas, argumentos con nombre y nombres desconocidos"""
+    for expression in REJECTED:
+        assert raises_value_error(expression), expression
+
+
+def test_conditionals_match_scalar_evaluation():
+    """Las condicionales vectorizadas coinciden con la evaluación escalar en cada muestra"""
+    t = np.linspace(0, 2, 401)
+    for expression in CONDITIONALS:
+        compiled = ExpressionCompiler(expression)
+        assert np.array_equal(compiled(t, 1.0, 2.0), scalar_reference(expression, t)), expression
+        assert compiled.evaluate_scalar(t[37], 1.0, 2.0) == scalar_reference(expression, t[37:38])[0]
+
+
+def test_unselected_branch_does_not_fail():
+    """Una división por cero en la rama no elegida no produce error"""
+    function = CustomFunction("1/t if t != 0 else 0", 1.0, 2.0)
+    values = function.evaluate_array(np.linspace(0, 2, 5))
+    assert np.all(np.isfinite(values))
+    assert values[0] == 0.0
+
+
+def test_division_by_zero_message():
+    """La división por cero conserva el mensaje de la evaluación escalar"""
+    cases = [
+        ("1/(t-t)", "División por cero en la expresión para t=0.0"),
+        ("1/(t-1)", "División por cero en la expresión para t=1.0"),
+        ("log(t-t)", "Error al evaluar la expresión: math domain error"),
+    ]
+    for expression, message in cases:
+        try:
+            CustomFunction(expression, 1.0, 2.0).evaluate_array(np.linspace(0, 2, 5))
+        except ValueError as e:
+            assert str(e) == message, str(e)
+        else:
+            assert False, expression
+
+
+def main():
+    print("=" * 70)
+    print("COMPILADOR DE EXPRESIONES: VALIDACIÓN Y VECTORIZACIÓN")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_rejects_unsafe_constructs, test_conditionals_match_scalar_evaluation,
+                 test_unselected_branch_does_not_fail, test_division_by_zero_message):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
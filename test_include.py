@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de la proyección con `include` en /api/analyze: las partes
+no solicitadas no se calculan ni se devuelven, y sin `include` la respuesta
+completa no cambia
+"""
+import sys
+import os
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Analisis_de_Fourier.FourierSynthesizer import FourierSynthesizer
+from Analisis_de_Fourier.SpectrumAnalyzer import SpectrumAnalyzer
+
+BASE_REQUEST = dict(function_type="Onda Triangular", amplitude=1.5, period=2.0, duration=4.0,
+                    n_harmonics=15, sampling_rate=500)
+
+PARTS = ["original_signal", "fourier_approximation", "error_signal", "coefficients",
+         "frequency_spectrum", "statistics"]
+
+
+def client():
+    server.config.warmup = False
+    return TestClient(server.app)
+
+
+def analyze_counting(http, body):
+    """Respuesta de /api/analyze contando las llamadas a cada etapa costosa"""
+    calls = Counter()
+    spied = [(FourierSynthesizer, "get_original_signal"), (FourierSynthesizer, "synthesize"),
+             (FourierSynthesizer, "calculate_coefficients"), (SpectrumAnalyzer, "magnitude_spectrum")]
+    originals = {name: owner.__dict__[name] for owner, name in spied}
+
+    def spy(name):
+        original = originals[name]
+        function = original.__func__ if isinstance(original, staticmethod) else original
+
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return function(*args, **kwargs)
+        return staticmethod(counted) if isinstance(original, staticmethod) else counted
+
+    for owner, name in spied:
+        setattr(owner, name, spy(name))
+    try:
+        response = http.post("/api/analyze", json=body)
+    finally:
+        for owner, name in spied:
+            setattr(owner, name, originals[name])
+    assert response.status_code == 200, response.text
+    return response.json(), calls
+
+
+def test_statistics_only():
+    """Solo estadísticas: no hay señales ni espectro en la respuesta y no se calcula la FFT"""
+    with client() as http:
+        data, calls = analyze_counting(http, {**BASE_REQUEST, "include": ["statistics"]})
+
+    assert set(data) == {"metadata", "statistics"}
+    assert calls["magnitude_spectrum"] == 0
+    assert calls["synthesize"] == 1 and calls["get_original_signal"] == 1
+
+
+def test_coefficients_only():
+    """Solo coeficientes: no se genera ninguna señal ni el espectro"""
+    with client() as http:
+        data, calls = analyze_counting(http, {**BASE_REQUEST, "amplitude": 2.5, "include": ["coefficients"]})
+
+    assert set(data) == {"metadata", "coefficients"}
+    assert len(data["coefficients"]["an"]) == BASE_REQUEST["n_harmonics"]
+    assert calls["get_original_signal"] == 0
+    assert calls["synthesize"] == 0
+    assert calls["magnitude_spectrum"] == 0
+
+
+def test_original_signal_only():
+    """Solo la señal original: no se sintetiza la serie ni se calculan coeficientes"""
+    with client() as http:
+        data, calls = analyze_counting(http, {**BASE_REQUEST, "amplitude": 3.5, "include": ["original_signal"]})
+
+    assert set(data) == {"metadata", "original_signal"}
+    assert calls["get_original_signal"] == 1
+    assert calls["synthesize"] == 0
+    assert calls["calculate_coefficients"] == 0
+
+
+def test_full_response_unchanged():
+    """Sin include la respuesta es la completa y coincide con pedir todas las partes"""
+    with client() as http:
+        full = http.post("/api/analyze", json=BASE_REQUEST)
+        explicit = http.post("/api/analyze", json={**BASE_REQUEST, "include": PARTS})
+
+    assert full.status_code == explicit.status_code == 200
+    server.FourierAnalysisResponse.model_validate(full.json())
+    assert set(full.json()) == {"metadata", *PARTS}
+    assert full.json() == explicit.json()
+
+
+def main():
+    print("=" * 70)
+    print("PROYECCIÓN DE LA RESPUESTA CON INCLUDE")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_statistics_only, test_coefficients_only, test_original_signal_only,
+                 test_full_response_unchanged):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
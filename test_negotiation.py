@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de la negociación de formato (cabecera Accept): valores q,
+preferencia de tipos explícitos, dtype de los buffers, MessagePack sin el
+paquete instalado y 406 cuando JSON tiene q=0
+"""
+import sys
+import os
+
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Modelos_de_Datos.ColumnarEncoder import ColumnarEncoder
+
+COLUMNAR = ColumnarEncoder.MEDIA_TYPE
+MSGPACK = ColumnarEncoder.MSGPACK_MEDIA_TYPES[0]
+
+# (Accept, msgpack instalado, resultado esperado)
+CASES = [
+    (None, False, ("json", "float64")),
+    ("", False, ("json", "float64")),
+    ("application/json", False, ("json", "float64")),
+    ("*/*", False, ("json", "float64")),
+    (COLUMNAR, False, ("columnar", "float64")),
+    (f"{COLUMNAR}; dtype=float32", False, ("columnar", "float32")),
+    (f"{COLUMNAR}; dtype=int8", False, ("columnar", "float64")),
+    # Valores q
+    (f"application/json;q=0.5, {COLUMNAR}", False, ("columnar", "float64")),
+    (f"application/json, {COLUMNAR};q=0.5", False, ("json", "float64")),
+    (f"{COLUMNAR};q=0.2, application/json;q=0.9", False, ("json", "float64")),
+    (f"{COLUMNAR};q=0.9;dtype=float32, application/json;q=0.2", False, ("columnar", "float32")),
+    (f"{COLUMNAR};q=abc, application/json;q=0.1", False, ("json", "float64")),
+    # A igualdad de q: explícito frente a comodín y después el orden de la cabecera
+    (f"*/*, {COLUMNAR}", False, ("columnar", "float64")),
+    (f"{COLUMNAR}, application/json", False, ("columnar", "float64")),
+    (f"application/json, {COLUMNAR}", False, ("json", "float64")),
+    # MessagePack solo si está instalado; si no, el siguiente aceptable o JSON
+    (MSGPACK, False, ("json", "float64")),
+    (f"{MSGPACK}, {COLUMNAR};q=0.5", False, ("columnar", "float64")),
+    (MSGPACK, True, ("msgpack", "float64")),
+    ("application/x-msgpack; dtype=float32", True, ("msgpack", "float32")),
+    (f"{MSGPACK};q=0.5, {COLUMNAR}", True, ("columnar", "float64")),
+    # Nada aceptable: JSON, salvo que JSON tenga q=0
+    ("text/html", False, ("json", "float64")),
+    (f"{COLUMNAR};q=0", False, ("json", "float64")),
+    ("application/json;q=0", False, (None, None)),
+    (f"application/json;q=0, {COLUMNAR}", False, ("columnar", "float64")),
+    ("*/*;q=0", False, (None, None)),
+    (f"{MSGPACK}, application/json;q=0", False, (None, None)),
+]
+
+
+def negotiate(accept, msgpack_installed):
+    """negotiate_format como si msgpack estuviera (o no) instalado"""
+    available = ColumnarEncoder.msgpack_available
+    ColumnarEncoder.msgpack_available = staticmethod(lambda: msgpack_installed)
+    try:
+        return server.negotiate_format(accept)
+    finally:
+        ColumnarEncoder.msgpack_available = available
+
+
+def test_negotiation_table():
+    """Cada cabecera Accept de la tabla elige el formato y dtype esperados"""
+    for accept, msgpack_installed, expected in CASES:
+        assert negotiate(accept, msgpack_installed) == expected, accept
+
+
+def test_request_dtype_is_default():
+    """Sin dtype en Accept los buffers usan el dtype de la petición; JSON siempre float64"""
+    assert server.negotiate_format(COLUMNAR, "float32") == ("columnar", "float32")
+    assert server.negotiate_format(f"{COLUMNAR}; dtype=float64", "float32") == ("columnar", "float64")
+    assert server.negotiate_format("application/json", "float32") == ("json", "float64")
+
+
+def test_not_acceptable():
+    """Con JSON excluido (q=0) y ningún otro formato disponible se responde 406"""
+    server.config.warmup = False
+    body = {"function_type": "Seno", "include": ["statistics"]}
+    with TestClient(server.app) as http:
+        rejected = http.post("/api/analyze", json=body, headers={"Accept": f"{MSGPACK}, application/json;q=0"})
+        fallback = http.post("/api/analyze", json=body, headers={"Accept": "text/html"})
+
+    if not ColumnarEncoder.msgpack_available():
+        assert rejected.status_code == 406
+        assert rejected.json()["detail"] == server.NOT_ACCEPTABLE
+    assert fallback.status_code == 200
+    assert fallback.headers["content-type"].startswith("application/json")
+
+
+def main():
+    print("=" * 70)
+    print("NEGOCIACIÓN DE FORMATO (ACCEPT)")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_negotiation_table, test_request_dtype_is_default, test_not_acceptable):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Script de prueba que documenta el error del modo de precisión reducida
+(dtype float32, decimals, significant_digits) frente a la referencia float64
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from Analisis_de_Fourier.AnalysisPipeline import AnalysisPipeline
+from Modelos_de_Datos.PrecisionControl import PrecisionControl
+from Modelos_de_Datos.JSONEncoder import JSONEncoder
+
+# Épsilon de float32 (2^-23): separación entre 1.0 y el siguiente float32
+EPS32 = float(np.finfo(np.float32).eps)
+
+# Cotas del modo float32, relativas a la amplitud A (n = número de muestras):
+# - señales original y aproximación: se calculan en float64 y se redondean una vez (≤ ½ ulp, |x| < 2A)
+SIGNAL_BOUND = EPS32
+# - error: diferencia de dos valores ya redondeados
+ERROR_BOUND = 2 * EPS32
+# - magnitudes del espectro (|rfft| sin normalizar): perturbación de cada muestra sumada n veces
+SPECTRUM_BOUND = EPS32
+# - rmse: |rmse(e1) - rmse(e2)| ≤ max|e1 - e2|, así que hereda la cota del error
+RMSE_BOUND = ERROR_BOUND
+
+BASE_REQUEST = dict(
+    function_type="Onda Cuadrada", expression=None, amplitude=1.0, period=2.0, duration=10.0,
+    n_harmonics=10, sampling_rate=1000, coefficient_method="analytic", include=None, layout="standard",
+    max_points=None, downsample_method="lttb", spectrum_min_frequency=0.0, spectrum_max_frequency=50.0,
+    spectrum_window=None, dtype="float64", decimals=None, significant_digits=None
+)
+
+CASES = [
+    # Malla con un número entero de muestras por periodo (irfft)
+    {"function_type": "Seno"},
+    {"function_type": "Onda Cuadrada", "n_harmonics": 50},
+    {"function_type": "Onda Triangular", "amplitude": 2.5},
+    {"function_type": "Onda Diente de Sierra"},
+    {"function_type": "Pulso", "spectrum_window": "hann"},
+    # Periodo no conmensurable con la malla (Clenshaw por bloques)
+    {"function_type": "Onda Cuadrada", "period": 0.37, "n_harmonics": 100, "amplitude": 3.0},
+    # Función no periódica evaluada en toda la malla, instantes grandes
+    {"function_type": "Personalizada", "expression": "A * exp(-t / 5) * sin(2 * pi * t / T)",
+     "duration": 120.0, "sampling_rate": 10000, "n_harmonics": 100},
+]
+
+pipeline = AnalysisPipeline()
+
+
+def make_request(**fields):
+    return SimpleNamespace(**{**BASE_REQUEST, **fields})
+
+
+def compare(case):
+    """Diferencias float32 - float64, normalizadas por la amplitud"""
+    reference = pipeline.run(make_request(**case))
+    reduced = pipeline.run(make_request(**case, dtype="float32"))
+    amplitude = case.get("amplitude", 1.0)
+    n = len(reference.time)
+
+    for values in (reduced.time, reduced.original, reduced.fourier, reduced.error, reduced.spectrum_magnitudes):
+        assert values.dtype == np.float32
+
+    return {
+        "time": float(np.max(np.abs(reduced.time - reference.time) / np.maximum(reference.time, 1.0))),
+        "signal": max(float(np.max(np.abs(reduced.original - reference.original))),
+                      float(np.max(np.abs(reduced.fourier - reference.fourier)))) / amplitude,
+        "error": float(np.max(np.abs(reduced.error - reference.error))) / amplitude,
+        "spectrum": float(np.max(np.abs(reduced.spectrum_magnitudes - reference.spectrum_magnitudes))) / (n * amplitude),
+        "rmse": abs(reduced.statistics["rmse"] - reference.statistics["rmse"]) / amplitude,
+        "max_error": abs(reduced.statistics["max_error"] - reference.statistics["max_error"]) / amplitude,
+        "total_energy": abs(reduced.statistics["total_energy"] - reference.statistics["total_energy"])
+    }
+
+
+def check(case):
+    """Comprueba las cotas del modo float32 en un caso y muestra el resultado"""
+    diff = compare(case)
+    passed = (diff["time"] <= EPS32 and diff["signal"] <= SIGNAL_BOUND and diff["error"] <= ERROR_BOUND
+              and diff["spectrum"] <= SPECTRUM_BOUND and diff["rmse"] <= RMSE_BOUND
+              and diff["max_error"] <= ERROR_BOUND and diff["total_energy"] == 0.0)
+    mark = "✓" if passed else "✗"
+    label = case["function_type"] + (f" T={case['period']}" if "period" in case else "")
+    print(f"{mark} {label:<22} señal {diff['signal']:.1e}  error {diff['error']:.1e}  "
+          f"espectro {diff['spectrum']:.1e}  rmse {diff['rmse']:.1e}")
+    return passed
+
+
+def test_float32_error_bounds():
+    for case in CASES:
+        assert check(case)
+
+
+def test_significant_digits():
+    """Cada valor queda a menos de media unidad de la última cifra conservada"""
+    values = np.random.default_rng(0).standard_normal(10000) * 10.0 ** np.random.default_rng(1).integers(-6, 7, 10000)
+    for digits in (1, 3, 4, 6):
+        rounded = PrecisionControl.round_significant(values, digits)
+        unit = 10.0 ** (np.floor(np.log10(np.abs(values))) - digits + 1)
+        assert np.all(np.abs(rounded - values) <= 0.5 * unit * (1 + 1e-12))
+        # La representación más corta no tiene más cifras de las pedidas
+        for text in JSONEncoder.encode(rounded[:200]).decode()[1:-1].split(","):
+            mantissa = text.lstrip("-").split("e")[0].replace(".", "").strip("0")
+            assert len(mantissa) <= digits
+
+
+def test_decimals():
+    values = np.random.default_rng(2).uniform(-100, 100, 10000)
+    for decimals in (0, 2, 4):
+        rounded = PrecisionControl.round_decimals(values, decimals)
+        assert np.all(np.abs(rounded - values) <= 0.5 * 10.0 ** -decimals * (1 + 1e-9))
+
+
+def test_rounding_keeps_full_precision_statistics():
+    """Las estadísticas se calculan antes de redondear los valores enviados"""
+    reference = pipeline.run(make_request(function_type="Onda Triangular", n_harmonics=20))
+    rounded = pipeline.run(make_request(function_type="Onda Triangular", n_harmonics=20,
+                                        significant_digits=3, decimals=2))
+    assert rounded.statistics == reference.statistics
+    assert np.all(np.abs(rounded.fourier - reference.fourier) <= 0.005 + 1e-12)
+    # Los ejes no se redondean: cada muestra conserva su instante
+    assert np.array_equal(rounded.time, reference.time)
+    assert np.array_equal(rounded.spectrum_frequencies, reference.spectrum_frequencies)
+
+
+def test_float32_json_is_shorter():
+    reference = JSONEncoder.encode(pipeline.run(make_request()).fourier)
+    reduced = JSONEncoder.encode(pipeline.run(make_request(dtype="float32")).fourier)
+    rounded = JSONEncoder.encode(pipeline.run(make_request(dtype="float32", significant_digits=4)).fourier)
+    assert len(rounded) < len(reduced) < len(reference)
+
+
+def main():
+    print("=" * 70)
+    print("PRECISIÓN REDUCIDA (float32) VS. REFERENCIA float64")
+    print("=" * 70)
+    print(f"Cotas relativas a la amplitud: señal {SIGNAL_BOUND:.1e}, error {ERROR_BOUND:.1e}, "
+          f"espectro {SPECTRUM_BOUND:.1e}·n, rmse {RMSE_BOUND:.1e}")
+
+    passed = 0
+    failed = 0
+
+    for case in CASES:
+        if check(case):
+            passed += 1
+        else:
+            failed += 1
+
+    for test in (test_significant_digits, test_decimals, test_rounding_keeps_full_precision_statistics,
+                 test_float32_json_is_shorter):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de la caché de respuestas de /api/analyze: ETag y 304 con
+If-None-Match, ETag propio de la variante gzip y clave distinta por formato
+y dtype
+"""
+import sys
+import os
+
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Infraestructura.ResponseCache import ResponseCache
+from Modelos_de_Datos.ColumnarEncoder import ColumnarEncoder
+
+BASE_REQUEST = dict(function_type="Onda Triangular", amplitude=1.25, period=2.0, duration=2.0,
+                    n_harmonics=10, sampling_rate=200)
+IDENTITY = {"Accept-Encoding": "identity"}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def client():
+    server.config.warmup = False
+    server.response_cache.clear()
+    return TestClient(server.app)
+
+
+def test_if_none_match_returns_304():
+    """Repetir la petición con If-None-Match da 304 sin cuerpo y sin recalcular"""
+    with client() as http:
+        first = http.post("/api/analyze", json=BASE_REQUEST, headers=IDENTITY)
+        etag = first.headers["etag"]
+        hits = server.response_cache.stats()["hits"]
+        repeated = http.post("/api/analyze", json=BASE_REQUEST, headers={**IDENTITY, "If-None-Match": etag})
+        weak = http.post("/api/analyze", json=BASE_REQUEST, headers={**IDENTITY, "If-None-Match": f"W/{etag}"})
+        other = http.post("/api/analyze", json=BASE_REQUEST, headers={**IDENTITY, "If-None-Match": '"otro"'})
+
+    assert first.status_code == 200
+    assert repeated.status_code == 304 and weak.status_code == 304
+    assert repeated.content == b""
+    assert repeated.headers["etag"] == etag
+    assert server.response_cache.stats()["hits"] == hits + 3
+    assert other.status_code == 200
+    assert other.headers["etag"] == etag
+    assert other.headers["server-timing"] == 'cache;desc="hit"'
+    assert other.content == first.content
+
+
+def test_gzip_variant_has_own_etag():
+    """La variante gzip tiene su propio ETag y el de la variante sin comprimir no la valida"""
+    with client() as http:
+        plain = http.post("/api/analyze", json=BASE_REQUEST, headers=IDENTITY)
+        compressed = http.post("/api/analyze", json=BASE_REQUEST, headers=GZIP)
+        cross = http.post("/api/analyze", json=BASE_REQUEST, headers={**GZIP, "If-None-Match": plain.headers["etag"]})
+        same = http.post("/api/analyze", json=BASE_REQUEST,
+                         headers={**GZIP, "If-None-Match": compressed.headers["etag"]})
+
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert compressed.content == plain.content
+    assert cross.status_code == 200
+    assert same.status_code == 304
+    assert "Accept-Encoding" in plain.headers["vary"]
+
+
+def test_key_depends_on_format_and_dtype():
+    """La clave (y el ETag) cambia con el formato y el dtype, no con el orden de los campos"""
+    request_data = server.FunctionRequest(**BASE_REQUEST).model_dump()
+    keys = {ResponseCache.key(request_data, response_format, dtype)
+            for response_format, dtype in (("json", "float64"), ("columnar", "float64"),
+                                           ("columnar", "float32"), ("msgpack", "float64"))}
+    assert len(keys) == 4
+    reordered = dict(reversed(list(request_data.items())))
+    assert ResponseCache.key(reordered, "json", "float64") == ResponseCache.key(request_data, "json", "float64")
+
+    with client() as http:
+        etags = [http.post("/api/analyze", json=BASE_REQUEST, headers={**IDENTITY, "Accept": accept}).headers["etag"]
+                 for accept in ("application/json", ColumnarEncoder.MEDIA_TYPE,
+                                f"{ColumnarEncoder.MEDIA_TYPE}; dtype=float32")]
+        entries = server.response_cache.stats()["entries"]
+    assert len(set(etags)) == 3
+    assert entries == 3
+
+
+def test_invalid_request_never_304():
+    """Una petición inválida no tiene entrada en la caché: If-None-Match: * no da 304"""
+    body = {"function_type": "Personalizada", "expression": "sin(x)"}
+    with client() as http:
+        response = http.post("/api/analyze", json=body, headers={"If-None-Match": "*"})
+    assert response.status_code == 400
+
+
+def main():
+    print("=" * 70)
+    print("CACHÉ DE RESPUESTAS, ETAG Y 304")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_if_none_match_returns_304, test_gzip_variant_has_own_etag,
+                 test_key_depends_on_format_and_dtype, test_invalid_request_never_304):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
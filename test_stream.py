@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de /api/analyze/stream: secuencia NDJSON de cabecera,
+bloques y resumen, estadísticas acumuladas frente a /api/analyze y rechazo
+de campos desconocidos con 422
+"""
+import sys
+import os
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+
+STREAM_PATH = "/api/analyze/stream"
+
+# 2500 muestras en bloques de 1000: dos bloques completos y uno parcial
+BASE_REQUEST = dict(function_type="Onda Diente de Sierra", amplitude=1.5, period=1.0, duration=2.5,
+                    n_harmonics=25, sampling_rate=1000)
+CHUNK_SIZE = 1000
+N_SAMPLES = 2500
+
+
+def client():
+    server.config.warmup = False
+    return TestClient(server.app)
+
+
+def stream_events(http, body):
+    """Eventos NDJSON de una petición de streaming"""
+    response = http.post(STREAM_PATH, json=body)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith(server.NDJSON_MEDIA_TYPE)
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_event_sequence():
+    """Una cabecera, los bloques en orden sin huecos y un resumen final"""
+    with client() as http:
+        events = stream_events(http, {**BASE_REQUEST, "chunk_size": CHUNK_SIZE})
+
+    types = [event["type"] for event in events]
+    assert types == ["header", "chunk", "chunk", "chunk", "summary"]
+    header, chunks, summary = events[0], events[1:-1], events[-1]
+    assert header["time"] == {"start": 0.0, "dt": 1.0 / BASE_REQUEST["sampling_rate"], "count": N_SAMPLES}
+    assert header["chunk_size"] == CHUNK_SIZE
+    assert len(header["coefficients"]["an"]) == BASE_REQUEST["n_harmonics"]
+    assert [chunk["index"] for chunk in chunks] == [0, 1, 2]
+    assert [chunk["start"] for chunk in chunks] == [0, 1000, 2000]
+    assert [chunk["count"] for chunk in chunks] == [1000, 1000, 500]
+    for chunk in chunks:
+        for name in server.STREAM_SIGNALS:
+            assert len(chunk[name]) == chunk["count"]
+    assert set(summary["statistics"]) == {"mse", "rmse", "max_error", "total_energy"}
+
+
+def test_statistics_match_analyze():
+    """Las estadísticas acumuladas y las señales coinciden con las de /api/analyze"""
+    with client() as http:
+        events = stream_events(http, {**BASE_REQUEST, "chunk_size": CHUNK_SIZE})
+        reference = http.post("/api/analyze", json=BASE_REQUEST).json()
+
+    statistics = events[-1]["statistics"]
+    for name in ("mse", "rmse", "max_error", "total_energy"):
+        assert np.isclose(statistics[name], reference["statistics"][name], rtol=1e-9, atol=1e-15), name
+    assert events[0]["coefficients"] == reference["coefficients"]
+    for name in server.STREAM_SIGNALS:
+        streamed = np.concatenate([event[name] for event in events if event["type"] == "chunk"])
+        assert np.allclose(streamed, reference[name]["values"], rtol=0, atol=1e-12), name
+
+
+def test_unknown_fields_rejected():
+    """Los campos de /api/analyze que el streaming no admite (o desconocidos) dan 422"""
+    with client() as http:
+        for extra in ({"include": ["statistics"]}, {"layout": "columnar"}, {"max_points": 100},
+                      {"campo_inexistente": 1}):
+            response = http.post(STREAM_PATH, json={**BASE_REQUEST, **extra})
+            assert response.status_code == 422, extra
+            assert response.json()["detail"][0]["type"] == "extra_forbidden"
+
+
+def main():
+    print("=" * 70)
+    print("STREAMING DEL ANÁLISIS (NDJSON)")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_event_sequence, test_statistics_match_analyze, test_unknown_fields_rejected):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Script de prueba de /api/analyze/sweep: la recurrencia de suma de ángulos y
+el bloque repetible coinciden con la síntesis directa para cada n, y los
+snapshots fuera de rango se rechazan con 422
+"""
+import sys
+import os
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Analisis_de_Fourier.PeriodicTiling import PeriodicTiling
+from Funciones_Matematicas.PredefinedFunction import PredefinedFunction
+
+SWEEP_PATH = "/api/analyze/sweep"
+N_HARMONICS = 40
+SNAPSHOTS = [1, 7, N_HARMONICS]
+
+# 5 s a 400 Hz con T = 2: bloque de 800 muestras repetido 2.5 veces (con bloque parcial)
+TILED_REQUEST = dict(function_type="Onda Cuadrada", amplitude=1.5, period=2.0, duration=5.0,
+                     sampling_rate=400, n_harmonics=N_HARMONICS, snapshots=SNAPSHOTS)
+# T·sampling_rate irracional en la práctica: sin bloque exacto, se recorre la malla completa
+UNTILED_REQUEST = dict(function_type="Onda Triangular", amplitude=0.8, period=1.2345678901, duration=3.0,
+                       sampling_rate=997, n_harmonics=N_HARMONICS, snapshots=SNAPSHOTS)
+
+
+def client():
+    server.config.warmup = False
+    return TestClient(server.app)
+
+
+def direct_synthesis(request, coefficients):
+    """Error de cada suma parcial evaluando cos(nωt) y sin(nωt) directamente"""
+    t = np.arange(0, request["duration"], 1.0 / request["sampling_rate"])
+    function = PredefinedFunction(request["function_type"], request["amplitude"], request["period"])
+    original = function.evaluate_array(t)
+    omega = 2 * np.pi / request["period"]
+    approximations = {}
+    approximation = np.full(len(t), coefficients["a0"] / 2)
+    for n, (a, b) in enumerate(zip(coefficients["an"], coefficients["bn"]), start=1):
+        approximation = approximation + a * np.cos(n * omega * t) + b * np.sin(n * omega * t)
+        approximations[n] = approximation
+    return t, original, approximations
+
+
+def check_sweep(request):
+    with client() as http:
+        response = http.post(SWEEP_PATH, json=request)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    t, original, approximations = direct_synthesis(request, data["coefficients"])
+
+    sweep = data["sweep"]
+    assert sweep["n_harmonics"] == list(range(1, N_HARMONICS + 1))
+    energy = 0.0
+    for n, approximation in approximations.items():
+        error = original - approximation
+        mse = float(np.mean(error * error))
+        energy += data["coefficients"]["an"][n - 1] ** 2 + data["coefficients"]["bn"][n - 1] ** 2
+        assert np.isclose(sweep["mse"][n - 1], mse, rtol=1e-9, atol=1e-12), n
+        assert np.isclose(sweep["rmse"][n - 1], np.sqrt(mse), rtol=1e-9, atol=1e-12), n
+        assert np.isclose(sweep["max_error"][n - 1], np.max(np.abs(error)), rtol=1e-9, atol=1e-12), n
+        assert np.isclose(sweep["energy"][n - 1], energy, rtol=1e-12), n
+
+    assert data["time"] == {"start": 0.0, "dt": 1.0 / request["sampling_rate"], "count": len(t)}
+    assert [snapshot["n_harmonics"] for snapshot in data["snapshots"]] == SNAPSHOTS
+    for snapshot in data["snapshots"]:
+        assert np.allclose(snapshot["values"], approximations[snapshot["n_harmonics"]], rtol=0, atol=1e-9)
+    return t
+
+
+def test_tiled_sweep_matches_direct_synthesis():
+    """Con bloque repetible (y bloque parcial final) las estadísticas coinciden con la síntesis directa"""
+    t = np.arange(0, TILED_REQUEST["duration"], 1.0 / TILED_REQUEST["sampling_rate"])
+    block = PeriodicTiling.block_length(t, TILED_REQUEST["period"])
+    assert block == 800 and len(t) % block != 0
+    check_sweep(TILED_REQUEST)
+
+
+def test_untiled_sweep_matches_direct_synthesis():
+    """Sin bloque repetible la recurrencia sobre la malla completa coincide con la síntesis directa"""
+    t = np.arange(0, UNTILED_REQUEST["duration"], 1.0 / UNTILED_REQUEST["sampling_rate"])
+    assert PeriodicTiling.block_length(t, UNTILED_REQUEST["period"]) is None
+    check_sweep(UNTILED_REQUEST)
+
+
+def test_invalid_snapshots_rejected():
+    """Los snapshots fuera de 1..n_harmonics se rechazan con 422"""
+    with client() as http:
+        for snapshots in ([0], [N_HARMONICS + 1], [-3, 5], list(range(1, 22))):
+            response = http.post(SWEEP_PATH, json={**TILED_REQUEST, "snapshots": snapshots})
+            assert response.status_code == 422, snapshots
+
+
+def main():
+    print("=" * 70)
+    print("BARRIDO DE CONVERGENCIA")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (test_tiled_sweep_matches_direct_synthesis, test_untiled_sweep_matches_direct_synthesis,
+                 test_invalid_snapshots_rejected):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Script de prueba del refinamiento progresivo por WebSocket (/api/ws/analyze):
+orden de los niveles, cancelación con un mensaje nuevo, actualización de
+amplitud y periodo sin recompilar la expresión y mensajes no válidos
+"""
+import sys
+import os
+import threading
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+# Agregar el directorio actual al path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+import main as server
+from Analisis_de_Fourier.AnalysisPipeline import AnalysisPipeline
+from Analisis_de_Fourier.ProgressiveSession import ProgressiveSession
+
+WS_PATH = "/api/ws/analyze"
+
+BASE_MESSAGE = dict(function_type="Onda Cuadrada", amplitude=1.0, period=2.0, duration=10.0,
+                    n_harmonics=50, sampling_rate=5000, include=["coefficients", "statistics"])
+
+
+def client():
+    """Cliente de pruebas sin calentamiento y con dos hilos (uno puede quedar bloqueado)"""
+    server.config.warmup = False
+    server.executor.thread_workers = 2
+    return TestClient(server.app)
+
+
+def receive_until_final(websocket, request_id):
+    """Eventos recibidos hasta el nivel final (o el error) del mensaje request_id"""
+    events = []
+    while True:
+        event = websocket.receive_json()
+        events.append(event)
+        if event["id"] == request_id and (event["type"] == "error" or event["final"]):
+            return events
+
+
+def test_levels_in_order():
+    """Los niveles llegan de grueso a fino y solo el último es final"""
+    expected = ProgressiveSession.levels(BASE_MESSAGE["n_harmonics"], BASE_MESSAGE["duration"],
+                                         BASE_MESSAGE["sampling_rate"], BASE_MESSAGE["period"])
+    with client() as http, http.websocket_connect(WS_PATH) as websocket:
+        websocket.send_json({**BASE_MESSAGE, "id": "orden"})
+        events = receive_until_final(websocket, "orden")
+
+    assert [event["level"] for event in events] == list(range(len(expected)))
+    assert [event["final"] for event in events] == [False] * (len(expected) - 1) + [True]
+    for event, (n_harmonics, sampling_rate) in zip(events, expected):
+        assert event["levels"] == len(expected)
+        assert event["result"]["metadata"]["n_harmonics"] == n_harmonics
+        assert event["result"]["metadata"]["sampling_rate"] == sampling_rate
+        assert len(event["result"]["coefficients"]["an"]) == n_harmonics
+
+
+def test_new_message_cancels_pending_levels():
+    """Un mensaje nuevo cancela los niveles pendientes del anterior"""
+    gate = threading.Event()
+    original = server.progressive_event
+
+    def gated_event(session, request, levels, index, request_id):
+        # Retiene los niveles finos del primer mensaje hasta que llegue el segundo
+        if request_id == "a" and index > 0:
+            gate.wait(10)
+        return original(session, request, levels, index, request_id)
+
+    server.progressive_event = gated_event
+    try:
+        with client() as http, http.websocket_connect(WS_PATH) as websocket:
+            websocket.send_json({**BASE_MESSAGE, "id": "a"})
+            first = websocket.receive_json()
+            websocket.send_json({**BASE_MESSAGE, "n_harmonics": 20, "id": "b"})
+            events = receive_until_final(websocket, "b")
+            gate.set()
+            # Un tercer mensaje: cualquier nivel pendiente de "a" habría llegado antes
+            websocket.send_json({**BASE_MESSAGE, "n_harmonics": 5, "id": "c"})
+            events += receive_until_final(websocket, "c")
+    finally:
+        gate.set()
+        server.progressive_event = original
+
+    assert first["id"] == "a" and first["level"] == 0
+    assert all(event["id"] != "a" for event in events)
+    assert events[0]["id"] == "b" and events[0]["level"] == 0
+    assert [event["id"] for event in events if event["final"]] == ["b", "c"]
+
+
+def test_amplitude_and_period_update_in_place():
+    """Cambiar amplitud y periodo no recompila la expresión y da el mismo resultado"""
+    message = dict(function_type="Personalizada", expression="A*t*t/(T*T)", amplitude=1.0, period=2.0,
+                   duration=6.0, n_harmonics=12, sampling_rate=1000, include=["coefficients", "statistics"])
+    built = []
+    build_function = server.pipeline.build_function
+
+    def counting_build(request):
+        built.append(request.expression)
+        return build_function(request)
+
+    server.pipeline.build_function = counting_build
+    try:
+        with client() as http, http.websocket_connect(WS_PATH) as websocket:
+            websocket.send_json({**message, "id": 1})
+            receive_until_final(websocket, 1)
+            websocket.send_json({**message, "amplitude": 2.5, "period": 3.0, "id": 2})
+            final = receive_until_final(websocket, 2)[-1]
+    finally:
+        del server.pipeline.build_function
+
+    assert built == [message["expression"]]
+    reference = AnalysisPipeline().run(server.FunctionRequest(**{**message, "amplitude": 2.5, "period": 3.0}))
+    coefficients = final["result"]["coefficients"]
+    assert final["result"]["metadata"]["amplitude"] == 2.5
+    assert final["result"]["metadata"]["period"] == 3.0
+    assert np.allclose(coefficients["an"], reference.coefficients["an"], atol=1e-12)
+    assert np.allclose(coefficients["bn"], reference.coefficients["bn"], atol=1e-12)
+    assert np.isclose(final["result"]["statistics"]["rmse"], reference.statistics["rmse"], rtol=1e-9)
+
+
+def test_invalid_messages_keep_connection():
+    """Los mensajes binarios o inválidos reciben un error sin cerrar la conexión"""
+    with client() as http, http.websocket_connect(WS_PATH) as websocket:
+        websocket.send_bytes(b"\x00\x01")
+        binary_error = websocket.receive_json()
+        websocket.send_text("{")
+        json_error = websocket.receive_json()
+        websocket.send_json({"function_type": "Personalizada", "expression": "foo(t)", "id": "x"})
+        function_error = websocket.receive_json()
+        websocket.send_json({**BASE_MESSAGE, "n_harmonics": 3, "id": "ok"})
+        events = receive_until_final(websocket, "ok")
+
+    assert binary_error["type"] == "error" and binary_error["status_code"] == 422 and binary_error["id"] == 1
+    assert json_error["type"] == "error" and json_error["status_code"] == 422 and json_error["id"] == 2
+    assert function_error["type"] == "error" and function_error["status_code"] == 400
+    assert events[-1]["type"] == "result" and events[-1]["final"]
+
+
+def main():
+    print("=" * 70)
+    print("PRUEBAS DEL REFINAMIENTO PROGRESIVO (WebSocket)")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+    for test in (test_levels_in_order, test_new_message_cancels_pending_levels,
+                 test_amplitude_and_period_update_in_place, test_invalid_messages_keep_connection):
+        try:
+            test()
+            print(f"✓ {test.__doc__ or test.__name__}")
+            passed += 1
+        except AssertionError:
+            print(f"✗ {test.__doc__ or test.__name__}")
+            failed += 1
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE PRUEBAS")
+    print("=" * 70)
+    print(f"✓ Exitosas: {passed}")
+    print(f"✗ Fallidas: {failed}")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())